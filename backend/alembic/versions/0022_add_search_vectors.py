@@ -0,0 +1,66 @@
+"""add search vectors
+
+Revision ID: efbedfef1006
+Revises: 57a3de2134dc
+Create Date: 2026-10-18 18:12:07.204381
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'efbedfef1006'
+down_revision = '57a3de2134dc'
+branch_labels = None
+depends_on = None
+
+SEARCH_VECTORS = (
+    (
+        'task',
+        "setweight(to_tsvector('simple', title), 'A') || "
+        "setweight(to_tsvector('simple', coalesce(description, '')), 'B')",
+    ),
+    (
+        'project',
+        "setweight(to_tsvector('simple', title), 'A') || "
+        "setweight(to_tsvector('simple', description), 'B')",
+    ),
+    ('goal', "setweight(to_tsvector('simple', title), 'A')"),
+    ('comment', "setweight(to_tsvector('simple', text), 'B')"),
+)
+
+
+def upgrade() -> None:
+    # stored generated columns rewrite the table under an exclusive lock
+    for table, expression in SEARCH_VECTORS:
+        op.add_column(
+            table,
+            sa.Column(
+                'search_vector',
+                postgresql.TSVECTOR(),
+                sa.Computed(expression, persisted=True),
+            ),
+        )
+
+    with op.get_context().autocommit_block():
+        for table, _ in SEARCH_VECTORS:
+            op.create_index(
+                f'ix_{table}_search_vector',
+                table,
+                ['search_vector'],
+                postgresql_using='gin',
+                postgresql_concurrently=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for table, _ in reversed(SEARCH_VECTORS):
+            op.drop_index(
+                f'ix_{table}_search_vector', table, postgresql_concurrently=True
+            )
+
+    for table, _ in reversed(SEARCH_VECTORS):
+        op.drop_column(table, 'search_vector')
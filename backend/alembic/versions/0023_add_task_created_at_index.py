@@ -0,0 +1,33 @@
+"""add task created_at index
+
+Revision ID: 9b5e57e492e7
+Revises: efbedfef1006
+Create Date: 2026-10-18 19:03:52.611840
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9b5e57e492e7'
+down_revision = 'efbedfef1006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # /tasks/today/ matches created_at and completed_at against a day range;
+    # completed_at ranges are served by ix_task_ordering
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_task_created_at',
+            'task',
+            ['created_at'],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_task_created_at', 'task', postgresql_concurrently=True)
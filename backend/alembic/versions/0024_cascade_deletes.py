@@ -0,0 +1,45 @@
+"""cascade deletes
+
+Revision ID: 99e2e43b71d9
+Revises: 9b5e57e492e7
+Create Date: 2026-10-18 19:41:26.083512
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '99e2e43b71d9'
+down_revision = '9b5e57e492e7'
+branch_labels = None
+depends_on = None
+
+FOREIGN_KEYS = (
+    ('task', 'task_project_id_fkey', 'project_id', 'project'),
+    ('project', 'project_goal_id_fkey', 'goal_id', 'goal'),
+)
+
+
+def replace_foreign_keys(on_delete: str) -> None:
+    # swap in one statement so there is no window without the constraint,
+    # NOT VALID skips checking the existing rows under the exclusive lock
+    for table, name, column, referred in FOREIGN_KEYS:
+        op.execute(
+            f'ALTER TABLE {table} DROP CONSTRAINT {name}, '
+            f'ADD CONSTRAINT {name} FOREIGN KEY ({column}) '
+            f'REFERENCES {referred} (id){on_delete} NOT VALID'
+        )
+
+    # checked in a transaction of their own, which lets writes go on
+    with op.get_context().autocommit_block():
+        for table, name, _, _ in FOREIGN_KEYS:
+            op.execute(f'ALTER TABLE {table} VALIDATE CONSTRAINT {name}')
+
+
+def upgrade() -> None:
+    replace_foreign_keys(' ON DELETE CASCADE')
+
+
+def downgrade() -> None:
+    replace_foreign_keys('')
@@ -0,0 +1,173 @@
+"""add counters
+
+Revision ID: c6656813fa3a
+Revises: 99e2e43b71d9
+Create Date: 2026-10-18 21:02:44.318207
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'c6656813fa3a'
+down_revision = '99e2e43b71d9'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 1000
+
+COUNTERS = (
+    ('goal', 'project_count'),
+    ('project', 'open_task_count'),
+    ('project', 'task_count'),
+)
+
+TRIGGERS = (
+    ('task', 'task_counters', ('insert', 'delete', 'update')),
+    ('project', 'project_counters', ('insert', 'delete', 'update')),
+)
+
+FUNCTIONS = (
+    '''
+    CREATE OR REPLACE FUNCTION task_counters() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP IN ('UPDATE', 'DELETE') THEN
+            UPDATE project
+            SET task_count = task_count - 1,
+                open_task_count = open_task_count - (OLD.completed_at IS NULL)::int
+            WHERE id = OLD.project_id;
+        END IF;
+        IF TG_OP IN ('INSERT', 'UPDATE') THEN
+            UPDATE project
+            SET task_count = task_count + 1,
+                open_task_count = open_task_count + (NEW.completed_at IS NULL)::int
+            WHERE id = NEW.project_id;
+        END IF;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    ''',
+    '''
+    CREATE OR REPLACE FUNCTION project_counters() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP IN ('UPDATE', 'DELETE') THEN
+            UPDATE goal SET project_count = project_count - 1
+            WHERE id = OLD.goal_id;
+        END IF;
+        IF TG_OP IN ('INSERT', 'UPDATE') THEN
+            UPDATE goal SET project_count = project_count + 1
+            WHERE id = NEW.goal_id;
+        END IF;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    ''',
+    '''
+    CREATE TRIGGER task_counters_insert AFTER INSERT ON task
+    FOR EACH ROW WHEN (NEW.project_id IS NOT NULL)
+    EXECUTE FUNCTION task_counters()
+    ''',
+    '''
+    CREATE TRIGGER task_counters_delete AFTER DELETE ON task
+    FOR EACH ROW WHEN (OLD.project_id IS NOT NULL)
+    EXECUTE FUNCTION task_counters()
+    ''',
+    '''
+    CREATE TRIGGER task_counters_update
+    AFTER UPDATE OF project_id, completed_at ON task
+    FOR EACH ROW WHEN (
+        OLD.project_id IS DISTINCT FROM NEW.project_id
+        OR (OLD.completed_at IS NULL) <> (NEW.completed_at IS NULL)
+    )
+    EXECUTE FUNCTION task_counters()
+    ''',
+    '''
+    CREATE TRIGGER project_counters_insert AFTER INSERT ON project
+    FOR EACH ROW WHEN (NEW.goal_id IS NOT NULL)
+    EXECUTE FUNCTION project_counters()
+    ''',
+    '''
+    CREATE TRIGGER project_counters_delete AFTER DELETE ON project
+    FOR EACH ROW WHEN (OLD.goal_id IS NOT NULL)
+    EXECUTE FUNCTION project_counters()
+    ''',
+    '''
+    CREATE TRIGGER project_counters_update AFTER UPDATE OF goal_id ON project
+    FOR EACH ROW WHEN (OLD.goal_id IS DISTINCT FROM NEW.goal_id)
+    EXECUTE FUNCTION project_counters()
+    ''',
+)
+
+# Each batch runs in its own transaction. Locking the parent rows first waits
+# for writers whose triggers already touched them, so the counts taken by the
+# following statement, with a fresh snapshot, include their changes.
+BACKFILLS = (
+    (
+        'project',
+        '''
+        DO $$ BEGIN
+            PERFORM FROM project WHERE id BETWEEN {start} AND {end} FOR UPDATE;
+            UPDATE project
+            SET task_count = counts.task_count,
+                open_task_count = counts.open_task_count
+            FROM (
+                SELECT
+                    project_id,
+                    count(*) AS task_count,
+                    count(*) FILTER (WHERE completed_at IS NULL) AS open_task_count
+                FROM task
+                WHERE project_id BETWEEN {start} AND {end}
+                GROUP BY project_id
+            ) AS counts
+            WHERE project.id = counts.project_id;
+        END $$
+        ''',
+    ),
+    (
+        'goal',
+        '''
+        DO $$ BEGIN
+            PERFORM FROM goal WHERE id BETWEEN {start} AND {end} FOR UPDATE;
+            UPDATE goal
+            SET project_count = counts.project_count
+            FROM (
+                SELECT goal_id, count(*) AS project_count
+                FROM project
+                WHERE goal_id BETWEEN {start} AND {end}
+                GROUP BY goal_id
+            ) AS counts
+            WHERE goal.id = counts.goal_id;
+        END $$
+        ''',
+    ),
+)
+
+
+def upgrade() -> None:
+    # a constant default is stored in the catalog, the tables are not rewritten
+    for table, column in COUNTERS:
+        op.add_column(
+            table, sa.Column(column, sa.Integer(), server_default='0', nullable=False)
+        )
+    # the triggers keep the counters from the moment they are backfilled
+    for statement in FUNCTIONS:
+        op.execute(statement)
+
+    with op.get_context().autocommit_block():
+        connection = op.get_bind()
+        for table, backfill in BACKFILLS:
+            last_id = connection.scalar(sa.text(f'SELECT max(id) FROM {table}')) or 0
+            for start in range(1, last_id + 1, BATCH_SIZE):
+                end = start + BATCH_SIZE - 1
+                op.execute(backfill.format(start=start, end=end))
+
+
+def downgrade() -> None:
+    for table, function, events in TRIGGERS:
+        for event in events:
+            op.execute(f'DROP TRIGGER {function}_{event} ON {table}')
+        op.execute(f'DROP FUNCTION {function}()')
+
+    for table, column in reversed(COUNTERS):
+        op.drop_column(table, column)
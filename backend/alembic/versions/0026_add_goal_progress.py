@@ -0,0 +1,136 @@
+"""add goal progress
+
+Revision ID: 4e38cd0d4610
+Revises: c6656813fa3a
+Create Date: 2026-10-18 21:47:10.529316
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4e38cd0d4610'
+down_revision = 'c6656813fa3a'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 1000
+
+COUNTERS = ('open_task_count', 'task_count')
+
+ROLLUP_FUNCTION = '''
+CREATE OR REPLACE FUNCTION project_counters() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'UPDATE' THEN
+        IF OLD.goal_id IS NOT DISTINCT FROM NEW.goal_id THEN
+            UPDATE goal
+            SET task_count = task_count - OLD.task_count + NEW.task_count,
+                open_task_count = open_task_count
+                    - OLD.open_task_count + NEW.open_task_count
+            WHERE id = NEW.goal_id;
+            RETURN NULL;
+        END IF;
+    END IF;
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        UPDATE goal
+        SET project_count = project_count - 1,
+            task_count = task_count - OLD.task_count,
+            open_task_count = open_task_count - OLD.open_task_count
+        WHERE id = OLD.goal_id;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        UPDATE goal
+        SET project_count = project_count + 1,
+            task_count = task_count + NEW.task_count,
+            open_task_count = open_task_count + NEW.open_task_count
+        WHERE id = NEW.goal_id;
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql
+'''
+
+ROLLUP_TRIGGER = '''
+CREATE TRIGGER project_counters_update
+AFTER UPDATE OF goal_id, task_count, open_task_count ON project
+FOR EACH ROW WHEN (
+    OLD.goal_id IS DISTINCT FROM NEW.goal_id
+    OR NEW.goal_id IS NOT NULL AND (
+        OLD.task_count <> NEW.task_count
+        OR OLD.open_task_count <> NEW.open_task_count
+    )
+)
+EXECUTE FUNCTION project_counters()
+'''
+
+COUNT_FUNCTION = '''
+CREATE OR REPLACE FUNCTION project_counters() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        UPDATE goal SET project_count = project_count - 1
+        WHERE id = OLD.goal_id;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        UPDATE goal SET project_count = project_count + 1
+        WHERE id = NEW.goal_id;
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql
+'''
+
+COUNT_TRIGGER = '''
+CREATE TRIGGER project_counters_update AFTER UPDATE OF goal_id ON project
+FOR EACH ROW WHEN (OLD.goal_id IS DISTINCT FROM NEW.goal_id)
+EXECUTE FUNCTION project_counters()
+'''
+
+# Locking the goals of the batch first waits for the project triggers that
+# already touched them, the sums taken with a fresh snapshot include those
+# changes and later ones apply their deltas on top of the sums.
+BACKFILL = '''
+DO $$ BEGIN
+    PERFORM FROM goal WHERE id BETWEEN {start} AND {end} FOR UPDATE;
+    UPDATE goal
+    SET task_count = sums.task_count, open_task_count = sums.open_task_count
+    FROM (
+        SELECT
+            goal_id,
+            sum(task_count) AS task_count,
+            sum(open_task_count) AS open_task_count
+        FROM project
+        WHERE goal_id BETWEEN {start} AND {end}
+        GROUP BY goal_id
+    ) AS sums
+    WHERE goal.id = sums.goal_id;
+END $$
+'''
+
+
+def replace_trigger(function: str, trigger: str) -> None:
+    op.execute(function)
+    op.execute('DROP TRIGGER project_counters_update ON project')
+    op.execute(trigger)
+
+
+def upgrade() -> None:
+    # a constant default is stored in the catalog, the table is not rewritten
+    for column in COUNTERS:
+        op.add_column(
+            'goal',
+            sa.Column(column, sa.Integer(), server_default='0', nullable=False),
+        )
+    replace_trigger(ROLLUP_FUNCTION, ROLLUP_TRIGGER)
+
+    with op.get_context().autocommit_block():
+        last_id = op.get_bind().scalar(sa.text('SELECT max(id) FROM goal')) or 0
+        for start in range(1, last_id + 1, BATCH_SIZE):
+            op.execute(BACKFILL.format(start=start, end=start + BATCH_SIZE - 1))
+
+
+def downgrade() -> None:
+    replace_trigger(COUNT_FUNCTION, COUNT_TRIGGER)
+
+    for column in reversed(COUNTERS):
+        op.drop_column('goal', column)
@@ -0,0 +1,58 @@
+"""add row versions
+
+Revision ID: ea97d92a283b
+Revises: 1a55c06a9fa2
+Create Date: 2026-10-18 19:12:41.307518
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'ea97d92a283b'
+down_revision = '1a55c06a9fa2'
+branch_labels = None
+depends_on = None
+
+TABLES = ('task', 'archived_task', 'project', 'goal', 'tag', 'comment')
+
+TOUCH_ROW = '''
+CREATE OR REPLACE FUNCTION touch_row() RETURNS trigger AS $$
+BEGIN
+    NEW.updated_at = now();
+    NEW.version = nextval('row_version_seq');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql
+'''
+
+
+def upgrade() -> None:
+    op.execute('CREATE SEQUENCE row_version_seq')
+    op.execute(TOUCH_ROW)
+    for table in TABLES:
+        # Constant defaults are stored in the catalog and the tables are not
+        # rewritten, existing rows get version 0 and new ones take theirs from
+        # the sequence once the default is switched.
+        op.execute(f'''
+            ALTER TABLE {table}
+            ADD COLUMN updated_at timestamp without time zone
+                DEFAULT now() NOT NULL,
+            ADD COLUMN version bigint DEFAULT 0 NOT NULL
+            ''')
+        op.execute(f'''
+            ALTER TABLE {table}
+            ALTER COLUMN version SET DEFAULT nextval('row_version_seq')
+            ''')
+        op.execute(f'''
+            CREATE TRIGGER {table}_touch BEFORE UPDATE ON {table}
+            FOR EACH ROW EXECUTE FUNCTION touch_row()
+            ''')
+
+
+def downgrade() -> None:
+    for table in TABLES:
+        op.execute(f'DROP TRIGGER {table}_touch ON {table}')
+        op.execute(f'ALTER TABLE {table} DROP COLUMN updated_at, DROP COLUMN version')
+    op.execute('DROP FUNCTION touch_row()')
+    op.execute('DROP SEQUENCE row_version_seq')
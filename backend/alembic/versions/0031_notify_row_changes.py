@@ -0,0 +1,50 @@
+"""notify row changes
+
+Revision ID: d44da745cc1d
+Revises: abc2ed20da8b
+Create Date: 2026-10-18 20:41:07.512364
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'd44da745cc1d'
+down_revision = 'abc2ed20da8b'
+branch_labels = None
+depends_on = None
+
+TABLES = ('task', 'archived_task', 'project', 'goal', 'tag', 'comment')
+
+NOTIFY_CHANGE = '''
+CREATE OR REPLACE FUNCTION notify_change() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        PERFORM pg_notify(
+            'row_changes', concat_ws(':', TG_ARGV[0], OLD.id, OLD.version)
+        );
+    ELSE
+        PERFORM pg_notify(
+            'row_changes', concat_ws(':', TG_ARGV[0], NEW.id, NEW.version)
+        );
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql
+'''
+
+
+def upgrade() -> None:
+    op.execute(NOTIFY_CHANGE)
+    for table in TABLES:
+        op.execute(f'''
+            CREATE TRIGGER {table}_notify
+            AFTER INSERT OR UPDATE OR DELETE ON {table}
+            FOR EACH ROW EXECUTE FUNCTION notify_change('{table}')
+            ''')
+
+
+def downgrade() -> None:
+    for table in TABLES:
+        op.execute(f'DROP TRIGGER {table}_notify ON {table}')
+    op.execute('DROP FUNCTION notify_change()')
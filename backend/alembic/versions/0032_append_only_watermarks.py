@@ -0,0 +1,67 @@
+"""append only watermarks
+
+Revision ID: 3e021099c3b8
+Revises: d44da745cc1d
+Create Date: 2026-10-19 09:12:44.180352
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '3e021099c3b8'
+down_revision = 'd44da745cc1d'
+branch_labels = None
+depends_on = None
+
+BUMP_WATERMARK = '''
+CREATE OR REPLACE FUNCTION bump_watermark() RETURNS trigger AS $$
+BEGIN
+    IF EXISTS (SELECT FROM changed) THEN
+        INSERT INTO watermark (table_name, version)
+        VALUES (TG_TABLE_NAME, nextval('row_version_seq'));
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql
+'''
+
+UPSERT_WATERMARK = '''
+CREATE OR REPLACE FUNCTION bump_watermark() RETURNS trigger AS $$
+BEGIN
+    IF EXISTS (SELECT FROM changed) THEN
+        INSERT INTO watermark (table_name, version)
+        VALUES (TG_TABLE_NAME, nextval('row_version_seq'))
+        ON CONFLICT (table_name)
+        DO UPDATE SET version = nextval('row_version_seq');
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql
+'''
+
+
+def upgrade() -> None:
+    op.add_column(
+        'watermark',
+        sa.Column('changes', sa.BigInteger(), server_default='1', nullable=False),
+    )
+    # the sums start above the versions, so no watermark a client holds recurs
+    op.execute('UPDATE watermark SET changes = version')
+    op.drop_constraint('watermark_pkey', 'watermark', type_='primary')
+    op.create_primary_key('watermark_pkey', 'watermark', ['table_name', 'version'])
+    op.execute(BUMP_WATERMARK)
+
+
+def downgrade() -> None:
+    op.execute(UPSERT_WATERMARK)
+    op.execute('''
+        DELETE FROM watermark w
+        WHERE version < (
+            SELECT max(version) FROM watermark WHERE table_name = w.table_name
+        )
+        ''')
+    op.drop_constraint('watermark_pkey', 'watermark', type_='primary')
+    op.create_primary_key('watermark_pkey', 'watermark', ['table_name'])
+    op.drop_column('watermark', 'changes')
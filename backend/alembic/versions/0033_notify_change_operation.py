@@ -0,0 +1,57 @@
+"""notify change operation
+
+Revision ID: 45c52b4bb4b2
+Revises: 3e021099c3b8
+Create Date: 2026-10-19 10:02:51.734916
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '45c52b4bb4b2'
+down_revision = '3e021099c3b8'
+branch_labels = None
+depends_on = None
+
+NOTIFY_CHANGE = '''
+CREATE OR REPLACE FUNCTION notify_change() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        PERFORM pg_notify(
+            'row_changes', concat_ws(':', TG_ARGV[0], TG_OP, OLD.id, OLD.version)
+        );
+    ELSE
+        PERFORM pg_notify(
+            'row_changes', concat_ws(':', TG_ARGV[0], TG_OP, NEW.id, NEW.version)
+        );
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql
+'''
+
+PREVIOUS_NOTIFY_CHANGE = '''
+CREATE OR REPLACE FUNCTION notify_change() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        PERFORM pg_notify(
+            'row_changes', concat_ws(':', TG_ARGV[0], OLD.id, OLD.version)
+        );
+    ELSE
+        PERFORM pg_notify(
+            'row_changes', concat_ws(':', TG_ARGV[0], NEW.id, NEW.version)
+        );
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql
+'''
+
+
+def upgrade() -> None:
+    op.execute(NOTIFY_CHANGE)
+
+
+def downgrade() -> None:
+    op.execute(PREVIOUS_NOTIFY_CHANGE)
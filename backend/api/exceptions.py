@@ -1,12 +1,16 @@
 from fastapi import HTTPException, status
 
+from services.exceptions import RelatedDoesNotExist
+
 __all__ = (
     'BadRequest',
     'NotFound',
+    'NotModified',
     'Forbidden',
     'NotFound',
     'UnprocessableEntity',
     'ServiceUnavailable',
+    'related_not_found',
 )
 
 
@@ -31,9 +35,22 @@ class NotFound(CustomHTTPException):
     status = status.HTTP_404_NOT_FOUND
 
 
+class NotModified(HTTPException):
+    """Answers a conditional GET with an empty 304, see ``not_modified_handler``."""
+
+    def __init__(self, etag: str):
+        super().__init__(
+            status_code=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag}
+        )
+
+
 class UnprocessableEntity(CustomHTTPException):
     status = status.HTTP_422_UNPROCESSABLE_ENTITY
 
 
 class ServiceUnavailable(CustomHTTPException):
     status = status.HTTP_503_SERVICE_UNAVAILABLE
+
+
+def related_not_found(error: RelatedDoesNotExist) -> NotFound:
+    return NotFound(f'{error.relation} with pk={error.pk} not found')
@@ -1,15 +1,21 @@
 from fastapi import APIRouter, Depends
 
+from app.dependencies import route_reads
+
 from .auth import validate_token
 from .comments import router as comments_router
 from .goals import router as goals_router
+from .internal import router as internal_router
 from .projects import router as projects_router
+from .search import router as search_router
 from .tags import router as tags_router
 from .tasks import router as tasks_router
 
-private_router = APIRouter(dependencies=[Depends(validate_token)])
+private_router = APIRouter(dependencies=[Depends(validate_token), Depends(route_reads)])
 private_router.include_router(projects_router)
 private_router.include_router(tasks_router)
 private_router.include_router(tags_router)
 private_router.include_router(comments_router)
 private_router.include_router(goals_router)
+private_router.include_router(search_router)
+private_router.include_router(internal_router)
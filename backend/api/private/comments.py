@@ -1,31 +1,50 @@
 import funcy
 from databases.interfaces import Record
-from fastapi import APIRouter, status
+from fastapi import APIRouter, Depends, status
 from sqlalchemy import select
 
 from api.exceptions import NotFound
+from api.responses import StreamingAPIResponse, StreamingFormat
 from app.database import database
+from app.dependencies import conditional_get, get_streaming_format
+from app.routing import CancellableRoute
 from models import Comment
 from schemas.comments import CommentResponse, CreateCommentRequest, UpdateCommentRequest
 from services.comments import (
     create_one_comment,
     delete_one_comment,
+    get_comment_version,
     get_one_comment,
     update_one_comment,
 )
 from services.exceptions import DoesNotExist
 
-router = APIRouter()
+router = APIRouter(route_class=CancellableRoute)
 
 
 @router.get('/comments/', tags=['tasks'], response_model=list[CommentResponse])
-async def read_comments_list() -> list[Record]:
+async def read_comments_list(
+    streaming_format: StreamingFormat | None = Depends(get_streaming_format),
+) -> list[Record] | StreamingAPIResponse:
     query = select(Comment)
+
+    if streaming_format:
+        return StreamingAPIResponse(
+            database.iterate(query),
+            response_model=CommentResponse,
+            streaming_format=streaming_format,
+        )
+
     comments = await database.fetch_all(query)
     return comments
 
 
-@router.get('/comments/{pk}/', tags=['tasks'], response_model=CommentResponse)
+@router.get(
+    '/comments/{pk}/',
+    tags=['tasks'],
+    response_model=CommentResponse,
+    dependencies=[Depends(conditional_get(get_comment_version))],
+)
 async def read_comment(pk: int) -> Record:
     with funcy.reraise(DoesNotExist, NotFound(f'comment with pk={pk} not found')):
         comment: Record = await get_one_comment(pk=pk)
@@ -1,25 +1,65 @@
 import funcy
 from databases.interfaces import Record
 from fastapi import APIRouter, Depends, status
-from sqlalchemy import delete, func, select
+from sqlalchemy import func, select
 
 from api.exceptions import NotFound
-from app.database import database
-from models import Goal, Project
+from api.responses import (
+    APIResponse,
+    EncodedList,
+    StreamingAPIResponse,
+    StreamingFormat,
+)
+from app.database import database, fetch_rows
+from app.dependencies import (
+    conditional_get,
+    conditional_list,
+    get_loaders,
+    get_streaming_format,
+)
+from app.routing import CancellableRoute
+from app.settings import settings
+from models import Goal
 from schemas.goals import (
     CreateGoalRequest,
+    GoalProgressResponse,
     GoalResponse,
     RetrieveGoalListRequest,
     UpdateGoalRequest,
 )
+from services.database import (
+    fetch_json_list,
+    json_list,
+    ordering_clauses,
+    search_clause,
+)
 from services.exceptions import DoesNotExist
-from services.goals import create_one_goal, get_one_goal, update_one_goal
+from services.goals import (
+    create_one_goal,
+    delete_one_goal,
+    get_goal_progress,
+    get_goal_version,
+    get_one_goal,
+    update_one_goal,
+    with_progress,
+    with_projects,
+)
+from services.loaders import Loaders
 
-router = APIRouter()
+router = APIRouter(route_class=CancellableRoute)
 
 
-@router.get('/goals/', tags=['goals'], response_model=list[GoalResponse])
-async def read_goals_list(request: RetrieveGoalListRequest = Depends()) -> list[dict]:
+@router.get(
+    '/goals/',
+    tags=['goals'],
+    response_model=list[GoalResponse],
+    dependencies=[Depends(conditional_list('goal'))],
+)
+async def read_goals_list(
+    request: RetrieveGoalListRequest = Depends(),
+    loaders: Loaders = Depends(get_loaders),
+    streaming_format: StreamingFormat | None = Depends(get_streaming_format),
+) -> list[dict] | APIResponse | StreamingAPIResponse:
     query = select(Goal)
 
     if request.achieved is not None:
@@ -33,33 +73,57 @@ async def read_goals_list(request: RetrieveGoalListRequest = Depends()) -> list[
         query = query.filter(Goal.year == request.year, Goal.month == request.month)
 
     if request.search:
-        query = query.filter(Goal.title.ilike(f'%{request.search}%'))
-
-    goals = await database.fetch_all(query)
-
-    response = []
-    for goal in goals:
-        response_item = dict(goal)
-        response_item['projects'] = funcy.lpluck_attr(
-            'id',
-            await database.fetch_all(
-                select(Project).filter(Project.goal_id == response_item['id'])
-            ),
+        query = query.filter(search_clause(request.search, Goal.title))
+
+    # counter updates move rows around the heap, so the order is always explicit
+    order_by = ordering_clauses(Goal, request.ordering)
+    query = query.order_by(*order_by)
+    query = with_progress(query, request.with_progress)
+
+    if streaming_format:
+        return StreamingAPIResponse(
+            database.iterate(with_projects(query)),
+            response_model=GoalResponse,
+            streaming_format=streaming_format,
         )
-        response.append(response_item)
-    return response
+
+    if settings.render_json_in_database:
+        query = with_projects(query).add_columns(
+            Goal.achieved_at.isnot(None).label('is_achieved')
+        )
+        rendered = await fetch_json_list(
+            json_list(query, [*GoalResponse.__fields__, 'is_achieved'], order_by)
+        )
+        return APIResponse(EncodedList(rendered['data'], rendered['count']))
+
+    goals = await fetch_rows(query)
+    projects = await loaders.goals_projects.load_many(goal['id'] for goal in goals)
+
+    return [
+        dict(goal, projects=goal_projects)
+        for goal, goal_projects in zip(goals, projects)
+    ]
 
 
-@router.get('/goals/{pk}/', tags=['goals'], response_model=GoalResponse)
-async def read_goal(pk: int) -> dict:
+@router.get(
+    '/goals/{pk}/',
+    tags=['goals'],
+    response_model=GoalResponse,
+    dependencies=[Depends(conditional_get(get_goal_version))],
+)
+async def read_goal(pk: int, loaders: Loaders = Depends(get_loaders)) -> dict:
     with funcy.reraise(DoesNotExist, NotFound(f'goal with pk={pk} not found')):
         goal = await get_one_goal(pk=pk)
 
-    response = dict(goal)
-    response['projects'] = funcy.lpluck_attr(
-        'id', await database.fetch_all(select(Project).filter(Project.goal_id == pk))
-    )
-    return response
+    return dict(goal, projects=await loaders.goals_projects.load(pk))
+
+
+@router.get(
+    '/goals/{pk}/progress/', tags=['goals'], response_model=GoalProgressResponse
+)
+async def read_goal_progress(pk: int) -> dict:
+    with funcy.reraise(DoesNotExist, NotFound(f'goal with pk={pk} not found')):
+        return await get_goal_progress(pk=pk)
 
 
 @router.post(
@@ -76,26 +140,22 @@ async def create_goal(request: CreateGoalRequest) -> dict:
 
 
 @router.put('/goals/{pk}/', tags=['goals'], response_model=GoalResponse)
-async def update_goal(pk: int, request: UpdateGoalRequest) -> dict:
+async def update_goal(
+    pk: int, request: UpdateGoalRequest, loaders: Loaders = Depends(get_loaders)
+) -> dict:
     update_data = request.dict(exclude_unset=True)
 
     with funcy.reraise(DoesNotExist, NotFound(f'goal with pk={pk} not found')):
         goal = await update_one_goal(pk=pk, data=update_data)
 
-    response = dict(goal)
-    response['projects'] = funcy.lpluck_attr(
-        'id', await database.fetch_all(select(Project).filter(Project.goal_id == pk))
-    )
-    return response
+    return dict(goal, projects=await loaders.goals_projects.load(pk))
 
 
 @router.delete('/goals/{pk}/', tags=['goals'], status_code=status.HTTP_204_NO_CONTENT)
 async def delete_goal(pk: int) -> None:
+    # projects and their tasks are removed by ON DELETE CASCADE
     with funcy.reraise(DoesNotExist, NotFound(f'goal with pk={pk} not found')):
-        await get_one_goal(pk=pk)
-
-    await database.execute(delete(Project).where(Project.goal_id == pk))
-    await database.execute(delete(Goal).where(Goal.id == pk).returning(Goal.id))
+        await delete_one_goal(pk=pk)
 
 
 @router.post(
@@ -0,0 +1,19 @@
+from fastapi import APIRouter
+
+from app.cache import cache
+from app.database import pool_stats, primary_database
+from app.routing import CancellableRoute
+from schemas.internal import CacheStatsResponse, PoolStatsResponse
+
+router = APIRouter(route_class=CancellableRoute)
+
+
+@router.get('/internal/pool/', tags=['internal'], response_model=PoolStatsResponse)
+@primary_database
+async def read_pool_stats() -> dict:
+    return pool_stats()
+
+
+@router.get('/internal/cache/', tags=['internal'], response_model=CacheStatsResponse)
+async def read_cache_stats() -> dict:
+    return await cache.stats()
@@ -1,26 +1,63 @@
 import funcy
 from databases.interfaces import Record
-from fastapi import APIRouter, Query, status
-from sqlalchemy import delete, func, select
-
-from api.exceptions import NotFound
-from app.database import database
-from models import Project, Task
+from fastapi import APIRouter, Depends, Query, status
+from sqlalchemy import func, select
+
+from api.exceptions import NotFound, related_not_found
+from api.responses import (
+    APIResponse,
+    EncodedList,
+    StreamingAPIResponse,
+    StreamingFormat,
+)
+from app.database import database, fetch_rows
+from app.dependencies import (
+    conditional_get,
+    conditional_list,
+    get_loaders,
+    get_streaming_format,
+)
+from app.routing import CancellableRoute
+from app.settings import settings
+from models import Project
 from schemas.projects import CreateProjectRequest, ProjectResponse, UpdateProjectRequest
-from services.exceptions import DoesNotExist
-from services.goals import get_one_goal
-from services.projects import create_one_project, get_one_project, update_one_project
+from services.database import (
+    fetch_json_list,
+    json_list,
+    ordering_clauses,
+    search_clause,
+)
+from services.exceptions import DoesNotExist, RelatedDoesNotExist
+from services.loaders import Loaders
+from services.projects import (
+    ProjectOrdering,
+    create_one_project,
+    delete_one_project,
+    get_one_project,
+    get_project_version,
+    update_one_project,
+    with_tasks,
+)
 from services.spaces import Space
 
-router = APIRouter()
+router = APIRouter(route_class=CancellableRoute)
 
 
-@router.get('/projects/', tags=['projects'], response_model=list[ProjectResponse])
+@router.get(
+    '/projects/',
+    tags=['projects'],
+    response_model=list[ProjectResponse],
+    dependencies=[Depends(conditional_list('project'))],
+)
 async def read_projects_list(
     archived: bool | None = Query(None),
     space: Space | None = Query(None),
     search: str | None = Query(None),
-) -> list[dict]:
+    has_open_tasks: bool | None = Query(None),
+    ordering: ProjectOrdering | None = Query(None),
+    loaders: Loaders = Depends(get_loaders),
+    streaming_format: StreamingFormat | None = Depends(get_streaming_format),
+) -> list[dict] | APIResponse | StreamingAPIResponse:
     query = select(Project)
 
     if archived is not None:
@@ -34,36 +71,57 @@ async def read_projects_list(
         query = query.filter(Project.space == space.value)
 
     if search:
-        clause = f'%{search}%'
+        query = query.filter(search_clause(search, Project.title, Project.description))
+
+    if has_open_tasks is not None:
         query = query.filter(
-            Project.title.ilike(clause) | Project.description.ilike(clause)
+            Project.open_task_count > 0
+            if has_open_tasks
+            else Project.open_task_count == 0
         )
 
-    projects = await database.fetch_all(query)
+    # counter updates move rows around the heap, so the order is always explicit
+    order_by = ordering_clauses(Project, ordering)
+    query = query.order_by(*order_by)
 
-    response = []
-    for project in projects:
-        response_item = dict(project)
-        response_item['tasks'] = funcy.lpluck_attr(
-            'id',
-            await database.fetch_all(
-                select(Task).filter(Task.project_id == response_item['id'])
-            ),
+    if streaming_format:
+        return StreamingAPIResponse(
+            database.iterate(with_tasks(query)),
+            response_model=ProjectResponse,
+            streaming_format=streaming_format,
         )
-        response.append(response_item)
-    return response
 
+    if settings.render_json_in_database:
+        query = with_tasks(query).add_columns(
+            Project.archived_at.isnot(None).label('is_archived')
+        )
+        rendered = await fetch_json_list(
+            json_list(query, [*ProjectResponse.__fields__, 'is_archived'], order_by)
+        )
+        return APIResponse(EncodedList(rendered['data'], rendered['count']))
+
+    projects = await fetch_rows(query)
+    tasks = await loaders.projects_tasks.load_many(
+        project['id'] for project in projects
+    )
+
+    return [
+        dict(project, tasks=project_tasks)
+        for project, project_tasks in zip(projects, tasks)
+    ]
 
-@router.get('/projects/{pk}/', tags=['projects'], response_model=ProjectResponse)
-async def read_project(pk: int) -> dict:
+
+@router.get(
+    '/projects/{pk}/',
+    tags=['projects'],
+    response_model=ProjectResponse,
+    dependencies=[Depends(conditional_get(get_project_version))],
+)
+async def read_project(pk: int, loaders: Loaders = Depends(get_loaders)) -> dict:
     with funcy.reraise(DoesNotExist, NotFound(f'project with pk={pk} not found')):
         project = await get_one_project(pk=pk)
 
-    response = dict(project)
-    response['tasks'] = funcy.lpluck_attr(
-        'id', await database.fetch_all(select(Task).filter(Task.project_id == pk))
-    )
-    return response
+    return dict(project, tasks=await loaders.projects_tasks.load(pk))
 
 
 @router.post(
@@ -73,46 +131,33 @@ async def read_project(pk: int) -> dict:
     status_code=status.HTTP_201_CREATED,
 )
 async def create_project(request: CreateProjectRequest) -> dict:
-    with funcy.reraise(
-        DoesNotExist, NotFound(f'goal with pk={request.goal_id} not found')
-    ):
-        await get_one_goal(pk=request.goal_id)
-
-    project = await create_one_project(data=request.dict())
+    with funcy.reraise(RelatedDoesNotExist, related_not_found):
+        project = await create_one_project(data=request.dict())
     response = dict(project)
     response['tasks'] = []
     return response
 
 
 @router.put('/projects/{pk}/', tags=['projects'], response_model=ProjectResponse)
-async def update_project(pk: int, request: UpdateProjectRequest) -> dict:
+async def update_project(
+    pk: int, request: UpdateProjectRequest, loaders: Loaders = Depends(get_loaders)
+) -> dict:
     update_data = request.dict(exclude_unset=True)
-    goal_id = update_data.get('goal_id')
-
-    with funcy.reraise(DoesNotExist, NotFound(f'goal with pk={goal_id} not found')):
-        await get_one_goal(pk=goal_id)
 
     with funcy.reraise(DoesNotExist, NotFound(f'project with pk={pk} not found')):
-        project = await update_one_project(pk=pk, data=update_data)
+        with funcy.reraise(RelatedDoesNotExist, related_not_found):
+            project = await update_one_project(pk=pk, data=update_data)
 
-    response = dict(project)
-    response['tasks'] = funcy.lpluck_attr(
-        'id', await database.fetch_all(select(Task).filter(Task.project_id == pk))
-    )
-    return response
+    return dict(project, tasks=await loaders.projects_tasks.load(pk))
 
 
 @router.delete(
     '/projects/{pk}/', tags=['projects'], status_code=status.HTTP_204_NO_CONTENT
 )
 async def delete_project(pk: int) -> None:
+    # tasks are removed by ON DELETE CASCADE
     with funcy.reraise(DoesNotExist, NotFound(f'project with pk={pk} not found')):
-        await get_one_project(pk=pk)
-
-    await database.execute(delete(Task).where(Task.project_id == pk))
-    await database.execute(
-        delete(Project).where(Project.id == pk).returning(Project.id)
-    )
+        await delete_one_project(pk=pk)
 
 
 @router.post(
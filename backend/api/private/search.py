@@ -0,0 +1,44 @@
+import funcy
+from fastapi import APIRouter, Depends
+from sqlalchemy import select
+
+from api.exceptions import BadRequest
+from api.responses import APIResponse
+from app.database import fetch_rows, statement_timeout
+from app.routing import CancellableRoute
+from schemas.search import SearchRequest, SearchResultResponse
+from services.search import (
+    encode_search_cursor,
+    search_after_cursor,
+    search_results,
+    with_snippets,
+)
+
+router = APIRouter(route_class=CancellableRoute)
+
+
+@router.get('/search/', tags=['search'], response_model=list[SearchResultResponse])
+@statement_timeout(5)
+async def search(request: SearchRequest = Depends()) -> APIResponse:
+    results = search_results(request.q)
+    query = select(results).order_by(
+        results.c.rank.desc(), results.c.type, results.c.id
+    )
+
+    if request.cursor:
+        with funcy.reraise((ValueError, TypeError), BadRequest('invalid cursor')):
+            query = query.filter(search_after_cursor(results, request.cursor))
+
+    # one extra row tells whether there is a next page
+    page = query.limit(request.limit + 1).subquery('page')
+    found = await fetch_rows(with_snippets(page, request.q))
+
+    next_cursor = None
+    if len(found) > request.limit:
+        found = found[: request.limit]
+        next_cursor = encode_search_cursor(found[-1])
+
+    return APIResponse(
+        [SearchResultResponse.parse_obj(result) for result in found],
+        next_cursor=next_cursor,
+    )
@@ -1,26 +1,50 @@
 import funcy
 from databases.interfaces import Record
-from fastapi import APIRouter, status
+from fastapi import APIRouter, Depends, status
 from sqlalchemy import select
 
 from api.exceptions import NotFound
+from api.responses import StreamingAPIResponse, StreamingFormat
 from app.database import database
+from app.dependencies import conditional_get, get_streaming_format
+from app.routing import CancellableRoute
 from models import Tag
 from schemas.tags import CreateTagRequest, TagResponse, UpdateTagRequest
 from services.exceptions import DoesNotExist
-from services.tags import create_one_tag, delete_one_tag, get_one_tag, update_one_tag
+from services.tags import (
+    create_one_tag,
+    delete_one_tag,
+    get_one_tag,
+    get_tag_version,
+    update_one_tag,
+)
 
-router = APIRouter()
+router = APIRouter(route_class=CancellableRoute)
 
 
 @router.get('/tags/', tags=['tasks'], response_model=list[TagResponse])
-async def read_tags_list() -> list[Record]:
+async def read_tags_list(
+    streaming_format: StreamingFormat | None = Depends(get_streaming_format),
+) -> list[Record] | StreamingAPIResponse:
     query = select(Tag)
+
+    if streaming_format:
+        return StreamingAPIResponse(
+            database.iterate(query),
+            response_model=TagResponse,
+            streaming_format=streaming_format,
+        )
+
     tags = await database.fetch_all(query)
     return tags
 
 
-@router.get('/tags/{pk}/', tags=['tasks'], response_model=TagResponse)
+@router.get(
+    '/tags/{pk}/',
+    tags=['tasks'],
+    response_model=TagResponse,
+    dependencies=[Depends(conditional_get(get_tag_version))],
+)
 async def read_tag(pk: int) -> Record:
     with funcy.reraise(DoesNotExist, NotFound(f'tag with pk={pk} not found')):
         tag: Record = await get_one_tag(pk=pk)
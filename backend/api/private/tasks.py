@@ -1,74 +1,153 @@
-from datetime import date
+import hashlib
 
 import funcy
 from databases.interfaces import Record
-from fastapi import APIRouter, Depends, status
-from sqlalchemy import Date, cast, func, nullsfirst, select
-
-from api.exceptions import NotFound
-from app.database import database
+from fastapi import APIRouter, Depends, Query, status
+from sqlalchemy import func, nullsfirst, select, union
+from sqlalchemy.sql import Select
+
+from api.exceptions import BadRequest, NotFound, related_not_found
+from api.responses import APIResponse, EncodedList
+from app.cache import cache
+from app.database import BaseDBModel, database, fetch_rows
+from app.dependencies import conditional_get, conditional_list
+from app.routing import CancellableRoute
+from app.settings import settings
 from models import Task
 from schemas.tasks import (
     CreateTaskRequest,
+    RetrieveTaskFacetsRequest,
     RetrieveTasksListRequest,
+    RetrieveTodayTasksRequest,
+    TaskFacetsResponse,
     TaskResponse,
     UpdateTaskRequest,
 )
-from services.exceptions import DoesNotExist
-from services.projects import get_one_project
+from services.database import fetch_json_list, json_list, search_clause
+from services.exceptions import DoesNotExist, RelatedDoesNotExist
 from services.tasks import (
+    count_task_facets,
     create_one_task,
+    day_bounds,
     delete_one_task,
+    encode_task_cursor,
     get_one_task,
+    get_one_task_or_archived,
+    get_task_version,
+    tasks_after_cursor,
+    tasks_with_archived,
     update_one_task,
 )
+from services.watermarks import watermarks
+from utils import loads
 
-router = APIRouter()
-
+router = APIRouter(route_class=CancellableRoute)
 
-@router.get('/tasks/', tags=['tasks'], response_model=list[TaskResponse])
-async def read_tasks_list(
-    request: RetrieveTasksListRequest = Depends(),
-) -> list[Record]:
-    query = select(Task).order_by(
-        nullsfirst(Task.completed_at.desc()), Task.created_at.desc(), Task.id.desc()
-    )
 
+def filter_tasks(
+    query: Select, request: RetrieveTaskFacetsRequest, model: BaseDBModel = Task
+) -> Select:
     if request.completed is not None:
         query = query.filter(
-            Task.completed_at.isnot(None)
+            model.completed_at.isnot(None)
             if request.completed
-            else Task.completed_at.is_(None)
+            else model.completed_at.is_(None)
         )
 
     if request.search:
-        clause = f'%{request.search}%'
-        query = query.filter(Task.title.ilike(clause) | Task.description.ilike(clause))
+        query = query.filter(
+            search_clause(request.search, model.title, model.description)
+        )
 
     if request.space is not None:
-        query = query.filter(Task.space == request.space)
+        query = query.filter(model.space == request.space)
 
     if request.project_id is not None or request.inbox:
-        query = query.filter(Task.project_id == request.project_id)
+        query = query.filter(model.project_id == request.project_id)
 
     if request.decisive is not None:
-        query = query.filter(Task.decisive == request.decisive)
+        query = query.filter(model.decisive == request.decisive)
 
     if request.due_from:
-        query = query.filter(cast(Task.due_date, Date) >= request.due_from)
+        query = query.filter(model.due_date >= request.due_from)
 
     if request.due_to:
-        query = query.filter(cast(Task.due_date, Date) <= request.due_to)
+        query = query.filter(model.due_date <= request.due_to)
 
-    if request.limit:
-        query = query.limit(request.limit)
+    return query
+
+
+@router.get(
+    '/tasks/',
+    tags=['tasks'],
+    response_model=list[TaskResponse],
+    dependencies=[Depends(conditional_list('task', 'archived_task'))],
+)
+async def read_tasks_list(request: RetrieveTasksListRequest = Depends()) -> APIResponse:
+    model = tasks_with_archived() if request.include_archived else Task
+    order_by = [
+        nullsfirst(model.completed_at.desc()),
+        model.created_at.desc(),
+        model.id.desc(),
+    ]
+    query = select(model).order_by(*order_by)
+    query = filter_tasks(query, request, model)
+
+    if request.cursor:
+        with funcy.reraise((ValueError, TypeError), BadRequest('invalid cursor')):
+            query = query.filter(tasks_after_cursor(request.cursor, model))
 
     if request.offset:
         query = query.offset(request.offset)
 
-    tasks = await database.fetch_all(query)
+    if settings.render_json_in_database:
+        query = query.add_columns(model.completed_at.isnot(None).label('is_completed'))
+        rendered = await fetch_json_list(
+            json_list(
+                query,
+                [*TaskResponse.__fields__, 'is_completed'],
+                order_by,
+                request.limit,
+            )
+        )
+        last = rendered['last']
+        next_cursor = encode_task_cursor(loads(last)[0]) if last else None
+        return APIResponse(
+            EncodedList(rendered['data'], rendered['count']), next_cursor=next_cursor
+        )
 
-    return tasks
+    if request.limit:
+        # one extra row tells whether there is a next page
+        query = query.limit(request.limit + 1)
+
+    tasks = await fetch_rows(query)
+
+    next_cursor = None
+    if request.limit and len(tasks) > request.limit:
+        tasks = tasks[: request.limit]
+        next_cursor = encode_task_cursor(tasks[-1])
+
+    return APIResponse(
+        [TaskResponse.parse_obj(task) for task in tasks], next_cursor=next_cursor
+    )
+
+
+@router.get('/tasks/facets/', tags=['tasks'], response_model=TaskFacetsResponse)
+async def read_task_facets(request: RetrieveTaskFacetsRequest = Depends()) -> dict:
+    # any write to the tables moves their watermarks and so the key
+    versions = await watermarks('task', 'archived_task')
+    digest = hashlib.blake2b(
+        repr((versions, sorted(request.dict().items()))).encode('utf-8'), digest_size=16
+    )
+    key = f'facets:{digest.hexdigest()}'
+    facets: dict | None = await cache.get(key)
+    if facets is None:
+        model = tasks_with_archived() if request.include_archived else Task
+        query = filter_tasks(select(model), request, model)
+        facets = await count_task_facets(query, model)
+        await cache.set(key, facets, settings.facets_cache_ttl)
+
+    return facets
 
 
 @router.get(
@@ -77,21 +156,30 @@ async def read_tasks_list(
     response_model=list[TaskResponse],
     status_code=status.HTTP_200_OK,
 )
-async def today_tasks() -> list[Record]:
-    query = select(Task).filter(
-        (func.DATE(Task.created_at) == date.today())
-        | (func.DATE(Task.completed_at) == date.today())
+async def today_tasks(request: RetrieveTodayTasksRequest = Depends()) -> list[Record]:
+    start, end = day_bounds(request.day, request.timezone)
+    # each arm of the union is a range scan on its own index
+    today = union(
+        select(Task.id).filter(Task.created_at >= start, Task.created_at < end),
+        select(Task.id).filter(Task.completed_at >= start, Task.completed_at < end),
     )
+    query = select(Task).filter(Task.id.in_(today)).order_by(Task.created_at, Task.id)
 
     tasks = await database.fetch_all(query)
 
     return tasks
 
 
-@router.get('/tasks/{pk}/', tags=['tasks'], response_model=TaskResponse)
-async def read_task(pk: int) -> Record:
+@router.get(
+    '/tasks/{pk}/',
+    tags=['tasks'],
+    response_model=TaskResponse,
+    dependencies=[Depends(conditional_get(get_task_version))],
+)
+async def read_task(pk: int, include_archived: bool = Query(False)) -> Record:
+    get_task = get_one_task_or_archived if include_archived else get_one_task
     with funcy.reraise(DoesNotExist, NotFound(f'task with pk={pk} not found')):
-        task: Record = await get_one_task(pk=pk)
+        task: Record = await get_task(pk=pk)
     return task
 
 
@@ -102,26 +190,18 @@ async def read_task(pk: int) -> Record:
     status_code=status.HTTP_201_CREATED,
 )
 async def create_task(request: CreateTaskRequest) -> Record:
-    with funcy.reraise(
-        DoesNotExist, NotFound(f'project with pk={request.project_id} not found')
-    ):
-        await get_one_project(pk=request.project_id)
-    task: Record = await create_one_task(data=request.dict())
+    with funcy.reraise(RelatedDoesNotExist, related_not_found):
+        task: Record = await create_one_task(data=request.dict())
     return task
 
 
 @router.put('/tasks/{pk}/', tags=['tasks'], response_model=TaskResponse)
 async def update_task(pk: int, request: UpdateTaskRequest) -> Record:
     update_data = request.dict(exclude_unset=True)
-    project_id = request.project_id
-
-    with funcy.reraise(
-        DoesNotExist, NotFound(f'project with pk={project_id} not found')
-    ):
-        await get_one_project(pk=project_id)
 
     with funcy.reraise(DoesNotExist, NotFound(f'task with pk={pk} not found')):
-        task: Record = await update_one_task(pk=pk, data=update_data)
+        with funcy.reraise(RelatedDoesNotExist, related_not_found):
+            task: Record = await update_one_task(pk=pk, data=update_data)
 
     return task
 
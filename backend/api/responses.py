@@ -1,25 +1,127 @@
-from typing import Any
+from collections.abc import AsyncIterable, AsyncIterator, Mapping
+from enum import Enum
+from typing import Any, NamedTuple
 
 from fastapi.encoders import jsonable_encoder
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from funcy import is_seqcont
+from pydantic import BaseModel
 
 from utils import dumps
 
-__all__ = ('APIResponse',)
+__all__ = ('APIResponse', 'EncodedList', 'StreamingAPIResponse', 'StreamingFormat')
+
+NDJSON_MEDIA_TYPE = 'application/x-ndjson'
+
+
+class StreamingFormat(str, Enum):
+    JSON = 'json'
+    NDJSON = 'ndjson'
+
+
+class EncodedList(NamedTuple):
+    """A JSON array already encoded by the database, see ``json_list``."""
+
+    data: str
+    length: int
 
 
 class APIResponse(JSONResponse):
     media_type = 'application/json'
 
+    def __init__(
+        self,
+        content: Any = None,
+        *args: Any,
+        next_cursor: str | None = None,
+        **kwargs: Any,
+    ) -> None:
+        self.next_cursor = next_cursor
+        super().__init__(content, *args, **kwargs)
+
     def render(self, content: Any) -> Any:
         if content is None:
             return None
 
+        if isinstance(content, EncodedList):
+            return self._render_encoded(content)
+
         if is_seqcont(content):
             data: list = list(content)
             content = {'status': 'ok', 'data': data, 'count': len(data)}
+            if self.next_cursor is not None:
+                content['next_cursor'] = self.next_cursor
         else:
             content = {'status': 'ok', 'data': content}
 
         return dumps(jsonable_encoder(content)).encode('utf-8')
+
+    def _render_encoded(self, content: EncodedList) -> bytes:
+        rendered = f'{{"status":"ok","data":{content.data},"count":{content.length}'
+        if self.next_cursor is not None:
+            rendered += f',"next_cursor":{dumps(self.next_cursor)}'
+        return f'{rendered}}}'.encode('utf-8')
+
+
+class StreamingAPIResponse(StreamingResponse):
+    """
+    Writes a list response while the records are being fetched, so memory
+    usage does not depend on the size of the collection.
+
+    ``StreamingFormat.JSON`` keeps the ``{status, data, count}`` envelope of
+    ``APIResponse``, ``StreamingFormat.NDJSON`` writes one item per line.
+    """
+
+    chunk_size = 64 * 1024
+
+    def __init__(
+        self,
+        records: AsyncIterable[Mapping],
+        *,
+        response_model: type[BaseModel],
+        streaming_format: StreamingFormat = StreamingFormat.JSON,
+        **kwargs: Any,
+    ) -> None:
+        if streaming_format == StreamingFormat.NDJSON:
+            content = self._render_ndjson(records, response_model)
+            media_type = NDJSON_MEDIA_TYPE
+        else:
+            content = self._render_json(records, response_model)
+            media_type = APIResponse.media_type
+        super().__init__(content, media_type=media_type, **kwargs)
+
+    @staticmethod
+    def _render_item(record: Mapping, response_model: type[BaseModel]) -> bytes:
+        item = jsonable_encoder(response_model.parse_obj(record))
+        rendered: str = dumps(item)
+        return rendered.encode('utf-8')
+
+    async def _render_json(
+        self, records: AsyncIterable[Mapping], response_model: type[BaseModel]
+    ) -> AsyncIterator[bytes]:
+        count = 0
+        chunk = bytearray(b'{"status":"ok","data":[')
+        async for record in records:
+            if count:
+                chunk += b','
+            chunk += self._render_item(record, response_model)
+            count += 1
+            if len(chunk) >= self.chunk_size:
+                yield bytes(chunk)
+                chunk.clear()
+
+        chunk += f'],"count":{count}}}'.encode('utf-8')
+        yield bytes(chunk)
+
+    async def _render_ndjson(
+        self, records: AsyncIterable[Mapping], response_model: type[BaseModel]
+    ) -> AsyncIterator[bytes]:
+        chunk = bytearray()
+        async for record in records:
+            chunk += self._render_item(record, response_model) + b'\n'
+            if len(chunk) >= self.chunk_size:
+                yield bytes(chunk)
+                chunk.clear()
+
+        if chunk:
+            yield bytes(chunk)
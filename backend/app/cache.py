@@ -0,0 +1,305 @@
+import asyncio
+import logging
+import sys
+from abc import ABC, abstractmethod
+from collections.abc import Iterable, Mapping
+from datetime import date, datetime, time
+from typing import Any
+
+from redis import asyncio as aioredis
+from redis.exceptions import RedisError
+
+from app.settings import CacheBackendType, settings
+from utils import dumps, loads
+from utils.cache import LRUCache
+
+__all__ = (
+    'CacheBackend',
+    'MemoryCacheBackend',
+    'RedisCacheBackend',
+    'cache',
+    'create_cache_backend',
+)
+
+logger = logging.getLogger(__name__)
+
+# the temporal values of rows keep their types through JSON as tagged strings
+TEMPORAL_TYPES: dict[str, Any] = {'datetime': datetime, 'date': date, 'time': time}
+
+
+class CacheBackend(ABC):
+    """
+    Cache of values by string keys, prefixed with the namespace of the
+    deployment so that several deployments can share one cache server.
+    """
+
+    name: str
+
+    def __init__(self, namespace: str) -> None:
+        self.namespace = namespace
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, key: str) -> str:
+        return f'{self.namespace}:{key}'
+
+    async def get(self, key: str) -> Any:
+        (value,) = await self.get_many([key])
+        return value
+
+    async def get_many(self, keys: list[str]) -> list[Any]:
+        """The values of the keys in one round trip, None for the missing ones."""
+        values = await self._get_many([self.key(key) for key in keys])
+        hits = sum(value is not None for value in values)
+        self.hits += hits
+        self.misses += len(values) - hits
+        return values
+
+    async def set(self, key: str, value: Any, ttl: float) -> None:
+        await self.set_many({key: value}, ttl)
+
+    async def set_many(self, values: Mapping[str, Any], ttl: float) -> None:
+        """Sets the values for ``ttl`` seconds, 0 sets nothing."""
+        if values and ttl > 0:
+            await self._set_many(
+                {self.key(key): value for key, value in values.items()}, ttl
+            )
+
+    def peek(self, key: str) -> Any:
+        """The value if the worker holds it, without a round trip or counting."""
+        return None
+
+    def invalidate(self, keys: Iterable[str]) -> None:
+        """Drops the values, the reads of the worker miss them right away."""
+        self._invalidate([self.key(key) for key in keys])
+
+    def forget(self, keys: Iterable[str]) -> None:
+        """
+        Drops the values the worker holds itself, those of a shared cache stay
+        for the worker that changed them to replace.
+        """
+
+    def reset(self) -> None:
+        """Drops all the worker holds itself, a shared cache keeps its values."""
+
+    async def clear(self) -> None:
+        """Drops all values of the namespace."""
+        await self._clear()
+
+    async def stats(self) -> dict:
+        return {
+            'backend': self.name,
+            'hits': self.hits,
+            'misses': self.misses,
+            **await self._stats(),
+        }
+
+    async def close(self) -> None:
+        pass
+
+    @abstractmethod
+    async def _get_many(self, keys: list[str]) -> list[Any]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def _set_many(self, values: dict[str, Any], ttl: float) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def _invalidate(self, keys: list[str]) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def _clear(self) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def _stats(self) -> dict:
+        raise NotImplementedError
+
+
+class MemoryCacheBackend(CacheBackend):
+    """Values kept as they are in the LRU cache of the worker."""
+
+    name = CacheBackendType.MEMORY.value
+
+    def __init__(self, namespace: str, max_bytes: int) -> None:
+        super().__init__(namespace)
+        self.values = LRUCache(ttl=0, max_bytes=max_bytes, sizeof=value_size)
+
+    def peek(self, key: str) -> Any:
+        return self.values.peek(self.key(key))
+
+    async def _get_many(self, keys: list[str]) -> list[Any]:
+        return [self.values.get(key) for key in keys]
+
+    async def _set_many(self, values: dict[str, Any], ttl: float) -> None:
+        for key, value in values.items():
+            self.values.set(key, value, ttl)
+
+    def forget(self, keys: Iterable[str]) -> None:
+        self.invalidate(keys)
+
+    def reset(self) -> None:
+        self.values.clear()
+
+    def _invalidate(self, keys: list[str]) -> None:
+        for key in keys:
+            self.values.pop(key)
+
+    async def _clear(self) -> None:
+        self.values.clear()
+
+    async def _stats(self) -> dict:
+        stats = self.values.stats()
+        del stats['hits'], stats['misses']
+        return stats
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Values encoded as JSON on a server speaking the Redis protocol, shared by
+    all workers and hosts of the deployment.
+
+    Keys are read and written with pipelined commands, one round trip per
+    call. Invalidated keys are deleted in the background in batches and
+    count as missing for the reads of the worker until then, the ones a
+    failed delete leaves are dropped with it. A server that fails is logged
+    and treated as an empty cache, requests go on without it.
+    """
+
+    name = CacheBackendType.REDIS.value
+
+    def __init__(self, namespace: str, client: aioredis.Redis) -> None:
+        super().__init__(namespace)
+        self.client = client
+        self.invalidated: set[str] = set()
+        self.deleting: asyncio.Task | None = None
+
+    async def _get_many(self, keys: list[str]) -> list[Any]:
+        pipeline = self.client.pipeline(transaction=False)
+        for key in keys:
+            pipeline.get(key)
+        try:
+            values = await pipeline.execute()
+        except RedisError:
+            logger.exception('cache read failed')
+            return [None] * len(keys)
+
+        return [
+            None if value is None or key in self.invalidated else decode(value)
+            for key, value in zip(keys, values)
+        ]
+
+    async def _set_many(self, values: dict[str, Any], ttl: float) -> None:
+        pipeline = self.client.pipeline(transaction=False)
+        for key, value in values.items():
+            pipeline.set(key, encode(value), px=int(ttl * 1000))
+        try:
+            await pipeline.execute()
+        except RedisError:
+            logger.exception('cache write failed')
+
+    def _invalidate(self, keys: list[str]) -> None:
+        self.invalidated.update(keys)
+        if self.deleting is None:
+            self.deleting = asyncio.create_task(self.delete_invalidated())
+
+    async def delete_invalidated(self) -> None:
+        # the keys invalidated while a batch is deleted make the next one
+        try:
+            while self.invalidated:
+                keys = list(self.invalidated)
+                try:
+                    await self.client.delete(*keys)
+                except RedisError:
+                    logger.exception('cache invalidation failed')
+                    # kept while the server is down they would pile up
+                    self.invalidated.clear()
+                    return
+                self.invalidated.difference_update(keys)
+        finally:
+            self.deleting = None
+
+    def reset(self) -> None:
+        self.invalidated.clear()
+
+    async def _clear(self) -> None:
+        try:
+            keys = [key async for key in self.client.scan_iter(f'{self.namespace}:*')]
+            if keys:
+                await self.client.delete(*keys)
+        except RedisError:
+            logger.exception('cache clear failed')
+
+    async def _stats(self) -> dict:
+        # of the whole server, which the namespaces of deployments may share,
+        # servers speaking the protocol without INFO report no memory
+        size = 0
+        try:
+            size = await self.client.dbsize()
+            info = await self.client.info()
+        except RedisError:
+            logger.exception('cache stats failed')
+            info = {}
+        return {
+            'size': size,
+            'bytes': info.get('used_memory', 0),
+            'max_bytes': info.get('maxmemory', 0),
+            'evictions': info.get('evicted_keys', 0),
+        }
+
+    async def close(self) -> None:
+        if self.deleting is not None:
+            await self.deleting
+        await self.client.aclose()
+
+
+def value_size(value: Any) -> int:
+    size = sys.getsizeof(value)
+    if isinstance(value, Mapping):
+        size += sum(sys.getsizeof(item) for item in value.values())
+    return size
+
+
+def encode(value: Any) -> bytes:
+    encoded: str = dumps(_tag(value))
+    return encoded.encode('utf-8')
+
+
+def decode(encoded: bytes) -> Any:
+    return _untag(loads(encoded))
+
+
+def _tag(value: Any) -> Any:
+    if isinstance(value, (datetime, date, time)):
+        return {f'${type(value).__name__}': value.isoformat()}
+    if isinstance(value, Mapping):
+        return {key: _tag(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_tag(item) for item in value]
+    return value
+
+
+def _untag(value: Any) -> Any:
+    if isinstance(value, dict):
+        if len(value) == 1:
+            ((key, item),) = value.items()
+            if key.startswith('$') and key[1:] in TEMPORAL_TYPES:
+                return TEMPORAL_TYPES[key[1:]].fromisoformat(item)
+        return {key: _untag(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_untag(item) for item in value]
+    return value
+
+
+def create_cache_backend() -> CacheBackend:
+    namespace = (
+        settings.cache_namespace or f'{settings.app_name}:{settings.environment}'
+    )
+    if settings.cache_backend == CacheBackendType.REDIS:
+        return RedisCacheBackend(namespace, aioredis.from_url(settings.redis_url))
+    return MemoryCacheBackend(namespace, max_bytes=settings.memory_cache_max_bytes)
+
+
+cache = create_cache_backend()
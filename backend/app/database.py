@@ -1,10 +1,282 @@
+import asyncio
+import time
+from collections.abc import Callable, Mapping
+from contextvars import ContextVar
+from typing import Any, TypeVar, cast
+
 import databases
+from asyncpg import PostgresError
+from sqlalchemy import DDL, Column, Sequence, event, inspect
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.sql import ClauseElement
 
+from app.pool import InstrumentedPool
 from app.settings import settings
 
 BaseDBModel = declarative_base()
-if settings.is_testing_environment:
-    database = databases.Database(settings.database_url, force_rollback=True)
-else:
-    database = databases.Database(settings.database_url)
+event.listen(
+    BaseDBModel.metadata, 'before_create', DDL('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+)
+
+# Versions of all tables come from one sequence, so a row gets a version no
+# other row ever had and the greatest version of a set of rows changes with
+# any insert or update among them.
+ROW_VERSION = Sequence('row_version_seq', metadata=BaseDBModel.metadata)
+event.listen(
+    BaseDBModel.metadata,
+    'before_create',
+    DDL('''
+        CREATE OR REPLACE FUNCTION touch_row() RETURNS trigger AS $$
+        BEGIN
+            NEW.updated_at = now();
+            NEW.version = nextval('row_version_seq');
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+        '''),
+)
+# The watermark of a table changes with every statement that changes its
+# rows, see ``models.Watermark``. Statements that change no rows leave it be.
+event.listen(
+    BaseDBModel.metadata,
+    'before_create',
+    DDL('''
+        CREATE OR REPLACE FUNCTION bump_watermark() RETURNS trigger AS $$
+        BEGIN
+            IF EXISTS (SELECT FROM changed) THEN
+                INSERT INTO watermark (table_name, version)
+                VALUES (TG_TABLE_NAME, nextval('row_version_seq'));
+            END IF;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+        '''),
+)
+# Every committed change of a versioned row is announced on CHANGES_CHANNEL as
+# ``table:operation:pk:version``, see ``app.notifications``. The table is passed as an
+# argument, the triggers of a partitioned table run with partitions' names.
+CHANGES_CHANNEL = 'row_changes'
+event.listen(
+    BaseDBModel.metadata,
+    'before_create',
+    DDL(f'''
+        CREATE OR REPLACE FUNCTION notify_change() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'DELETE' THEN
+                PERFORM pg_notify(
+                    '{CHANGES_CHANNEL}',
+                    concat_ws(':', TG_ARGV[0], TG_OP, OLD.id, OLD.version)
+                );
+            ELSE
+                PERFORM pg_notify(
+                    '{CHANGES_CHANNEL}',
+                    concat_ws(':', TG_ARGV[0], TG_OP, NEW.id, NEW.version)
+                );
+            END IF;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+        '''),
+)
+
+Endpoint = TypeVar('Endpoint', bound=Callable)
+Model = TypeVar('Model')
+
+# the WAL replay position is compared first, an idle primary sends no new
+# transactions and the last replay timestamp alone would look like lag
+REPLICA_LAG_QUERY = '''
+SELECT CASE
+    WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+    ELSE coalesce(extract(epoch FROM now() - pg_last_xact_replay_timestamp()), 0)
+END
+'''
+
+
+def versioned(model: Model) -> Model:
+    """
+    Bumps ``updated_at`` and ``version`` of the rows of the model, declared
+    with ``ROW_VERSION`` as the default, on every update and notifies
+    ``CHANGES_CHANNEL`` of every change.
+    """
+    table = model.__table__  # type: ignore
+    event.listen(
+        table,
+        'after_create',
+        DDL(
+            'CREATE TRIGGER %(table)s_touch BEFORE UPDATE ON %(table)s '
+            'FOR EACH ROW EXECUTE FUNCTION touch_row()'
+        ),
+    )
+    event.listen(
+        table,
+        'after_create',
+        DDL(
+            'CREATE TRIGGER %(table)s_notify '
+            'AFTER INSERT OR UPDATE OR DELETE ON %(table)s '
+            "FOR EACH ROW EXECUTE FUNCTION notify_change('%(table)s')"
+        ),
+    )
+    return model
+
+
+def watermarked(model: Model) -> Model:
+    """
+    Bumps the watermark of the table of the model after every statement that
+    inserts, updates or deletes its rows.
+    """
+    table = model.__table__  # type: ignore
+    for event_name, transition in (
+        ('INSERT', 'NEW'),
+        ('UPDATE', 'NEW'),
+        ('DELETE', 'OLD'),
+    ):
+        event.listen(
+            table,
+            'after_create',
+            DDL(
+                f'CREATE TRIGGER %(table)s_watermark_{event_name.lower()} '
+                f'AFTER {event_name} ON %(table)s '
+                f'REFERENCING {transition} TABLE AS changed '
+                'FOR EACH STATEMENT EXECUTE FUNCTION bump_watermark()'
+            ),
+        )
+    return model
+
+
+def row_columns(model: Any) -> list[Column]:
+    """
+    Columns of the rows of the model as ``select(model)`` reads them, the
+    deferred ones left out, for statements that list columns themselves.
+    """
+    return [
+        prop.columns[0] for prop in inspect(model).column_attrs if not prop.deferred
+    ]
+
+
+def create_database(url: str) -> databases.Database:
+    return databases.Database(
+        url,
+        force_rollback=settings.is_testing_environment,
+        min_size=settings.db_pool_min_size,
+        max_size=settings.db_pool_max_size,
+        max_inactive_connection_lifetime=settings.db_pool_max_idle_lifetime,
+        server_settings={'statement_timeout': str(settings.db_statement_timeout)},
+    )
+
+
+primary = create_database(settings.database_url)
+replica = (
+    create_database(settings.replica_database_url)
+    if settings.replica_database_url
+    else None
+)
+use_replica: ContextVar[bool] = ContextVar('use_replica', default=False)
+
+
+class RoutingDatabase:
+    """
+    Runs queries on the replica when the current request was routed there,
+    see ``app.dependencies.route_reads``, and on the primary otherwise.
+    """
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.target, name)
+
+    @property
+    def target(self) -> databases.Database:
+        if replica is not None and use_replica.get():
+            return replica
+        return primary
+
+
+database = cast(databases.Database, RoutingDatabase())
+
+# databases 0.6 declares its records as sequences, they are read by column
+# name all the same
+Row = Mapping[str, Any]
+
+
+async def fetch_rows(query: ClauseElement) -> list[Row]:
+    return cast(list[Row], await database.fetch_all(query))
+
+
+async def fetch_row(query: ClauseElement) -> Row | None:
+    return cast(Row | None, await database.fetch_one(query))
+
+
+def primary_database(endpoint: Endpoint) -> Endpoint:
+    """Keeps a GET endpoint on the primary, e.g. for read-after-write flows."""
+    endpoint.primary_database = True  # type: ignore
+    return endpoint
+
+
+def statement_timeout(seconds: float) -> Callable[[Endpoint], Endpoint]:
+    """Overrides ``Settings.db_route_statement_timeout`` for an endpoint."""
+
+    def decorator(endpoint: Endpoint) -> Endpoint:
+        endpoint.statement_timeout = seconds  # type: ignore
+        return endpoint
+
+    return decorator
+
+
+class ReplicaLag:
+    """Replication lag of the replica in seconds, cached for a check interval."""
+
+    def __init__(self) -> None:
+        self.checked_at = float('-inf')
+        self.seconds = 0.0
+
+    async def __call__(self) -> float:
+        now = time.monotonic()
+        if now - self.checked_at >= settings.replica_lag_check_interval:
+            self.checked_at = now
+            self.seconds = await self.check()
+        return self.seconds
+
+    @staticmethod
+    async def check() -> float:
+        assert replica is not None
+        try:
+            return float(await replica.fetch_val(REPLICA_LAG_QUERY))
+        except (OSError, asyncio.TimeoutError, PostgresError):
+            # an unreachable replica is as good as an infinitely lagging one
+            return float('inf')
+
+
+replica_lag = ReplicaLag()
+
+
+def instrument_pool(db: databases.Database) -> None:
+    """
+    Puts ``InstrumentedPool`` in place of the asyncpg pool of a connected
+    database. databases 0.6, pinned in requirements.txt, keeps the pool in
+    the private ``_backend._pool`` and acquires and releases connections
+    through it, check it on upgrades.
+    """
+    backend = db._backend
+    backend._pool = InstrumentedPool(
+        backend._pool, acquire_timeout=settings.db_pool_acquire_timeout
+    )
+
+
+def instrumented_pool(db: databases.Database) -> InstrumentedPool:
+    pool: InstrumentedPool = db._backend._pool
+    return pool
+
+
+async def connect() -> None:
+    for db in (primary, replica):
+        if db is not None:
+            await db.connect()
+            instrument_pool(db)
+
+
+async def disconnect() -> None:
+    for db in (primary, replica):
+        if db is not None:
+            await db.disconnect()
+
+
+def pool_stats() -> dict:
+    return instrumented_pool(primary).stats()
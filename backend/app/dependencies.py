@@ -0,0 +1,112 @@
+import hashlib
+from collections.abc import Awaitable, Callable
+
+from fastapi import Depends, Header, Query, Request, Response
+
+from api.exceptions import NotModified
+from api.responses import NDJSON_MEDIA_TYPE, StreamingFormat
+from app import database
+from app.settings import settings
+from services.exceptions import DoesNotExist
+from services.loaders import Loaders
+from services.watermarks import watermarks
+
+
+async def get_loaders() -> Loaders:
+    return Loaders()
+
+
+async def get_streaming_format(
+    accept: str | None = Header(None), stream: bool = Query(False)
+) -> StreamingFormat | None:
+    if accept and NDJSON_MEDIA_TYPE in accept:
+        return StreamingFormat.NDJSON
+
+    if stream:
+        return StreamingFormat.JSON
+
+    return None
+
+
+async def route_reads(request: Request) -> None:
+    """
+    Runs the queries of GET endpoints on the replica unless the endpoint is
+    marked with ``primary_database`` or the replica lags too far behind.
+
+    The request is handled in its own task, see ``CancellableRoute``, so the
+    context variable doesn't outlive the request.
+    """
+    endpoint = request.scope.get('endpoint')
+    if (
+        request.method == 'GET'
+        and database.replica is not None
+        and not getattr(endpoint, 'primary_database', False)
+        and await database.replica_lag() <= settings.replica_max_lag
+    ):
+        database.use_replica.set(True)
+
+
+def conditional_get(
+    get_version: Callable[..., Awaitable[int]],
+) -> Callable[..., Awaitable[None]]:
+    """
+    Dependency of the GET endpoint of a single resource which answers an
+    ``If-None-Match`` request with 304 after looking up the version of the
+    resource alone, and adds its ``ETag`` to the response otherwise.
+
+    The version is looked up before the endpoint fetches the resource, a
+    write in between leaves the response with an outdated ETag, so the next
+    request gets the full response again rather than a stale 304.
+    """
+
+    async def check_version(pk: int, request: Request, response: Response) -> None:
+        try:
+            version = await get_version(pk=pk)
+        except DoesNotExist:
+            return  # the endpoint responds with 404
+
+        etag = f'"{version}"'
+        if etag_matches(request.headers.get('If-None-Match'), etag):
+            raise NotModified(etag)
+        response.headers['ETag'] = etag
+
+    return check_version
+
+
+def conditional_list(*tables: str) -> Callable[..., Awaitable[None]]:
+    """
+    Dependency of the GET endpoint of a list which answers an
+    ``If-None-Match`` request with 304 after looking up the watermarks of the
+    tables the list is read from alone, see ``services.watermarks``.
+
+    The ETag hashes the watermarks with the query parameters in a canonical
+    order and the streaming format, ``app.middleware.WatermarkMiddleware``
+    adds it to the response.
+    """
+
+    async def check_watermarks(
+        request: Request,
+        streaming_format: StreamingFormat | None = Depends(get_streaming_format),
+    ) -> None:
+        key = (
+            await watermarks(*tables),
+            sorted(request.query_params.multi_items()),
+            streaming_format,
+        )
+        digest = hashlib.blake2b(repr(key).encode('utf-8'), digest_size=8)
+        etag = f'"{digest.hexdigest()}"'
+        if etag_matches(request.headers.get('If-None-Match'), etag):
+            raise NotModified(etag)
+        request.state.etag = etag
+
+    return check_watermarks
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    # If-None-Match compares entity tags weakly, W/ prefixes are ignored
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == '*':
+        return True
+    tags = (tag.strip().removeprefix('W/') for tag in if_none_match.split(','))
+    return etag in tags
@@ -2,7 +2,7 @@ from http import HTTPStatus
 
 from fastapi.exceptions import HTTPException, RequestValidationError
 from fastapi.requests import Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from pydantic import ValidationError
 
 
@@ -36,6 +36,11 @@ async def exceptions_handler(request: Request, exc: HTTPException) -> JSONRespon
     )
 
 
+async def not_modified_handler(request: Request, exc: HTTPException) -> Response:
+    # a 304 has no body, only the validators of the cached response
+    return Response(status_code=exc.status_code, headers=exc.headers)
+
+
 def error_response(
     code: str = 'server_error', status_code: int = 500, message: str = ''
 ) -> JSONResponse:
@@ -0,0 +1,40 @@
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+
+__all__ = ('PeriodicJob',)
+
+logger = logging.getLogger(__name__)
+
+
+class PeriodicJob:
+    """
+    Runs a coroutine function in the background of the app every
+    ``interval`` seconds, a failed run is logged and retried on the next one.
+    """
+
+    def __init__(self, job: Callable[[], Awaitable], interval: float) -> None:
+        self.job = job
+        self.interval = interval
+        self.task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        self.task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        if self.task is None:
+            return
+        self.task.cancel()
+        try:
+            await self.task
+        except asyncio.CancelledError:
+            pass
+        self.task = None
+
+    async def run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.job()
+            except Exception:
+                logger.exception('periodic job %s failed', self.job)
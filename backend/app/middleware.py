@@ -0,0 +1,36 @@
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from services.watermarks import watermarks
+
+__all__ = ('WatermarkMiddleware',)
+
+SAFE_METHODS = frozenset(('GET', 'HEAD', 'OPTIONS'))
+
+
+class WatermarkMiddleware:
+    """
+    Adds the ETag of a list, see ``app.dependencies.conditional_list``, to its
+    response, endpoints returning their own ``Response`` drop the headers set
+    by dependencies, and expires the watermarks cached by the worker once it
+    responds to a write, so its clients see their own writes at once.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        async def send_response(message: Message) -> None:
+            if message['type'] == 'http.response.start':
+                if scope['method'] not in SAFE_METHODS:
+                    watermarks.clear()
+                etag = scope.get('state', {}).get('etag')
+                if etag is not None and 200 <= message['status'] < 300:
+                    MutableHeaders(raw=message['headers']).setdefault('etag', etag)
+            await send(message)
+
+        await self.app(scope, receive, send_response)
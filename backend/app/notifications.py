@@ -0,0 +1,88 @@
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+
+import asyncpg
+
+from app.database import CHANGES_CHANNEL
+
+__all__ = ('ChangeListener',)
+
+logger = logging.getLogger(__name__)
+
+
+class ChangeListener:
+    """
+    Listens to ``CHANGES_CHANNEL`` on a connection of its own and passes the
+    table, operation (INSERT, UPDATE or DELETE), pk and version of every
+    committed change to ``on_change``.
+
+    Changes committed while nobody listens are never delivered, so
+    ``on_gap`` is called on every connect, before the first change, to drop
+    whatever was cached until then. A lost connection, or one that doesn't
+    answer a keepalive query in time, is replaced ``reconnect_interval``
+    seconds later.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        on_change: Callable[[str, str, int, int], None],
+        on_gap: Callable[[], Awaitable[None]],
+        reconnect_interval: float,
+        keepalive_interval: float,
+    ) -> None:
+        self.url = url
+        self.on_change = on_change
+        self.on_gap = on_gap
+        self.reconnect_interval = reconnect_interval
+        self.keepalive_interval = keepalive_interval
+        self.connection: asyncpg.Connection | None = None
+        self.task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        self.task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        if self.task is None:
+            return
+        self.task.cancel()
+        try:
+            await self.task
+        except asyncio.CancelledError:
+            pass
+        self.task = None
+
+    async def run(self) -> None:
+        while True:
+            try:
+                await self.listen()
+                logger.warning('listener of changes disconnected')
+            except Exception:
+                logger.exception('listener of changes failed')
+            await asyncio.sleep(self.reconnect_interval)
+
+    async def listen(self) -> None:
+        connection = await asyncpg.connect(self.url, timeout=self.keepalive_interval)
+        closed = asyncio.Event()
+        connection.add_termination_listener(lambda _: closed.set())
+        self.connection = connection
+        try:
+            await connection.add_listener(CHANGES_CHANNEL, self.notify)
+            await self.on_gap()
+            while not closed.is_set():
+                try:
+                    await asyncio.wait_for(closed.wait(), self.keepalive_interval)
+                except asyncio.TimeoutError:
+                    await connection.fetchval(
+                        'SELECT 1', timeout=self.keepalive_interval
+                    )
+        finally:
+            self.connection = None
+            connection.terminate()
+
+    def notify(
+        self, connection: asyncpg.Connection, pid: int, channel: str, payload: str
+    ) -> None:
+        table, operation, pk, version = payload.split(':')
+        self.on_change(table, operation, int(pk), int(version))
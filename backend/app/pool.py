@@ -0,0 +1,62 @@
+import asyncio
+import time
+from typing import Any
+
+from asyncpg import Connection, Pool
+
+__all__ = ('InstrumentedPool',)
+
+
+class InstrumentedPool:
+    """
+    Proxy of the asyncpg pool behind ``databases`` that bounds the time to
+    acquire a connection and counts acquire waiters, the latency of the
+    acquired connections and the acquires that timed out.
+    """
+
+    def __init__(self, pool: Pool, acquire_timeout: float | None = None) -> None:
+        self._pool = pool
+        self.acquire_timeout = acquire_timeout
+        self.acquired = 0
+        self.acquire_time = 0.0
+        self.max_acquire_time = 0.0
+        self.timeouts = 0
+        self.waiters = 0
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._pool, name)
+
+    async def acquire(self) -> Connection:
+        self.waiters += 1
+        started_at = time.perf_counter()
+        try:
+            connection = await self._pool.acquire(timeout=self.acquire_timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            self.waiters -= 1
+
+        elapsed = time.perf_counter() - started_at
+        self.acquired += 1
+        self.acquire_time += elapsed
+        self.max_acquire_time = max(self.max_acquire_time, elapsed)
+        return connection
+
+    def stats(self) -> dict:
+        size = self._pool.get_size()
+        idle = self._pool.get_idle_size()
+        return {
+            'size': size,
+            'min_size': self._pool.get_min_size(),
+            'max_size': self._pool.get_max_size(),
+            'in_use': size - idle,
+            'idle': idle,
+            'waiters': self.waiters,
+            'acquired': self.acquired,
+            'acquire_time_avg': (
+                self.acquire_time / self.acquired if self.acquired else 0.0
+            ),
+            'acquire_time_max': self.max_acquire_time,
+            'timeouts': self.timeouts,
+        }
@@ -0,0 +1,104 @@
+import asyncio
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from typing import Any
+
+from asyncpg import QueryCanceledError
+from fastapi.routing import APIRoute
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from api.exceptions import ServiceUnavailable
+from app.settings import settings
+
+__all__ = ('CancellableRoute',)
+
+
+# methods whose handlers only read, cancelling them half-way changes nothing
+SAFE_METHODS = frozenset({'GET', 'HEAD'})
+
+
+class CancellableRoute(APIRoute):
+    """
+    GET routes handled in their own task, which is cancelled together with the
+    query asyncpg is waiting for once the statement timeout of the endpoint
+    expires before the response starts or once the client disconnects before
+    it. A response that started, e.g. a streamed list, is never cut off.
+
+    The timeout is ``Settings.db_route_statement_timeout`` unless the endpoint
+    overrides it with ``app.database.statement_timeout``. Writes are never
+    cancelled half-way, only ``Settings.db_statement_timeout`` limits their
+    statements in the database.
+    """
+
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs: Any) -> None:
+        super().__init__(path, endpoint, **kwargs)
+        self.app = self.cancellable(self.app)
+
+    @property
+    def statement_timeout(self) -> float:
+        timeout: float = getattr(
+            self.endpoint, 'statement_timeout', settings.db_route_statement_timeout
+        )
+        return timeout
+
+    def cancellable(self, app: ASGIApp) -> ASGIApp:
+        async def cancellable_app(scope: Scope, receive: Receive, send: Send) -> None:
+            if scope['method'] not in SAFE_METHODS:
+                with reraise_timeouts():
+                    await app(scope, receive, send)
+                return
+
+            response_started = asyncio.Event()
+
+            async def send_response(message: Message) -> None:
+                # streaming responses listen for disconnects themselves
+                response_started.set()
+                listening.cancel()
+                await send(message)
+
+            async def cancel_on_disconnect() -> None:
+                while (await receive())['type'] != 'http.disconnect':
+                    pass
+                handling.cancel()
+
+            handling = asyncio.ensure_future(app(scope, receive, send_response))
+            listening = asyncio.ensure_future(cancel_on_disconnect())
+            starting = asyncio.ensure_future(response_started.wait())
+            tasks: set[asyncio.Future] = {handling, listening, starting}
+            try:
+                await asyncio.wait(
+                    {handling, starting},
+                    timeout=self.statement_timeout or None,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if not handling.done() and not response_started.is_set():
+                    raise ServiceUnavailable('statement timeout')
+                # the timeout is over once the response started
+                await asyncio.wait({handling})
+            finally:
+                for task in tasks:
+                    task.cancel()
+                # asyncpg cancels the running statement on the server and
+                # the pool takes the connection back once it is cancelled
+                await asyncio.wait(tasks)
+
+            if handling.cancelled():
+                return  # the client disconnected, nobody to respond to
+
+            if response_started.is_set():
+                handling.result()  # too late to respond with an error
+                return
+
+            with reraise_timeouts():
+                handling.result()
+
+        return cancellable_app
+
+
+@contextmanager
+def reraise_timeouts() -> Iterator[None]:
+    try:
+        yield
+    except (asyncio.TimeoutError, QueryCanceledError):
+        # the pool acquire timeout or Settings.db_statement_timeout
+        raise ServiceUnavailable('statement timeout')
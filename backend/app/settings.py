@@ -10,6 +10,16 @@ class Environment(str, Enum):
     PRODUCTION = 'prod'
 
 
+class DatabaseBackend(str, Enum):
+    DATABASES = 'databases'  # SQLAlchemy Core statements run by databases
+    ASYNCPG = 'asyncpg'  # precompiled statements on the raw asyncpg connection
+
+
+class CacheBackendType(str, Enum):
+    MEMORY = 'memory'  # in the process of each worker
+    REDIS = 'redis'  # on a Redis protocol server shared by all workers and hosts
+
+
 class Settings(BaseSettings):
     # Environment
     debug: bool = False
@@ -28,12 +38,58 @@ class Settings(BaseSettings):
     db_name: str = 'todo'
     db_user: str = 'todo'
     db_password: str = 'todo'
+    db_backend: DatabaseBackend = DatabaseBackend.DATABASES
+    db_pool_min_size: int = 5
+    db_pool_max_size: int = 20
+    db_pool_acquire_timeout: float = 5  # seconds
+    db_pool_max_idle_lifetime: float = 300  # seconds, 0 keeps idle connections
+    db_statement_timeout: int = 30_000  # milliseconds, 0 disables the timeout
+    # seconds the queries of a route may run before they are cancelled,
+    # endpoints override it with app.database.statement_timeout, 0 disables
+    db_route_statement_timeout: float = 10
+    # GET endpoints read from the replica, if set, while it lags behind less
+    replica_database_url: str | None = None
+    replica_max_lag: float = 5  # seconds
+    replica_lag_check_interval: float = 1  # seconds
+
+    # Rendering
+    # build list responses as JSON in Postgres instead of in Python
+    render_json_in_database: bool = False
+
+    # Caching
+    # app.cache, keys are prefixed with the namespace, app_name:environment by
+    # default, so deployments can share a server
+    cache_backend: CacheBackendType = CacheBackendType.MEMORY
+    cache_namespace: str | None = None
+    redis_url: str = 'redis://localhost:6379/0'
+    memory_cache_max_bytes: int = 16 * 1024 * 1024
+    facets_cache_ttl: float = 5  # seconds, 0 disables the cache
+    # seconds a worker answers list requests with 304 by watermarks it read,
+    # its own writes expire them at once, 0 reads them on every request
+    watermark_cache_ttl: float = 1
+    # seconds between the merges of the log of watermarks, 0 disables them
+    watermark_prune_interval: float = 60
+    # tables whose rows get_one and get_many serve from the cache, e.g. ["tag"],
+    # changes of other workers drop them once the listener of changes gets them
+    entity_cache_models: set[str] = set()
+    entity_cache_ttl: float = 30  # seconds
+    # seconds until the listener of changes, which keeps the caches of the
+    # worker in step with the other workers, reconnects and between the
+    # checks of its connection
+    changes_reconnect_interval: float = 1
+    changes_keepalive_interval: float = 10
+
+    # Archival
+    archive_after_days: int = 90  # completed tasks older than that are archived
+    archive_batch_size: int = 1000  # tasks moved per transaction
+    archive_interval: float = 0  # seconds between runs in the app, 0 disables
 
     # Logging
     log_level: str = 'info'
 
     # limits
     max_tasks_per_page = 50
+    max_search_results_per_page = 50
 
     @property
     def database_url(self) -> str:
@@ -0,0 +1,66 @@
+"""
+Python CPU time per CRUD call with each ``Settings.db_backend``.
+
+Runs against the configured database inside a rolled back transaction:
+
+    python -m benchmarks.crud --repeat 2000
+"""
+
+import argparse
+import asyncio
+import time
+
+from sqlalchemy import func
+
+from app.database import database
+from app.settings import DatabaseBackend, settings
+from services.spaces import Space
+from services.tasks import create_one_task, get_one_task, update_one_task
+
+
+async def crud_round(pk: int) -> None:
+    await get_one_task(pk=pk)
+    await update_one_task(pk=pk, data={'completed_at': func.now()})
+    await create_one_task(
+        data={'title': 'benchmark', 'decisive': False, 'space': Space.WORK.value}
+    )
+
+
+async def measure(pk: int, repeat: int) -> tuple[float, float]:
+    await crud_round(pk)  # warm up caches and the connection
+
+    cpu, wall = time.process_time(), time.perf_counter()
+    for _ in range(repeat):
+        await crud_round(pk)
+    cpu, wall = time.process_time() - cpu, time.perf_counter() - wall
+
+    calls = repeat * 3
+    return cpu / calls * 1_000_000, wall / calls * 1_000_000
+
+
+async def main(repeat: int) -> None:
+    await database.connect()
+    try:
+        async with database.transaction(force_rollback=True):
+            task = await create_one_task(
+                data={
+                    'title': 'benchmark',
+                    'decisive': False,
+                    'space': Space.WORK.value,
+                }
+            )
+            print(f'{repeat} x get_one + update_one + create_one, us per call')
+            print(f'{"backend":<10} {"python cpu":>10} {"wall":>8}')
+            for backend in DatabaseBackend:
+                settings.db_backend = backend
+                cpu, wall = await measure(task['id'], repeat)
+                print(f'{backend.value:<10} {cpu:>10.1f} {wall:>8.1f}')
+    finally:
+        await database.disconnect()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--repeat', type=int, default=2000)
+    args = parser.parse_args()
+    asyncio.run(main(args.repeat))
@@ -0,0 +1,80 @@
+"""
+Python CPU time spent per 1k rows of the tasks list, rendered in Python
+(records -> response model -> JSON) and in Postgres (``json_list``).
+
+Runs against the configured database, seed it with enough tasks first:
+
+    python -m benchmarks.render_lists --rows 1000 --repeat 50
+"""
+
+import argparse
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+
+from sqlalchemy import nullsfirst, select
+
+from api.responses import APIResponse, EncodedList
+from app.database import database
+from models import Task
+from schemas.tasks import TaskResponse
+from services.database import fetch_json_list, json_list
+
+ORDER_BY = [
+    nullsfirst(Task.completed_at.desc()),
+    Task.created_at.desc(),
+    Task.id.desc(),
+]
+QUERY = select(Task).order_by(*ORDER_BY)
+
+
+async def render_in_python(rows: int) -> bytes:
+    tasks = await database.fetch_all(QUERY.limit(rows))
+    response = APIResponse([TaskResponse.parse_obj(task) for task in tasks])
+    return response.body
+
+
+async def render_in_database(rows: int) -> bytes:
+    query = QUERY.add_columns(Task.completed_at.isnot(None).label('is_completed'))
+    rendered = await fetch_json_list(
+        json_list(query, [*TaskResponse.__fields__, 'is_completed'], ORDER_BY, rows)
+    )
+    response = APIResponse(EncodedList(rendered['data'], rendered['count']))
+    return response.body
+
+
+async def measure(
+    render: Callable[[int], Awaitable[bytes]], rows: int, repeat: int
+) -> tuple[float, float]:
+    await render(rows)  # warm up caches and the connection
+
+    cpu, wall = time.process_time(), time.perf_counter()
+    for _ in range(repeat):
+        await render(rows)
+    cpu, wall = time.process_time() - cpu, time.perf_counter() - wall
+
+    per_1k_rows = 1000 / (rows * repeat) * 1000
+    return cpu * per_1k_rows, wall * per_1k_rows
+
+
+async def main(rows: int, repeat: int) -> None:
+    await database.connect()
+    try:
+        print(f'{rows} rows x {repeat}, ms per 1k rows')
+        print(f'{"renderer":<10} {"python cpu":>10} {"wall":>8}')
+        for name, render in (
+            ('python', render_in_python),
+            ('database', render_in_database),
+        ):
+            cpu, wall = await measure(render, rows, repeat)
+            print(f'{name:<10} {cpu:>10.2f} {wall:>8.2f}')
+    finally:
+        await database.disconnect()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.repeat))
@@ -1,18 +1,34 @@
+import asyncio
+
 import click
+import funcy
 import uvicorn
 from fastapi import FastAPI
 from fastapi.exceptions import HTTPException, RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
 
 from api import router
-from app.database import database
-from app.error_handlers import exceptions_handler, validations_handler
+from api.exceptions import NotModified
+from app.cache import cache
+from app.database import connect, disconnect
+from app.error_handlers import (
+    exceptions_handler,
+    not_modified_handler,
+    validations_handler,
+)
+from app.jobs import PeriodicJob
+from app.middleware import WatermarkMiddleware
+from app.notifications import ChangeListener
 from app.settings import settings
+from services.caches import flush_caches, invalidate_change
+from services.tasks import archive_tasks
+from services.watermarks import prune_watermarks
 
 app = FastAPI(title=settings.app_name, debug=settings.debug)
 app.settings = settings  # type: ignore
 app.include_router(router, prefix='/api')
 
+app.add_middleware(WatermarkMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -23,16 +39,49 @@ app.add_middleware(
 
 app.add_exception_handler(RequestValidationError, validations_handler)
 app.add_exception_handler(HTTPException, exceptions_handler)
+app.add_exception_handler(NotModified, not_modified_handler)
+
+
+archiver = PeriodicJob(
+    funcy.partial(
+        archive_tasks,
+        days=settings.archive_after_days,
+        batch_size=settings.archive_batch_size,
+    ),
+    interval=settings.archive_interval,
+)
+
+watermark_pruner = PeriodicJob(
+    prune_watermarks, interval=settings.watermark_prune_interval
+)
+
+change_listener = ChangeListener(
+    settings.database_url.replace('+asyncpg', ''),
+    on_change=invalidate_change,
+    on_gap=flush_caches,
+    reconnect_interval=settings.changes_reconnect_interval,
+    keepalive_interval=settings.changes_keepalive_interval,
+)
 
 
 @app.on_event('startup')
 async def startup() -> None:
-    await database.connect()
+    await connect()
+    if settings.archive_interval:
+        archiver.start()
+    if settings.watermark_prune_interval:
+        watermark_pruner.start()
+    if settings.entity_cache_models or settings.watermark_cache_ttl:
+        change_listener.start()
 
 
 @app.on_event('shutdown')
 async def shutdown() -> None:
-    await database.disconnect()
+    await change_listener.stop()
+    await archiver.stop()
+    await watermark_pruner.stop()
+    await cache.close()
+    await disconnect()
 
 
 @click.group()
@@ -57,5 +106,31 @@ def runserver() -> None:
     )
 
 
+@cli.command('archive-tasks')
+@click.option(
+    '--days',
+    default=settings.archive_after_days,
+    show_default=True,
+    help='Archive tasks completed more than this many days ago.',
+)
+@click.option(
+    '--batch-size',
+    default=settings.archive_batch_size,
+    show_default=True,
+    help='Tasks moved per transaction.',
+)
+def archive_tasks_command(days: int, batch_size: int) -> None:
+    """Moves old completed tasks to the archive."""
+
+    async def archive() -> int:
+        await connect()
+        try:
+            return await archive_tasks(days=days, batch_size=batch_size)
+        finally:
+            await disconnect()
+
+    click.echo(f'{asyncio.run(archive())} tasks archived')
+
+
 if __name__ == '__main__':
     cli()
@@ -3,3 +3,4 @@ from .goals import *
 from .projects import *
 from .tags import *
 from .tasks import *
+from .watermarks import *
@@ -1,17 +1,42 @@
-from sqlalchemy import Column, DateTime, Integer, String, func
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    Computed,
+    DateTime,
+    Index,
+    Integer,
+    String,
+    func,
+)
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred
 
-from app.database import BaseDBModel
+from app.database import ROW_VERSION, BaseDBModel, versioned
 
 __all__ = ('Comment',)
 
 
+@versioned
 class Comment(BaseDBModel):
     __tablename__ = 'comment'
 
     id = Column(Integer, primary_key=True)
 
     created_at = Column(DateTime, nullable=False, server_default=func.now())
+    search_vector = deferred(
+        Column(
+            TSVECTOR,
+            Computed("setweight(to_tsvector('simple', text), 'B')", persisted=True),
+        )
+    )
     text = Column(String(1024), nullable=False)
+    updated_at = Column(DateTime, nullable=False, server_default=func.now())
+    version = Column(
+        BigInteger, nullable=False, server_default=ROW_VERSION.next_value()
+    )
 
     def __repr__(self) -> str:
         return f'Comment: {self.id}'
+
+
+Index('ix_comment_search_vector', Comment.search_vector, postgresql_using='gin')
@@ -1,11 +1,23 @@
-from sqlalchemy import Column, DateTime, Integer, String, func
-from sqlalchemy.orm import relationship
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    Computed,
+    DateTime,
+    Index,
+    Integer,
+    String,
+    func,
+)
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred, relationship
 
-from app.database import BaseDBModel
+from app.database import ROW_VERSION, BaseDBModel, versioned, watermarked
 
 __all__ = ('Goal',)
 
 
+@versioned
+@watermarked
 class Goal(BaseDBModel):
     __tablename__ = 'goal'
 
@@ -14,9 +26,32 @@ class Goal(BaseDBModel):
     achieved_at = Column(DateTime)
     created_at = Column(DateTime, nullable=False, server_default=func.now())
     month = Column(Integer)
+    # kept by the project_counters trigger
+    open_task_count = Column(Integer, nullable=False, server_default='0')
+    project_count = Column(Integer, nullable=False, server_default='0')
     projects = relationship('Project', back_populates='goal')
+    search_vector = deferred(
+        Column(
+            TSVECTOR,
+            Computed("setweight(to_tsvector('simple', title), 'A')", persisted=True),
+        )
+    )
+    task_count = Column(Integer, nullable=False, server_default='0')
     title = Column(String(256), nullable=False)
+    updated_at = Column(DateTime, nullable=False, server_default=func.now())
+    version = Column(
+        BigInteger, nullable=False, server_default=ROW_VERSION.next_value()
+    )
     year = Column(Integer)
 
     def __repr__(self) -> str:
         return f'Goal: {self.title}'
+
+
+Index(
+    'ix_goal_title_trgm',
+    Goal.title,
+    postgresql_using='gin',
+    postgresql_ops={'title': 'gin_trgm_ops'},
+)
+Index('ix_goal_search_vector', Goal.search_vector, postgresql_using='gin')
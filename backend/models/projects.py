@@ -1,11 +1,26 @@
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, func
-from sqlalchemy.orm import relationship, validates
+from sqlalchemy import (
+    DDL,
+    BigInteger,
+    Column,
+    Computed,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    event,
+    func,
+)
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred, relationship, validates
 
-from app.database import BaseDBModel
+from app.database import ROW_VERSION, BaseDBModel, versioned, watermarked
 
 __all__ = ('Project',)
 
 
+@versioned
+@watermarked
 class Project(BaseDBModel):
     __tablename__ = 'project'
 
@@ -15,11 +30,32 @@ class Project(BaseDBModel):
     color = Column(String(7))  # hexadecimal
     created_at = Column(DateTime, nullable=False, server_default=func.now())
     description = Column(String(256), nullable=False)
-    goal_id = Column(Integer, ForeignKey('goal.id'))
+    # kept by the task_counters trigger
+    open_task_count = Column(Integer, nullable=False, server_default='0')
+    goal_id = Column(
+        Integer,
+        ForeignKey('goal.id', name='project_goal_id_fkey', ondelete='CASCADE'),
+        index=True,
+    )
     goal = relationship('Goal', back_populates='projects')
+    search_vector = deferred(
+        Column(
+            TSVECTOR,
+            Computed(
+                "setweight(to_tsvector('simple', title), 'A') || "
+                "setweight(to_tsvector('simple', description), 'B')",
+                persisted=True,
+            ),
+        )
+    )
     space = Column(Integer, nullable=False)
+    task_count = Column(Integer, nullable=False, server_default='0')
     tasks = relationship('Task', back_populates='project')
     title = Column(String(256), nullable=False)
+    updated_at = Column(DateTime, nullable=False, server_default=func.now())
+    version = Column(
+        BigInteger, nullable=False, server_default=ROW_VERSION.next_value()
+    )
 
     def __repr__(self) -> str:
         return f'Project: {self.title}'
@@ -28,3 +64,79 @@ class Project(BaseDBModel):
     def validate_color(self, key: str, value: str) -> str:
         assert value.startswith('#') is True
         return value
+
+
+Index(
+    'ix_project_title_trgm',
+    Project.title,
+    postgresql_using='gin',
+    postgresql_ops={'title': 'gin_trgm_ops'},
+)
+Index(
+    'ix_project_description_trgm',
+    Project.description,
+    postgresql_using='gin',
+    postgresql_ops={'description': 'gin_trgm_ops'},
+)
+Index('ix_project_search_vector', Project.search_vector, postgresql_using='gin')
+
+# Keeps Goal.project_count exact on project inserts, deletes and moves, and
+# rolls the task counters of projects up into Goal.task_count and
+# Goal.open_task_count
+PROJECT_COUNTERS = (
+    DDL('''
+        CREATE OR REPLACE FUNCTION project_counters() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'UPDATE' THEN
+                IF OLD.goal_id IS NOT DISTINCT FROM NEW.goal_id THEN
+                    UPDATE goal
+                    SET task_count = task_count - OLD.task_count + NEW.task_count,
+                        open_task_count = open_task_count
+                            - OLD.open_task_count + NEW.open_task_count
+                    WHERE id = NEW.goal_id;
+                    RETURN NULL;
+                END IF;
+            END IF;
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                UPDATE goal
+                SET project_count = project_count - 1,
+                    task_count = task_count - OLD.task_count,
+                    open_task_count = open_task_count - OLD.open_task_count
+                WHERE id = OLD.goal_id;
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                UPDATE goal
+                SET project_count = project_count + 1,
+                    task_count = task_count + NEW.task_count,
+                    open_task_count = open_task_count + NEW.open_task_count
+                WHERE id = NEW.goal_id;
+            END IF;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+        '''),
+    DDL('''
+        CREATE TRIGGER project_counters_insert AFTER INSERT ON project
+        FOR EACH ROW WHEN (NEW.goal_id IS NOT NULL)
+        EXECUTE FUNCTION project_counters()
+        '''),
+    DDL('''
+        CREATE TRIGGER project_counters_delete AFTER DELETE ON project
+        FOR EACH ROW WHEN (OLD.goal_id IS NOT NULL)
+        EXECUTE FUNCTION project_counters()
+        '''),
+    DDL('''
+        CREATE TRIGGER project_counters_update
+        AFTER UPDATE OF goal_id, task_count, open_task_count ON project
+        FOR EACH ROW WHEN (
+            OLD.goal_id IS DISTINCT FROM NEW.goal_id
+            OR NEW.goal_id IS NOT NULL AND (
+                OLD.task_count <> NEW.task_count
+                OR OLD.open_task_count <> NEW.open_task_count
+            )
+        )
+        EXECUTE FUNCTION project_counters()
+        '''),
+)
+for ddl in PROJECT_COUNTERS:
+    event.listen(Project.__table__, 'after_create', ddl)
@@ -1,11 +1,12 @@
-from sqlalchemy import Column, Integer, String
+from sqlalchemy import BigInteger, Column, DateTime, Integer, String, func
 from sqlalchemy.orm import validates
 
-from app.database import BaseDBModel
+from app.database import ROW_VERSION, BaseDBModel, versioned
 
 __all__ = ('Tag',)
 
 
+@versioned
 class Tag(BaseDBModel):
     __tablename__ = 'tag'
 
@@ -13,6 +14,10 @@ class Tag(BaseDBModel):
 
     color = Column(String(7))  # hexadecimal
     title = Column(String(32), nullable=False)
+    updated_at = Column(DateTime, nullable=False, server_default=func.now())
+    version = Column(
+        BigInteger, nullable=False, server_default=ROW_VERSION.next_value()
+    )
 
     def __repr__(self) -> str:
         return f'Tag: {self.title}'
@@ -1,25 +1,55 @@
 from sqlalchemy import (
+    DDL,
+    BigInteger,
     Boolean,
     Column,
+    Computed,
     Date,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
+    Sequence,
     String,
     Time,
+    event,
     func,
 )
-from sqlalchemy.orm import relationship
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred, relationship
 
-from app.database import BaseDBModel
+from app.database import ROW_VERSION, BaseDBModel, versioned, watermarked
 
-__all__ = ('Task',)
+__all__ = ('ArchivedTask', 'Task')
+
+SEARCH_VECTOR = (
+    "setweight(to_tsvector('simple', title), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(description, '')), 'B')"
+)
+
+# ids stay unique across the partitions as long as they come from here,
+# a partitioned table has no primary key over an expression partition key
+TASK_ID_SEQUENCE = Sequence('task_id_seq')
 
 
+@versioned
+@watermarked
 class Task(BaseDBModel):
+    """
+    Partitioned into the hot ``task_open`` and the cold ``task_completed``
+    partitions, so filtering by ``completed_at IS NULL`` or ``IS NOT NULL``
+    reads a single partition. Completing a task moves it to the other one.
+    """
+
     __tablename__ = 'task'
+    __table_args__ = {'postgresql_partition_by': 'LIST ((completed_at IS NULL))'}
 
-    id = Column(Integer, primary_key=True)
+    id = Column(
+        Integer,
+        TASK_ID_SEQUENCE,
+        nullable=False,
+        server_default=TASK_ID_SEQUENCE.next_value(),
+    )
 
     created_at = Column(DateTime, nullable=False, server_default=func.now())
     completed_at = Column(DateTime)
@@ -27,10 +57,184 @@ class Task(BaseDBModel):
     description = Column(String(256))
     due_date = Column(Date)
     due_time = Column(Time)
-    project_id = Column(Integer, ForeignKey('project.id'))
+    project_id = Column(
+        Integer,
+        ForeignKey('project.id', name='task_project_id_fkey', ondelete='CASCADE'),
+    )
     project = relationship('Project', back_populates='tasks')
+    # only searches read it, rows, list responses and caches go without
+    search_vector = deferred(Column(TSVECTOR, Computed(SEARCH_VECTOR, persisted=True)))
     space = Column(Integer, nullable=False)
     title = Column(String(256), nullable=False)
+    updated_at = Column(DateTime, nullable=False, server_default=func.now())
+    version = Column(
+        BigInteger, nullable=False, server_default=ROW_VERSION.next_value()
+    )
+
+    __mapper_args__ = {'primary_key': [id]}
 
     def __repr__(self) -> str:
         return f'Task: {self.title}'
+
+
+# each partition keeps its own primary key on id
+TASK_PARTITIONS = (
+    DDL('''
+        CREATE TABLE task_open PARTITION OF task (PRIMARY KEY (id))
+        FOR VALUES IN (true)
+        '''),
+    DDL('''
+        CREATE TABLE task_completed PARTITION OF task (PRIMARY KEY (id))
+        FOR VALUES IN (false)
+        '''),
+)
+for ddl in TASK_PARTITIONS:
+    event.listen(Task.__table__, 'after_create', ddl)
+
+
+# Indexes follow the ordering of the tasks list:
+# completed_at DESC NULLS FIRST, created_at DESC, id DESC
+Index(
+    'ix_task_ordering',
+    Task.completed_at.desc().nullsfirst(),
+    Task.created_at.desc(),
+    Task.id.desc(),
+)
+Index(
+    'ix_task_project_id',
+    Task.project_id,
+    Task.completed_at.desc().nullsfirst(),
+    Task.created_at.desc(),
+    Task.id.desc(),
+)
+Index(
+    'ix_task_decisive',
+    Task.completed_at.desc().nullsfirst(),
+    Task.created_at.desc(),
+    Task.id.desc(),
+    postgresql_where=Task.decisive,
+)
+Index('ix_task_created_at', Task.created_at)
+Index('ix_task_due_date', Task.due_date, postgresql_where=Task.due_date.isnot(None))
+Index(
+    'ix_task_title_trgm',
+    Task.title,
+    postgresql_using='gin',
+    postgresql_ops={'title': 'gin_trgm_ops'},
+)
+Index(
+    'ix_task_description_trgm',
+    Task.description,
+    postgresql_using='gin',
+    postgresql_ops={'description': 'gin_trgm_ops'},
+)
+Index('ix_task_search_vector', Task.search_vector, postgresql_using='gin')
+
+# Keeps Project.task_count and Project.open_task_count exact on task inserts,
+# deletes, moves between projects and completion changes
+TASK_COUNTERS_FUNCTION = DDL('''
+        CREATE OR REPLACE FUNCTION task_counters() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                UPDATE project
+                SET task_count = task_count - 1,
+                    open_task_count = open_task_count - (OLD.completed_at IS NULL)::int
+                WHERE id = OLD.project_id;
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                UPDATE project
+                SET task_count = task_count + 1,
+                    open_task_count = open_task_count + (NEW.completed_at IS NULL)::int
+                WHERE id = NEW.project_id;
+            END IF;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+        ''')
+TASK_COUNTERS = (
+    DDL('''
+        CREATE TRIGGER task_counters_insert AFTER INSERT ON task
+        FOR EACH ROW WHEN (NEW.project_id IS NOT NULL)
+        EXECUTE FUNCTION task_counters()
+        '''),
+    DDL('''
+        CREATE TRIGGER task_counters_delete AFTER DELETE ON task
+        FOR EACH ROW WHEN (OLD.project_id IS NOT NULL)
+        EXECUTE FUNCTION task_counters()
+        '''),
+    DDL('''
+        CREATE TRIGGER task_counters_update
+        AFTER UPDATE OF project_id, completed_at ON task
+        FOR EACH ROW WHEN (
+            OLD.project_id IS DISTINCT FROM NEW.project_id
+            OR (OLD.completed_at IS NULL) <> (NEW.completed_at IS NULL)
+        )
+        EXECUTE FUNCTION task_counters()
+        '''),
+)
+for ddl in (TASK_COUNTERS_FUNCTION, *TASK_COUNTERS):
+    event.listen(Task.__table__, 'after_create', ddl)
+
+
+@versioned
+@watermarked
+class ArchivedTask(BaseDBModel):
+    """
+    Tasks completed long ago, moved out of ``task`` by
+    ``services.tasks.archive_tasks`` with their ids. Has the columns of
+    ``Task`` in the same order, so the two tables can be unioned.
+    """
+
+    __tablename__ = 'archived_task'
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+
+    created_at = Column(DateTime, nullable=False)
+    completed_at = Column(DateTime, nullable=False)
+    decisive = Column(Boolean, nullable=False)
+    description = Column(String(256))
+    due_date = Column(Date)
+    due_time = Column(Time)
+    project_id = Column(
+        Integer,
+        ForeignKey(
+            'project.id', name='archived_task_project_id_fkey', ondelete='CASCADE'
+        ),
+    )
+    search_vector = deferred(Column(TSVECTOR, Computed(SEARCH_VECTOR, persisted=True)))
+    space = Column(Integer, nullable=False)
+    title = Column(String(256), nullable=False)
+    updated_at = Column(DateTime, nullable=False, server_default=func.now())
+    version = Column(
+        BigInteger, nullable=False, server_default=ROW_VERSION.next_value()
+    )
+
+    def __repr__(self) -> str:
+        return f'ArchivedTask: {self.title}'
+
+
+Index(
+    'ix_archived_task_ordering',
+    ArchivedTask.completed_at.desc(),
+    ArchivedTask.created_at.desc(),
+    ArchivedTask.id.desc(),
+)
+Index('ix_archived_task_project_id', ArchivedTask.project_id)
+
+# Archived tasks still count as tasks of their projects, archiving a task
+# decrements the counters on task and increments them back here
+ARCHIVED_TASK_COUNTERS = (
+    DDL('''
+        CREATE TRIGGER archived_task_counters_insert AFTER INSERT ON archived_task
+        FOR EACH ROW WHEN (NEW.project_id IS NOT NULL)
+        EXECUTE FUNCTION task_counters()
+        '''),
+    DDL('''
+        CREATE TRIGGER archived_task_counters_delete AFTER DELETE ON archived_task
+        FOR EACH ROW WHEN (OLD.project_id IS NOT NULL)
+        EXECUTE FUNCTION task_counters()
+        '''),
+)
+# the tables are created in any order, the function may not exist yet
+for ddl in (TASK_COUNTERS_FUNCTION, *ARCHIVED_TASK_COUNTERS):
+    event.listen(ArchivedTask.__table__, 'after_create', ddl)
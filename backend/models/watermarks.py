@@ -0,0 +1,25 @@
+from sqlalchemy import BigInteger, Column, String
+
+from app.database import BaseDBModel
+
+__all__ = ('Watermark',)
+
+
+class Watermark(BaseDBModel):
+    """
+    Log of the changes of the tables marked with ``app.database.watermarked``,
+    one entry per statement that changed rows. Writers only append, so they
+    never wait for each other. The watermark of a table is the sum of its
+    ``changes``, which grows with every commit in whatever order they come.
+    ``services.watermarks.prune_watermarks`` merges the entries of a table
+    into one of the same sum.
+    """
+
+    __tablename__ = 'watermark'
+
+    table_name = Column(String(63), primary_key=True)
+    version = Column(BigInteger, primary_key=True)
+    changes = Column(BigInteger, nullable=False, server_default='1')
+
+    def __repr__(self) -> str:
+        return f'Watermark: {self.table_name}'
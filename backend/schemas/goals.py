@@ -5,9 +5,11 @@ from pydantic import BaseModel, Field, root_validator, validator
 
 from api.exceptions import BadRequest
 from schemas.validators import validate_none
+from services.goals import GoalOrdering
 from utils.validators import reusable_validator
 
 __all__ = (
+    'GoalProgressResponse',
     'GoalResponse',
     'CreateGoalRequest',
     'UpdateGoalRequest',
@@ -21,10 +23,27 @@ class GoalBase(BaseModel):
     year: int | None
 
 
+class ProgressResponse(BaseModel):
+    completed_task_count: int
+    completion_ratio: float | None
+    task_count: int
+
+
+class ProjectProgressResponse(ProgressResponse):
+    project_id: int
+
+
+class GoalProgressResponse(ProgressResponse):
+    goal_id: int
+    projects: list[ProjectProgressResponse]
+
+
 class GoalResponse(GoalBase):
     achieved_at: datetime | None
     created_at: datetime
     id: int
+    progress: ProgressResponse | None
+    project_count: int
     projects: list[int]
 
     @root_validator
@@ -50,6 +69,8 @@ class RetrieveGoalListRequest(BaseModel):
     year: int | None = Query(None, ge=datetime.now().year)
     month: int | None = Query(None, ge=1, le=12)
     search: str | None = Query(None)
+    ordering: GoalOrdering | None = Query(None)
+    with_progress: bool = Query(False)
 
     @validator('month')
     def validate_month(cls, value: int | None, values: dict) -> int | None:
@@ -0,0 +1,26 @@
+from pydantic import BaseModel
+
+__all__ = ('CacheStatsResponse', 'PoolStatsResponse')
+
+
+class CacheStatsResponse(BaseModel):
+    backend: str
+    bytes: int
+    evictions: int
+    hits: int
+    max_bytes: int
+    misses: int
+    size: int
+
+
+class PoolStatsResponse(BaseModel):
+    acquire_time_avg: float  # seconds
+    acquire_time_max: float  # seconds
+    acquired: int
+    idle: int
+    in_use: int
+    max_size: int
+    min_size: int
+    size: int
+    timeouts: int
+    waiters: int
@@ -20,6 +20,8 @@ class ProjectResponse(ProjectBase):
     archived_at: datetime | None
     created_at: datetime
     id: int
+    open_task_count: int
+    task_count: int
     tasks: list[int]
 
     @root_validator
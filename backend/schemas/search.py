@@ -0,0 +1,25 @@
+from fastapi import Query
+from pydantic import BaseModel
+
+from app.settings import settings
+from services.search import SearchResultType
+
+__all__ = ('SearchRequest', 'SearchResultResponse')
+
+
+class SearchResultResponse(BaseModel):
+    id: int
+    rank: float
+    snippet: str
+    title: str | None
+    type: SearchResultType
+
+
+class SearchRequest(BaseModel):
+    cursor: str | None = Query(None)
+    limit: int = Query(
+        settings.max_search_results_per_page,
+        gt=0,
+        le=settings.max_search_results_per_page,
+    )
+    q: str = Query(min_length=1, max_length=255)
@@ -1,3 +1,4 @@
+from collections.abc import Callable, Iterator
 from datetime import date, datetime, time
 
 from fastapi import Query
@@ -9,6 +10,7 @@ from schemas.validators import (
     validate_none,
     validate_space,
     validate_time,
+    validate_timezone,
 )
 from services.spaces import Space
 from utils.validators import reusable_validator
@@ -17,7 +19,10 @@ __all__ = (
     'TaskResponse',
     'CreateTaskRequest',
     'UpdateTaskRequest',
+    'RetrieveTaskFacetsRequest',
     'RetrieveTasksListRequest',
+    'RetrieveTodayTasksRequest',
+    'TaskFacetsResponse',
 )
 
 
@@ -65,16 +70,43 @@ class UpdateTaskRequest(TaskBase):
     _validate_space = reusable_validator('space')(validate_space)
 
 
-class RetrieveTasksListRequest(BaseModel):
+class TaskFacetsResponse(BaseModel):
+    completed: int
+    decisive: int
+    inbox: int
+    projects: dict[int, int]
+    spaces: dict[int, int]
+    total: int
+
+
+class RetrieveTaskFacetsRequest(BaseModel):
     decisive: bool | None = Query(None)
     due_from: date | None = Query(None)
     due_to: date | None = Query(None)
     completed: bool | None = Query(None)
     inbox: bool = Query(False)
+    include_archived: bool = Query(False)
+    project_id: int | None = Query(None)
+    search: str | None = Query(None)
+    space: Space | None = Query(None)
+
+
+class RetrieveTasksListRequest(RetrieveTaskFacetsRequest):
+    cursor: str | None = Query(None)
     limit: int | None = Query(
         settings.max_tasks_per_page, gt=0, le=settings.max_tasks_per_page
     )
     offset: int | None = Query(0, ge=0)
-    project_id: int | None = Query(None)
-    search: str | None = Query(None)
-    space: Space | None = Query(None)
+
+
+class Timezone(str):
+    # validated with the query parameters, errors of a dependency's own
+    # validators aren't request validation errors
+    @classmethod
+    def __get_validators__(cls) -> Iterator[Callable]:
+        yield validate_timezone
+
+
+class RetrieveTodayTasksRequest(BaseModel):
+    day: date | None = Query(None, alias='date')
+    timezone: Timezone | None = Query(None)
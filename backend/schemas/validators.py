@@ -1,5 +1,6 @@
 from datetime import date, time
 from typing import Any
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
 from services.spaces import Space
 
@@ -28,6 +29,14 @@ def validate_time(value: str) -> time | None:
         raise ValueError('invalid isoformat')
 
 
+def validate_timezone(value: str) -> str:
+    try:
+        ZoneInfo(value)
+    except (ValueError, ZoneInfoNotFoundError):
+        raise ValueError('unknown name')
+    return value
+
+
 def validate_none(value: Any) -> Any:
     if value is None:
         raise ValueError('none is not an allowed value')
@@ -0,0 +1,20 @@
+"""
+The caches of a worker, kept in step with the changes committed by all
+workers through ``app.notifications.ChangeListener``.
+"""
+
+from app.cache import cache
+from services.database import invalidate_changed
+from services.watermarks import watermarks
+
+__all__ = ('flush_caches', 'invalidate_change')
+
+
+def invalidate_change(table: str, operation: str, pk: int, version: int) -> None:
+    invalidate_changed(table, operation, pk, version)
+    watermarks.clear()
+
+
+async def flush_caches() -> None:
+    cache.reset()
+    watermarks.clear()
@@ -1,19 +1,262 @@
+import sys
+from collections.abc import Iterable, Iterator, Sequence
+from contextlib import contextmanager
+
+from asyncpg.exceptions import ForeignKeyViolationError
 from databases.interfaces import Record
-from sqlalchemy import delete, insert, select, update
+from sqlalchemy import (
+    Column,
+    Integer,
+    any_,
+    case,
+    delete,
+    func,
+    insert,
+    literal,
+    literal_column,
+    null,
+    or_,
+    select,
+    true,
+    update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, aggregate_order_by
+from sqlalchemy.sql import ColumnElement, Select
+
+from app.cache import cache
+from app.database import (
+    BaseDBModel,
+    Row,
+    database,
+    fetch_rows,
+    row_columns,
+    use_replica,
+)
+from app.settings import DatabaseBackend, settings
+from services import native
+from services.exceptions import DoesNotExist, RelatedDoesNotExist
+from utils.cache import LRUCache
+
+# Rows of the models in Settings.entity_cache_models as dicts by table and pk,
+# set by the reads on the primary and the writes of this worker and dropped on
+# the changes of any worker, see ``invalidate_changed``. Replica reads only
+# use them, their rows may be older.
+#
+# The least version of a row the worker may take from or put into the cache,
+# raised by the changes it learns about, keeps the copies fetched before a
+# change out of it. The rows this worker deletes never come back, their pks
+# aren't reused. A DELETE announced by the database may be the first half of
+# an update moving the row to another partition, it only rules out the
+# versions up to the deleted one.
+#
+# A least version evicted before its time would let such a copy back in, so
+# they are only dropped once expired, as many as rows changed within the ttl.
+min_versions = LRUCache(ttl=settings.entity_cache_ttl, max_bytes=sys.maxsize)
+DELETED = sys.maxsize
+
+
+def cache_key(table: str, pk: int) -> str:
+    return f'{table}:{pk}'
+
+
+def is_cached(model: BaseDBModel) -> bool:
+    return model.__tablename__ in settings.entity_cache_models
+
+
+def is_current(key: str, version: int) -> bool:
+    return version >= (min_versions.peek(key) or 0)
+
+
+def raise_min_version(key: str, version: int) -> None:
+    if version > (min_versions.peek(key) or 0):
+        min_versions.set(key, version)
+
+
+async def get_cached(model: BaseDBModel, pks: list[int]) -> dict[int, dict]:
+    """The cached rows of the pks, fetched at once."""
+    if not is_cached(model):
+        return {}
+    keys = [cache_key(model.__tablename__, pk) for pk in pks]
+    values = await cache.get_many(keys)
+    return {
+        pk: value
+        for pk, key, value in zip(pks, keys, values)
+        if value is not None and is_current(key, value['version'])
+    }
+
 
-from app.database import BaseDBModel, database
-from services.exceptions import DoesNotExist
+async def set_cached(model: BaseDBModel, instances: Iterable[Record]) -> None:
+    if not is_cached(model):
+        return
+    values = {}
+    for instance in instances:
+        key = cache_key(model.__tablename__, instance['id'])  # type: ignore
+        # a change announced while the row was fetched may have made it stale
+        if is_current(key, instance['version']):  # type: ignore
+            values[key] = dict(instance)
+    await cache.set_many(values, settings.entity_cache_ttl)
+
+
+async def replace_cached(model: BaseDBModel, instance: Record) -> None:
+    """
+    Caches the row returned by a write in place of the cached one, reads of
+    the row in flight keep the copies they fetched before out of the cache.
+    """
+    if is_cached(model):
+        key = cache_key(model.__tablename__, instance['id'])  # type: ignore
+        raise_min_version(key, instance['version'])  # type: ignore
+        await set_cached(model, [instance])
+
+
+def invalidate_cached(model: BaseDBModel, pks: Iterable[int]) -> None:
+    """Drops the cached rows of deleted pks."""
+    if not is_cached(model):
+        return
+    keys = [cache_key(model.__tablename__, pk) for pk in pks]
+    for key in keys:
+        raise_min_version(key, DELETED)
+    cache.invalidate(keys)
+
+
+def invalidate_changed(table: str, operation: str, pk: int, version: int) -> None:
+    """
+    Drops the row a committed change was announced for from what the worker
+    holds. An insert or update leaves a row of its version or newer be, the
+    worker's own writes cached it already, a delete one newer than the deleted
+    version. A shared cache is left to the writer, the least version keeps its
+    older copies from the worker's reads.
+    """
+    if table not in settings.entity_cache_models:
+        return
+    key = cache_key(table, pk)
+    min_version = version + 1 if operation == 'DELETE' else version
+    raise_min_version(key, min_version)
+    instance = cache.peek(key)
+    if instance is None or instance['version'] < min_version:
+        cache.forget([key])
+
+
+def any_of(pks: list[int]) -> ColumnElement:
+    return any_(literal(pks, ARRAY(Integer)))
+
+
+def json_list(
+    query: Select,
+    fields: Iterable[str],
+    order_by: Sequence[ColumnElement],
+    limit: int | None = None,
+) -> Select:
+    """
+    Renders the rows of the query as one JSON array built by Postgres, so list
+    responses skip per-row decoding, validation and encoding in Python.
+
+    Selects the ``data`` array of at most ``limit`` rows, its ``count`` and,
+    when the query has more rows than that, the ``last`` row of the page as
+    a one item array. ``order_by`` is the one of the query, the rows are
+    numbered by it and keep it in the array, subqueries don't keep it.
+    """
+    query = query.add_columns(
+        func.row_number().over(order_by=order_by).label('json_list_position')
+    )
+    if limit is not None:
+        # one extra row tells whether there is a next page
+        query = query.limit(limit + 1)
+
+    rows = query.subquery('row')
+    numbered = select(
+        rows, func.row_number().over(order_by=rows.c.json_list_position).label('n')
+    ).subquery('numbered')
+    item = func.json_build_object(
+        *(
+            arg
+            for field in fields
+            for arg in (literal_column(f"'{field}'"), numbered.c[field])
+        )
+    )
+    items = func.json_agg(aggregate_order_by(item, numbered.c.n))
+    if limit is None:
+        in_page, last = true(), null()
+    else:
+        in_page = numbered.c.n <= limit
+        last = case((func.count() > limit, items.filter(numbered.c.n == limit)))
+
+    return select(
+        func.coalesce(items.filter(in_page), literal_column("'[]'::json")).label(
+            'data'
+        ),
+        func.count().filter(in_page).label('count'),
+        last.label('last'),
+    )
+
+
+async def fetch_json_list(query: Select) -> Row:
+    """The one row of a ``json_list`` query, an aggregate always has it."""
+    (row,) = await fetch_rows(query)
+    return row
+
+
+def search_clause(term: str, *columns: Column) -> ColumnElement:
+    """
+    Case-insensitive substring match on any of the columns, served by their
+    pg_trgm GIN indexes.
+    """
+    escaped = term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return or_(*(column.ilike(f'%{escaped}%', escape='\\') for column in columns))
+
+
+def ordering_clauses(
+    model: BaseDBModel, ordering: str | None = None
+) -> list[ColumnElement]:
+    """
+    ``ORDER BY`` of the column named by ``ordering``, descending when it is
+    prefixed with ``-``, with the id as tie-breaker or the only key.
+    """
+    if ordering is None:
+        return [model.id]
+
+    column = getattr(model, ordering.removeprefix('-'))
+    direction = column.desc() if ordering.startswith('-') else column.asc()
+    return [direction, model.id]
+
+
+@contextmanager
+def related_must_exist(model: BaseDBModel, data: dict) -> Iterator[None]:
+    """
+    Translates a foreign key violation raised by the database into
+    RelatedDoesNotExist, so writes need no existence pre-checks.
+    """
+    try:
+        yield
+    except ForeignKeyViolationError as e:
+        for foreign_key in model.__table__.foreign_keys:
+            if foreign_key.constraint.name == e.constraint_name:
+                relation = foreign_key.column.table.name
+                raise RelatedDoesNotExist(relation, data.get(foreign_key.parent.name))
+        raise
+
+
+def native_backend() -> bool:
+    return settings.db_backend == DatabaseBackend.ASYNCPG
 
 
 async def create_one(*, model: BaseDBModel, data: dict | None = None) -> Record:
-    query = insert(model).values(**data).returning(model)
-    instance = await database.fetch_one(query)
+    with related_must_exist(model, data):  # type: ignore
+        if native_backend():
+            instance = await native.create_one(model, data)  # type: ignore
+        else:
+            query = insert(model).values(**data).returning(*row_columns(model))
+            instance = await database.fetch_one(query)
+    await replace_cached(model, instance)
     return instance  # type: ignore
 
 
 async def delete_one(*, model: BaseDBModel, pk: int | None = None) -> None:
-    query = delete(model).where(model.id == pk).returning(model.id)
-    instance = await database.fetch_val(query)
+    if native_backend():
+        instance = await native.delete_one(model, pk)  # type: ignore
+    else:
+        query = delete(model).where(model.id == pk).returning(model.id)
+        instance = await database.fetch_val(query)
+    invalidate_cached(model, [pk])  # type: ignore
     if instance is None:
         raise DoesNotExist
 
@@ -22,27 +265,84 @@ async def get_one(*, model: BaseDBModel, pk: int | None = None) -> Record | None
     if pk is None:
         return None
 
-    query = select(model).filter(model.id == pk)
-    instance = await database.fetch_one(query)
+    cached = await get_cached(model, [pk])
+    if cached:
+        return cached[pk]  # type: ignore
+
+    instance: Record | None
+    if native_backend():
+        instance = await native.get_one(model, pk)
+    else:
+        query = select(model).filter(model.id == pk)
+        instance = await database.fetch_one(query)
     if instance is None:
         raise DoesNotExist
 
+    if not use_replica.get():
+        await set_cached(model, [instance])
     return instance
 
 
+async def get_many(pks: list[int], *, model: BaseDBModel) -> dict[int, Record]:
+    """The rows of the pks, the cached ones hydrated in one round trip."""
+    found: dict = await get_cached(model, pks)
+    missing = [pk for pk in pks if pk not in found]
+    if not missing:
+        return found
+
+    if native_backend():
+        instances = await native.get_many(model, missing)
+    else:
+        query = select(model).filter(model.id == any_of(missing))
+        instances = await database.fetch_all(query)
+    if not use_replica.get():
+        await set_cached(model, instances)
+    return found | {instance['id']: instance for instance in instances}
+
+
+async def get_version(*, model: BaseDBModel, pk: int | None = None) -> int:
+    """
+    Version of the row without fetching it, see ``app.database.versioned``,
+    the one of the cached row if any, so it matches the row ``get_one`` gets.
+    """
+    cached = await get_cached(model, [pk])  # type: ignore
+    if cached:
+        return cached[pk]['version']  # type: ignore
+
+    if native_backend():
+        version = await native.get_version(model, pk)  # type: ignore
+    else:
+        query = select(model.version).filter(model.id == pk)
+        version = await database.fetch_val(query)
+    if version is None:
+        raise DoesNotExist
+
+    return version
+
+
 async def update_one(
     *, model: BaseDBModel, pk: int | None = None, data: dict | None = None
 ) -> Record | None:
     if pk is None:
         return None
 
-    if data:
-        query = update(model).where(model.id == pk).values(**data).returning(model)
-    else:
-        query = select(model).where(model.id == pk)
+    if not data:
+        return await get_one(model=model, pk=pk)
 
-    instance = await database.fetch_one(query)
+    with related_must_exist(model, data):
+        if native_backend():
+            instance: Record | None = await native.update_one(model, pk, data)
+        else:
+            query = (
+                update(model)
+                .where(model.id == pk)
+                .values(**data)
+                .returning(*row_columns(model))
+            )
+            instance = await database.fetch_one(query)
     if instance is None:
+        invalidate_cached(model, [pk])
         raise DoesNotExist
 
+    await replace_cached(model, instance)
     return instance
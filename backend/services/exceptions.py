@@ -1,2 +1,11 @@
 class DoesNotExist(Exception):
     pass
+
+
+class RelatedDoesNotExist(DoesNotExist):
+    """A foreign key points to a row that does not exist."""
+
+    def __init__(self, relation: str, pk: int | None) -> None:
+        super().__init__(relation, pk)
+        self.relation = relation
+        self.pk = pk
@@ -1,9 +1,114 @@
+from enum import Enum
+
 import funcy
+from sqlalchemy import Numeric, cast, func, literal_column, null, select, type_coerce
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.sql import ColumnElement, Select
+from sqlalchemy.types import JSON
 
-from models import Goal
-from services.database import create_one, delete_one, get_one, update_one
+from app.database import BaseDBModel, fetch_row, fetch_rows
+from models import Goal, Project
+from services.database import (
+    any_of,
+    create_one,
+    delete_one,
+    get_one,
+    get_version,
+    update_one,
+)
+from services.exceptions import DoesNotExist
 
 create_one_goal = funcy.partial(create_one, model=Goal)
 delete_one_goal = funcy.partial(delete_one, model=Goal)
 get_one_goal = funcy.partial(get_one, model=Goal)
+get_goal_version = funcy.partial(get_version, model=Goal)
 update_one_goal = funcy.partial(update_one, model=Goal)
+
+
+class GoalOrdering(str, Enum):
+    PROJECT_COUNT = 'project_count'
+    PROJECT_COUNT_DESC = '-project_count'
+
+
+async def get_goals_projects(goal_ids: list[int]) -> dict[int, list[int]]:
+    query = (
+        select(
+            Project.goal_id,
+            func.array_agg(aggregate_order_by(Project.id, Project.id)).label(
+                'projects'
+            ),
+        )
+        .filter(Project.goal_id == any_of(goal_ids))
+        .group_by(Project.goal_id)
+    )
+    rows = await fetch_rows(query)
+    projects = {row['goal_id']: row['projects'] for row in rows}
+    return {pk: projects.get(pk, []) for pk in goal_ids}
+
+
+def with_projects(query: Select) -> Select:
+    """Adds ids of the related projects as the ``projects`` column."""
+    projects = (
+        select(func.array_agg(aggregate_order_by(Project.id, Project.id)))
+        .filter(Project.goal_id == Goal.id)
+        .scalar_subquery()
+    )
+    return query.add_columns(
+        func.coalesce(projects, literal_column("'{}'")).label('projects')
+    )
+
+
+def progress(model: BaseDBModel, **fields: ColumnElement) -> ColumnElement:
+    """
+    JSON object of the fields and the progress of a goal or a project, built
+    from the task counters the triggers keep on their rows.
+    """
+    completed = model.task_count - model.open_task_count
+    ratio = func.round(cast(completed, Numeric) / func.nullif(model.task_count, 0), 4)
+    fields = {
+        **fields,
+        'completed_task_count': completed,
+        'completion_ratio': ratio,
+        'task_count': model.task_count,
+    }
+    return type_coerce(
+        func.json_build_object(
+            *(
+                arg
+                for name, value in fields.items()
+                for arg in (literal_column(f"'{name}'"), value)
+            )
+        ),
+        JSON,
+    )
+
+
+def with_progress(query: Select, enabled: bool = True) -> Select:
+    """
+    Adds the progress of the goal as the ``progress`` column, null unless
+    enabled, so every renderer of the list sees the same columns.
+    """
+    return query.add_columns((progress(Goal) if enabled else null()).label('progress'))
+
+
+async def get_goal_progress(pk: int) -> dict:
+    projects = (
+        select(
+            func.json_agg(
+                aggregate_order_by(progress(Project, project_id=Project.id), Project.id)
+            )
+        )
+        .filter(Project.goal_id == Goal.id)
+        .scalar_subquery()
+    )
+    query = select(
+        progress(Goal, goal_id=Goal.id).label('progress'),
+        type_coerce(func.coalesce(projects, literal_column("'[]'::json")), JSON).label(
+            'projects'
+        ),
+    ).filter(Goal.id == pk)
+
+    row = await fetch_row(query)
+    if row is None:
+        raise DoesNotExist
+    return {**row['progress'], 'projects': row['projects']}
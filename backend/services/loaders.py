@@ -0,0 +1,72 @@
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable, Iterable
+from typing import Any
+
+from services.exceptions import DoesNotExist
+from services.goals import get_goals_projects
+from services.projects import get_projects_tasks
+
+__all__ = ('DataLoader', 'Loaders')
+
+BatchLoad = Callable[[list], Awaitable[dict]]
+
+
+class DataLoader:
+    """
+    Collects keys requested by coroutines running in the same event loop tick
+    and resolves them with a single ``batch_load`` call.
+
+    Results are memoized for the lifetime of the loader, so a loader should
+    live no longer than one request.
+    """
+
+    def __init__(self, batch_load: BatchLoad):
+        self._batch_load = batch_load
+        self._futures: dict[Hashable, asyncio.Future] = {}
+        self._queue: list[Hashable] = []
+        # the event loop keeps weak references to tasks only
+        self._dispatching: asyncio.Task | None = None
+
+    def load(self, key: Hashable) -> Awaitable[Any]:
+        if key not in self._futures:
+            loop = asyncio.get_running_loop()
+            self._futures[key] = loop.create_future()
+            if not self._queue:
+                self._dispatching = loop.create_task(self._dispatch())
+            self._queue.append(key)
+        return self._futures[key]
+
+    async def load_many(self, keys: Iterable[Hashable]) -> list[Any]:
+        return await asyncio.gather(*map(self.load, keys))
+
+    async def load_one(self, key: Hashable | None) -> Any:
+        if key is None:
+            return None
+
+        value = await self.load(key)
+        if value is None:
+            raise DoesNotExist
+
+        return value
+
+    async def _dispatch(self) -> None:
+        keys, self._queue = self._queue, []
+        try:
+            values = await self._batch_load(keys)
+        except Exception as exc:
+            for key in keys:
+                future = self._futures.pop(key)
+                if not future.done():
+                    future.set_exception(exc)
+            return
+
+        for key in keys:
+            future = self._futures[key]
+            if not future.done():
+                future.set_result(values.get(key))
+
+
+class Loaders:
+    def __init__(self) -> None:
+        self.goals_projects: DataLoader = DataLoader(get_goals_projects)
+        self.projects_tasks: DataLoader = DataLoader(get_projects_tasks)
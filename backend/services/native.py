@@ -0,0 +1,149 @@
+"""
+Native asyncpg implementation of the CRUD helpers of ``services.database``.
+
+Statement text is built once per model and set of columns and runs on the
+asyncpg connection underneath ``databases``, so a request skips SQLAlchemy
+compilation and asyncpg reuses the statement it prepared on the connection.
+Transactions and ``force_rollback`` keep working as both share a connection.
+"""
+
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from functools import cache
+from typing import Any
+
+from asyncpg import Connection, Record
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.sql import ClauseElement
+
+from app.database import BaseDBModel, database, row_columns
+
+# column name and, for SQL expressions such as func.now(), their rendered SQL
+Shape = tuple[tuple[str, str | None], ...]
+
+dialect = postgresql.dialect()
+quote = dialect.identifier_preparer.quote
+
+
+async def create_one(model: BaseDBModel, data: dict) -> Record:
+    shape, values = split_data(data)
+    async with raw_connection() as connection:
+        return await connection.fetchrow(insert_statement(model, shape), *values)
+
+
+async def delete_one(model: BaseDBModel, pk: int) -> int | None:
+    async with raw_connection() as connection:
+        pk = await connection.fetchval(delete_statement(model), pk)
+    return pk
+
+
+async def get_one(model: BaseDBModel, pk: int) -> Record | None:
+    async with raw_connection() as connection:
+        return await connection.fetchrow(select_statement(model), pk)
+
+
+async def get_many(model: BaseDBModel, pks: list[int]) -> list[Record]:
+    async with raw_connection() as connection:
+        instances: list[Record] = await connection.fetch(
+            select_many_statement(model), pks
+        )
+    return instances
+
+
+async def get_version(model: BaseDBModel, pk: int) -> int | None:
+    async with raw_connection() as connection:
+        version: int | None = await connection.fetchval(version_statement(model), pk)
+    return version
+
+
+async def update_one(model: BaseDBModel, pk: int, data: dict) -> Record | None:
+    shape, values = split_data(data)
+    async with raw_connection() as connection:
+        return await connection.fetchrow(update_statement(model, shape), *values, pk)
+
+
+@asynccontextmanager
+async def raw_connection() -> AsyncIterator[Connection]:
+    async with database.connection() as connection:
+        yield connection.raw_connection
+
+
+def split_data(data: dict) -> tuple[Shape, list[Any]]:
+    shape: list[tuple[str, str | None]] = []
+    values = []
+    for column, value in data.items():
+        if isinstance(value, ClauseElement):
+            expression = value.compile(
+                dialect=dialect, compile_kwargs={'literal_binds': True}
+            )
+            shape.append((column, str(expression)))
+        else:
+            shape.append((column, None))
+            values.append(value)
+    return tuple(shape), values
+
+
+def placeholders(shape: Shape) -> list[str]:
+    sql, position = [], 0
+    for _, expression in shape:
+        if expression is None:
+            position += 1
+            expression = f'${position}'
+        sql.append(expression)
+    return sql
+
+
+@cache
+def table(model: BaseDBModel) -> str:
+    name: str = dialect.identifier_preparer.format_table(model.__table__)
+    return name
+
+
+@cache
+def columns(model: BaseDBModel) -> str:
+    return ', '.join(quote(column.name) for column in row_columns(model))
+
+
+@cache
+def delete_statement(model: BaseDBModel) -> str:
+    return f'DELETE FROM {table(model)} WHERE id = $1 RETURNING id'
+
+
+@cache
+def insert_statement(model: BaseDBModel, shape: Shape) -> str:
+    names = ', '.join(quote(column) for column, _ in shape)
+    values = ', '.join(placeholders(shape))
+    return (
+        f'INSERT INTO {table(model)} ({names}) VALUES ({values}) '
+        f'RETURNING {columns(model)}'
+    )
+
+
+@cache
+def select_statement(model: BaseDBModel) -> str:
+    return f'SELECT {columns(model)} FROM {table(model)} WHERE id = $1'
+
+
+@cache
+def select_many_statement(model: BaseDBModel) -> str:
+    return (
+        f'SELECT {columns(model)} FROM {table(model)} ' 'WHERE id = ANY($1::integer[])'
+    )
+
+
+@cache
+def version_statement(model: BaseDBModel) -> str:
+    return f'SELECT version FROM {table(model)} WHERE id = $1'
+
+
+@cache
+def update_statement(model: BaseDBModel, shape: Shape) -> str:
+    assignments = ', '.join(
+        f'{quote(column)} = {value}'
+        for (column, _), value in zip(shape, placeholders(shape))
+    )
+    pk = len(shape) - sum(expression is not None for _, expression in shape) + 1
+    return (
+        f'UPDATE {table(model)} SET {assignments} WHERE id = ${pk} '
+        f'RETURNING {columns(model)}'
+    )
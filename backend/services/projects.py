@@ -1,9 +1,56 @@
+from enum import Enum
+
 import funcy
+from sqlalchemy import func, literal_column, select
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.sql import Select
 
-from models import Project
-from services.database import create_one, delete_one, get_one, update_one
+from app.database import fetch_rows
+from models import Project, Task
+from services.database import (
+    any_of,
+    create_one,
+    delete_one,
+    get_one,
+    get_version,
+    update_one,
+)
 
 create_one_project = funcy.partial(create_one, model=Project)
 delete_one_project = funcy.partial(delete_one, model=Project)
 get_one_project = funcy.partial(get_one, model=Project)
+get_project_version = funcy.partial(get_version, model=Project)
 update_one_project = funcy.partial(update_one, model=Project)
+
+
+class ProjectOrdering(str, Enum):
+    TASK_COUNT = 'task_count'
+    TASK_COUNT_DESC = '-task_count'
+    OPEN_TASK_COUNT = 'open_task_count'
+    OPEN_TASK_COUNT_DESC = '-open_task_count'
+
+
+async def get_projects_tasks(project_ids: list[int]) -> dict[int, list[int]]:
+    query = (
+        select(
+            Task.project_id,
+            func.array_agg(aggregate_order_by(Task.id, Task.id)).label('tasks'),
+        )
+        .filter(Task.project_id == any_of(project_ids))
+        .group_by(Task.project_id)
+    )
+    rows = await fetch_rows(query)
+    tasks = {row['project_id']: row['tasks'] for row in rows}
+    return {pk: tasks.get(pk, []) for pk in project_ids}
+
+
+def with_tasks(query: Select) -> Select:
+    """Adds ids of the related tasks as the ``tasks`` column."""
+    tasks = (
+        select(func.array_agg(aggregate_order_by(Task.id, Task.id)))
+        .filter(Task.project_id == Project.id)
+        .scalar_subquery()
+    )
+    return query.add_columns(
+        func.coalesce(tasks, literal_column("'{}'")).label('tasks')
+    )
@@ -0,0 +1,88 @@
+from collections.abc import Mapping
+from enum import Enum
+
+from sqlalchemy import String, func, literal_column, null, select, tuple_, union_all
+from sqlalchemy.sql import ColumnElement, Select
+from sqlalchemy.sql.selectable import Subquery
+
+from models import Comment, Goal, Project, Task
+from utils.pagination import decode_cursor, encode_cursor
+
+# language-neutral: no stemming and no stop words
+SEARCH_CONFIG = 'simple'
+
+
+class SearchResultType(str, Enum):
+    COMMENT = 'comment'
+    GOAL = 'goal'
+    PROJECT = 'project'
+    TASK = 'task'
+
+
+def search_results(q: str) -> Subquery:
+    """
+    Matches of the query across all searchable entities as one
+    ``(type, id, rank, title, document)`` relation.
+    """
+    sources = (
+        (
+            SearchResultType.TASK,
+            Task,
+            Task.title,
+            func.concat_ws(' ', Task.title, Task.description),
+        ),
+        (
+            SearchResultType.PROJECT,
+            Project,
+            Project.title,
+            func.concat_ws(' ', Project.title, Project.description),
+        ),
+        (SearchResultType.GOAL, Goal, Goal.title, Goal.title),
+        (SearchResultType.COMMENT, Comment, null(), Comment.text),
+    )
+    selects = []
+    for result_type, model, title, document in sources:
+        query = func.websearch_to_tsquery(SEARCH_CONFIG, q)
+        selects.append(
+            select(
+                literal_column(f"'{result_type.value}'", String).label('type'),
+                model.id,
+                func.ts_rank(model.search_vector, query).label('rank'),
+                title.label('title'),
+                document.label('document'),
+            ).filter(model.search_vector.op('@@')(query))
+        )
+    return union_all(*selects).subquery('result')
+
+
+def encode_search_cursor(result: Mapping) -> str:
+    return encode_cursor([result['rank'], result['type'], result['id']])
+
+
+def search_after_cursor(results: Subquery, cursor: str) -> ColumnElement:
+    """
+    Keyset predicate selecting results that follow the cursor in the
+    ``rank DESC, type, id`` ordering.
+    """
+    rank, result_type, pk = decode_cursor(cursor)
+    rank = float(rank)
+    result_type = SearchResultType(result_type).value
+    pk = int(pk)
+
+    return (results.c.rank < rank) | (
+        (results.c.rank == rank)
+        & (tuple_(results.c.type, results.c.id) > (result_type, pk))
+    )
+
+
+def with_snippets(page: Subquery, q: str) -> Select:
+    # ts_headline re-parses the document, so it only runs over the page
+    return select(
+        page.c.type,
+        page.c.id,
+        page.c.rank,
+        page.c.title,
+        func.ts_headline(
+            SEARCH_CONFIG, page.c.document, func.websearch_to_tsquery(SEARCH_CONFIG, q)
+        ).label('snippet'),
+    ).order_by(page.c.rank.desc(), page.c.type, page.c.id)
@@ -1,9 +1,10 @@
 import funcy
 
 from models import Tag
-from services.database import create_one, delete_one, get_one, update_one
+from services.database import create_one, delete_one, get_one, get_version, update_one
 
 create_one_tag = funcy.partial(create_one, model=Tag)
 delete_one_tag = funcy.partial(delete_one, model=Tag)
 get_one_tag = funcy.partial(get_one, model=Tag)
+get_tag_version = funcy.partial(get_version, model=Tag)
 update_one_tag = funcy.partial(update_one, model=Tag)
@@ -1,9 +1,221 @@
+from collections.abc import Mapping
+from datetime import date, datetime, time, timedelta
+from zoneinfo import ZoneInfo
+
 import funcy
+from databases.interfaces import Record
+from sqlalchemy import (
+    DateTime,
+    Interval,
+    cast,
+    delete,
+    func,
+    insert,
+    literal,
+    select,
+    tuple_,
+    union_all,
+)
+from sqlalchemy.orm import aliased
+from sqlalchemy.sql import ColumnElement, Select
 
-from models import Task
-from services.database import create_one, delete_one, get_one, update_one
+from app.database import BaseDBModel, database, fetch_rows, row_columns
+from models import ArchivedTask, Task
+from services.database import (
+    create_one,
+    delete_one,
+    get_one,
+    get_version,
+    invalidate_cached,
+    update_one,
+)
+from services.exceptions import DoesNotExist
+from utils.pagination import decode_cursor, encode_cursor
 
 create_one_task = funcy.partial(create_one, model=Task)
 delete_one_task = funcy.partial(delete_one, model=Task)
 get_one_task = funcy.partial(get_one, model=Task)
+get_task_version = funcy.partial(get_version, model=Task)
 update_one_task = funcy.partial(update_one, model=Task)
+get_one_archived_task = funcy.partial(get_one, model=ArchivedTask)
+
+# search_vector is generated by the archive itself
+ARCHIVED_COLUMNS = [
+    column.name for column in ArchivedTask.__table__.columns if column.computed is None
+]
+
+
+async def get_one_task_or_archived(pk: int) -> Record:
+    try:
+        task: Record = await get_one_task(pk=pk)
+    except DoesNotExist:
+        task = await get_one_archived_task(pk=pk)
+    return task
+
+
+def tasks_with_archived() -> BaseDBModel:
+    """
+    ``Task`` over the union of the tasks and the archived ones. Postgres
+    pushes filters down into both sides and merges their ordered indexes.
+    """
+    names = [column.name for column in row_columns(Task)]
+    tasks = select(*(Task.__table__.c[name] for name in names))
+    archived = select(*(ArchivedTask.__table__.c[name] for name in names))
+    return aliased(Task, union_all(tasks, archived).subquery('task'))
+
+
+async def archive_tasks(days: int, batch_size: int) -> int:
+    """
+    Moves the tasks completed more than ``days`` ago to the archive, at most
+    ``batch_size`` of them per statement, so each transaction stays short
+    and locks few rows. Tasks locked by other transactions are skipped
+    until the next run. Returns the number of archived tasks.
+    """
+    cutoff = func.localtimestamp() - cast(timedelta(days=days), Interval)
+    # completed_at IS NOT NULL prunes both statements to the completed partition
+    batch = (
+        select(Task.id)
+        .filter(Task.completed_at.isnot(None), Task.completed_at < cutoff)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )
+    moved = (
+        delete(Task)
+        .where(Task.completed_at.isnot(None), Task.id.in_(batch))
+        .returning(*(Task.__table__.c[name] for name in ARCHIVED_COLUMNS))
+        .cte('moved')
+    )
+    archived = (
+        insert(ArchivedTask)
+        .from_select(ARCHIVED_COLUMNS, select(moved))
+        .returning(ArchivedTask.id)
+        .cte('archived')
+    )
+    query = select(func.coalesce(func.array_agg(archived.c.id), []))
+
+    total = 0
+    while True:
+        pks: list[int] = await database.fetch_val(query)
+        # the statement bypasses delete_one, archived tasks leave the cache here
+        invalidate_cached(Task, pks)
+        total += len(pks)
+        if len(pks) < batch_size:
+            return total
+
+
+def encode_task_cursor(task: Mapping) -> str:
+    return encode_cursor(
+        [_isoformat(task['completed_at']), _isoformat(task['created_at']), task['id']]
+    )
+
+
+def _isoformat(value: datetime | str | None) -> str | None:
+    # values of a task rendered by json_list are already ISO 8601 strings
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def tasks_after_cursor(cursor: str, model: BaseDBModel = Task) -> ColumnElement:
+    """
+    Keyset predicate selecting tasks that follow the cursor in the
+    ``completed_at DESC NULLS FIRST, created_at DESC, id DESC`` ordering.
+    """
+    completed_at, created_at, pk = decode_cursor(cursor)
+    created_at = datetime.fromisoformat(created_at)
+    pk = int(pk)
+
+    if completed_at is None:
+        return model.completed_at.isnot(None) | (
+            model.completed_at.is_(None)
+            & (tuple_(model.created_at, model.id) < (created_at, pk))
+        )
+
+    completed_at = datetime.fromisoformat(completed_at)
+    return model.completed_at.isnot(None) & (
+        tuple_(model.completed_at, model.created_at, model.id)
+        < (completed_at, created_at, pk)
+    )
+
+
+# GROUPING() of the facet columns has a bit set for each column a row of the
+# GROUPING SETS query is not grouped by
+def facet_columns(model: BaseDBModel) -> tuple[ColumnElement, ...]:
+    return (
+        model.project_id,
+        model.space,
+        model.decisive,
+        model.completed_at.isnot(None),
+    )
+
+
+TOTAL = 0b1111
+BY_PROJECT = 0b0111
+BY_SPACE = 0b1011
+BY_DECISIVE = 0b1101
+BY_COMPLETED = 0b1110
+
+
+async def count_task_facets(query: Select, model: BaseDBModel = Task) -> dict:
+    """
+    Counts of the tasks the query selects in total, in the inbox, in each
+    project, in each space, decisive and completed ones, grouped at once.
+    """
+    columns = facet_columns(model)
+    project_id, space, decisive, completed = columns
+    query = query.with_only_columns(
+        project_id,
+        space,
+        decisive,
+        completed.label('completed'),
+        func.count().label('count'),
+        func.grouping(*columns).label('grouping'),
+    ).group_by(func.grouping_sets(tuple_(), *columns))
+
+    facets: dict = {
+        'completed': 0,
+        'decisive': 0,
+        'inbox': 0,
+        'projects': {},
+        'spaces': {},
+        'total': 0,
+    }
+    for row in await fetch_rows(query):
+        grouping, count = row['grouping'], row['count']
+        if grouping == TOTAL:
+            facets['total'] = count
+        elif grouping == BY_PROJECT:
+            if row['project_id'] is None:
+                facets['inbox'] = count
+            else:
+                facets['projects'][row['project_id']] = count
+        elif grouping == BY_SPACE:
+            facets['spaces'][row['space']] = count
+        elif grouping == BY_DECISIVE and row['decisive']:
+            facets['decisive'] = count
+        elif grouping == BY_COMPLETED and row['completed']:
+            facets['completed'] = count
+    return facets
+
+
+def day_bounds(
+    day: date | None = None, timezone: str | None = None
+) -> tuple[ColumnElement, ColumnElement]:
+    """
+    Half-open ``[start, end)`` bounds of the day in the given timezone,
+    converted to the database session timezone task timestamps are
+    recorded in. Without a timezone the day is the database's current one.
+    """
+    if timezone is None:
+        start = cast(day or func.current_date(), DateTime)
+        return start, start + timedelta(days=1)
+
+    # the bounds are found by zoneinfo, Postgres may not know its zone names
+    zone = ZoneInfo(timezone)
+    day = day or datetime.now(zone).date()
+    start = datetime.combine(day, time(), tzinfo=zone)
+    end = datetime.combine(day + timedelta(days=1), time(), tzinfo=zone)
+    return _to_session_timezone(start), _to_session_timezone(end)
+
+
+def _to_session_timezone(moment: datetime) -> ColumnElement:
+    instant = literal(moment, DateTime(timezone=True))
+    return func.timezone(func.current_setting('TimeZone'), instant)
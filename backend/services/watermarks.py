@@ -0,0 +1,82 @@
+import time
+
+from databases import Database
+from sqlalchemy import delete, func, insert, select
+
+from app.database import ROW_VERSION, database, fetch_rows
+from app.settings import settings
+from models import Watermark
+
+__all__ = ('Watermarks', 'prune_watermarks', 'watermarks')
+
+
+class Watermarks:
+    """
+    Watermarks of all tables, cached for ``Settings.watermark_cache_ttl``
+    separately for the primary and the replica, so a watermark is never newer
+    than the rows read from the same database after it. Watermarks fetched
+    while the cache was cleared are used once and not cached, they may be
+    outdated already.
+    """
+
+    def __init__(self) -> None:
+        self._values: dict[Database, tuple[float, dict[str, int]]] = {}
+        self.generation = 0
+
+    async def __call__(self, *tables: str) -> tuple[int, ...]:
+        target = database.target  # type: ignore
+        expires_at, values = self._values.get(target, (0.0, {}))
+        if expires_at <= time.monotonic():
+            generation = self.generation
+            values = await self.fetch()
+            if generation == self.generation:
+                expires_at = time.monotonic() + settings.watermark_cache_ttl
+                self._values[target] = (expires_at, values)
+        # a table nothing was written to yet has no watermark
+        return tuple(values.get(table, 0) for table in tables)
+
+    @staticmethod
+    async def fetch() -> dict[str, int]:
+        query = select(
+            Watermark.table_name, func.sum(Watermark.changes).label('changes')
+        ).group_by(Watermark.table_name)
+        rows = await fetch_rows(query)
+        # sum() of bigint is numeric in Postgres
+        return {row['table_name']: int(row['changes']) for row in rows}
+
+    def clear(self) -> None:
+        self._values.clear()
+        self.generation += 1
+
+
+watermarks = Watermarks()
+
+
+async def prune_watermarks() -> int:
+    """
+    Merges the log entries of every table into one of the same sum in a
+    single statement, readers see either the entries or the merged one.
+    Entries appended meanwhile are left for the next run. Returns the number
+    of tables merged.
+    """
+    pruned = (
+        delete(Watermark)
+        .returning(Watermark.table_name, Watermark.changes)
+        .cte('pruned')
+    )
+    merged = (
+        insert(Watermark)
+        .from_select(
+            ['table_name', 'version', 'changes'],
+            select(
+                pruned.c.table_name,
+                ROW_VERSION.next_value(),
+                func.sum(pruned.c.changes),
+            ).group_by(pruned.c.table_name),
+        )
+        .returning(Watermark.table_name)
+        .cte('merged')
+    )
+    query = select(func.count()).select_from(merged)
+    count: int = await database.fetch_val(query)
+    return count
@@ -42,3 +42,34 @@ class TestReadComment:
         assert response.json() == serialize_error_response(
             'forbidden', 'Not authenticated'
         )
+
+    async def test_etag(self, client):
+        await self._setup()
+
+        response = await client.get(self.url)
+
+        assert response.headers['etag'] == f'"{self.comment.version}"'
+
+    async def test_not_modified(self, client, queries_count):
+        await self._setup()
+        etag = (await client.get(self.url)).headers['etag']
+        queries_before = queries_count()
+
+        response = await client.get(self.url, headers={'If-None-Match': etag})
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response.content == b''
+        assert response.headers['etag'] == etag
+        assert queries_count() - queries_before == 1
+
+    async def test_modified_after_update(self, client):
+        await self._setup()
+        etag = (await client.get(self.url)).headers['etag']
+        url = app.url_path_for('update_comment', pk=self.comment.id)
+        await client.put(url, json={'text': 'updated-text'})
+
+        response = await client.get(self.url, headers={'If-None-Match': etag})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()['data']['text'] == 'updated-text'
+        assert response.headers['etag'] != etag
@@ -11,6 +11,8 @@ def serialize_goal(goal: Goal) -> dict:
         'id': goal.id,
         'is_achieved': goal.achieved_at is not None,
         'month': goal.month,
+        'progress': None,
+        'project_count': goal.project_count,
         'projects': goal.projects or [],
         'title': goal.title,
         'year': goal.year,
@@ -4,9 +4,9 @@ from sqlalchemy import select
 
 from app.database import database
 from main import app
-from models import Goal, Project
+from models import Goal, Project, Task
 from tests.api.helpers import serialize_error_response
-from tests.factories import GoalFactory, ProjectFactory
+from tests.factories import GoalFactory, ProjectFactory, TaskFactory
 
 pytestmark = [pytest.mark.asyncio]
 
@@ -56,3 +56,24 @@ class TestDeleteGoal:
         assert response.status_code == status.HTTP_204_NO_CONTENT
         query = select(Project).where(Project.goal_id == self.goal.id)
         assert await database.fetch_one(query) is None
+
+    async def test_linked_projects_tasks(self, client):
+        await self._setup()
+        project = await ProjectFactory.create(goal_id=self.goal.id)
+        await TaskFactory.create_batch(size=2, project_id=project.id)
+
+        response = await client.delete(self.url)
+
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+        query = select(Task).where(Task.project_id == project.id)
+        assert await database.fetch_one(query) is None
+
+    async def test_single_statement(self, client, queries_count):
+        await self._setup()
+        await ProjectFactory.create_batch(size=2, goal_id=self.goal.id)
+
+        before = queries_count()
+        response = await client.delete(self.url)
+
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+        assert queries_count() - before == 1
@@ -52,3 +52,52 @@ class TestReadGoal:
 
         assert response.status_code == status.HTTP_200_OK
         assert response.json()['data']['projects'] == funcy.lpluck_attr('id', projects)
+
+    async def test_project_counter(self, client):
+        await self._setup()
+        other_goal = await GoalFactory.create()
+        projects = await ProjectFactory.create_batch(size=3, goal_id=self.goal.id)
+
+        await client.put(
+            app.url_path_for('update_project', pk=projects[0].id),
+            json={'goal_id': other_goal.id},
+        )
+        await client.delete(app.url_path_for('delete_project', pk=projects[1].id))
+        response = await client.get(self.url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()['data']['project_count'] == 1
+
+        response = await client.get(app.url_path_for('read_goal', pk=other_goal.id))
+
+        assert response.json()['data']['project_count'] == 1
+
+    async def test_etag(self, client):
+        await self._setup()
+
+        response = await client.get(self.url)
+
+        assert response.headers['etag'] == f'"{self.goal.version}"'
+
+    async def test_not_modified(self, client, queries_count):
+        await self._setup()
+        etag = (await client.get(self.url)).headers['etag']
+        queries_before = queries_count()
+
+        response = await client.get(self.url, headers={'If-None-Match': etag})
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response.content == b''
+        assert response.headers['etag'] == etag
+        assert queries_count() - queries_before == 1
+
+    async def test_modified_after_project_added(self, client):
+        await self._setup()
+        etag = (await client.get(self.url)).headers['etag']
+        project = await ProjectFactory.create(goal_id=self.goal.id)
+
+        response = await client.get(self.url, headers={'If-None-Match': etag})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()['data']['projects'] == [project.id]
+        assert response.headers['etag'] != etag
@@ -3,10 +3,11 @@ from datetime import datetime
 import pytest
 from fastapi import status
 
+from app.settings import settings
 from main import app
 from tests.api.helpers import serialize_error_response
 from tests.api.private.goals.helpers import serialize_goal_response
-from tests.factories import GoalFactory
+from tests.factories import GoalFactory, ProjectDataFactory, ProjectFactory, TaskFactory
 
 pytestmark = [pytest.mark.asyncio]
 
@@ -149,3 +150,136 @@ class TestReadGoalList:
 
         assert response.status_code == status.HTTP_200_OK
         assert response.json() == serialize_goal_response([goal])
+
+    async def test_ordering(self, client):
+        await self._setup()
+        goals = await GoalFactory.create_batch(size=3)
+        await ProjectFactory.create_batch(size=2, goal_id=goals[0].id)
+        await ProjectFactory.create(goal_id=goals[2].id)
+
+        response = await client.get(self.url, params={'ordering': 'project_count'})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [goal['id'] for goal in response.json()['data']] == [
+            goals[1].id,
+            goals[2].id,
+            goals[0].id,
+        ]
+
+    async def test_related_projects(self, client):
+        await self._setup()
+        goal = await GoalFactory.create()
+        projects = await ProjectFactory.create_batch(size=2, goal_id=goal.id)
+
+        response = await client.get(self.url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()['data'][0]['projects'] == [
+            project.id for project in projects
+        ]
+
+    async def test_stream_list(self, client):
+        await self._setup()
+        goals = await GoalFactory.create_batch(size=2)
+        project = await ProjectFactory.create(goal_id=goals[0].id)
+
+        response = await client.get(self.url, params={'stream': True})
+
+        assert response.status_code == status.HTTP_200_OK
+        expected_response = serialize_goal_response(goals)
+        expected_response['data'][0]['projects'] = [project.id]
+        expected_response['data'][0]['project_count'] = 1
+        assert response.json() == expected_response
+
+    async def test_queries_count_does_not_depend_on_goals_count(
+        self, client, queries_count, watermarks
+    ):
+        await self._setup()
+        goal = await GoalFactory.create()
+        await ProjectFactory.create(goal_id=goal.id)
+
+        before = queries_count()
+        await client.get(self.url)
+        expected_queries_count = queries_count() - before
+
+        for goal in await GoalFactory.create_batch(size=5):
+            await ProjectFactory.create_batch(size=2, goal_id=goal.id)
+        watermarks.clear()  # the first request cached them
+
+        before = queries_count()
+        response = await client.get(self.url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.json()['data']) == 6
+        assert queries_count() - before == expected_queries_count
+
+    async def test_render_json_in_database(self, client, render_json_in_database):
+        await self._setup()
+        created_at = datetime(2022, 5, 10, 12, 30)
+        goals = [
+            await GoalFactory.create(created_at=created_at),
+            await GoalFactory.create(created_at=created_at, achieved_at=created_at),
+        ]
+        projects = await ProjectFactory.create_batch(size=2, goal_id=goals[0].id)
+        expected = serialize_goal_response(goals)
+        expected['data'][0]['projects'] = [project.id for project in projects]
+        expected['data'][0]['project_count'] = 2
+
+        response = await client.get(self.url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == expected
+
+    @pytest.mark.parametrize('render_in_database', [False, True])
+    async def test_with_progress(self, client, monkeypatch, render_in_database):
+        await self._setup()
+        monkeypatch.setattr(settings, 'render_json_in_database', render_in_database)
+        goals = await GoalFactory.create_batch(size=2)
+        project = await ProjectFactory.create(goal_id=goals[0].id)
+        await TaskFactory.create(project_id=project.id, completed=True)
+        await TaskFactory.create(project_id=project.id)
+
+        response = await client.get(self.url, params={'with_progress': True})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [goal['progress'] for goal in response.json()['data']] == [
+            {'completed_task_count': 1, 'completion_ratio': 0.5, 'task_count': 2},
+            {'completed_task_count': 0, 'completion_ratio': None, 'task_count': 0},
+        ]
+
+    async def test_not_modified(self, client, queries_count, watermarks):
+        await self._setup()
+        await GoalFactory.create()
+        etag = (await client.get(self.url)).headers['etag']
+        watermarks.clear()
+        queries_before = queries_count()
+
+        response = await client.get(self.url, headers={'If-None-Match': etag})
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response.content == b''
+        assert response.headers['etag'] == etag
+        assert queries_count() - queries_before == 1
+
+    async def test_etag_depends_on_streaming_format(self, client):
+        await self._setup()
+
+        response = await client.get(self.url)
+        streaming_response = await client.get(self.url, params={'stream': True})
+
+        assert streaming_response.headers['etag'] != response.headers['etag']
+
+    async def test_modified_after_project_added(self, client):
+        await self._setup()
+        goal = await GoalFactory.create()
+        etag = (await client.get(self.url)).headers['etag']
+        project_data = ProjectDataFactory.create(goal_id=goal.id)
+        project = await client.post(
+            app.url_path_for('create_project'), json=project_data
+        )
+
+        response = await client.get(self.url, headers={'If-None-Match': etag})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()['data'][0]['projects'] == [project.json()['data']['id']]
+        assert response.headers['etag'] != etag
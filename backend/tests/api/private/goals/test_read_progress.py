@@ -0,0 +1,112 @@
+import pytest
+from fastapi import status
+
+from main import app
+from tests.api.helpers import serialize_error_response
+from tests.factories import GoalFactory, ProjectFactory, TaskFactory
+
+pytestmark = [pytest.mark.asyncio]
+
+
+class TestReadGoalProgress:
+    async def _setup(self):
+        self.goal = await GoalFactory.create()
+        self.url = app.url_path_for('read_goal_progress', pk=self.goal.id)
+
+    async def test_successfully_read(self, client):
+        await self._setup()
+        projects = await ProjectFactory.create_batch(size=2, goal_id=self.goal.id)
+        await TaskFactory.create_batch(size=2, project_id=projects[0].id)
+        await TaskFactory.create(project_id=projects[0].id, completed=True)
+        other_project = await ProjectFactory.create()
+        await TaskFactory.create(project_id=other_project.id, completed=True)
+
+        response = await client.get(self.url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {
+            'status': 'ok',
+            'data': {
+                'completed_task_count': 1,
+                'completion_ratio': 0.3333,
+                'goal_id': self.goal.id,
+                'projects': [
+                    {
+                        'completed_task_count': 1,
+                        'completion_ratio': 0.3333,
+                        'project_id': projects[0].id,
+                        'task_count': 3,
+                    },
+                    {
+                        'completed_task_count': 0,
+                        'completion_ratio': None,
+                        'project_id': projects[1].id,
+                        'task_count': 0,
+                    },
+                ],
+                'task_count': 3,
+            },
+        }
+
+    async def test_without_projects(self, client):
+        await self._setup()
+
+        response = await client.get(self.url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()['data'] == {
+            'completed_task_count': 0,
+            'completion_ratio': None,
+            'goal_id': self.goal.id,
+            'projects': [],
+            'task_count': 0,
+        }
+
+    async def test_follows_mutations(self, client):
+        await self._setup()
+        other_goal = await GoalFactory.create()
+        projects = await ProjectFactory.create_batch(size=2, goal_id=self.goal.id)
+        tasks = await TaskFactory.create_batch(size=2, project_id=projects[0].id)
+        await TaskFactory.create_batch(size=3, project_id=projects[1].id)
+
+        await client.post(app.url_path_for('complete_task', pk=tasks[0].id))
+        await client.delete(app.url_path_for('delete_task', pk=tasks[1].id))
+        await client.put(
+            app.url_path_for('update_project', pk=projects[1].id),
+            json={'goal_id': other_goal.id},
+        )
+        response = await client.get(self.url)
+
+        assert response.status_code == status.HTTP_200_OK
+        progress = response.json()['data']
+        assert progress['task_count'] == 1
+        assert progress['completed_task_count'] == 1
+        assert progress['completion_ratio'] == 1
+
+        response = await client.get(
+            app.url_path_for('read_goal_progress', pk=other_goal.id)
+        )
+
+        assert response.json()['data']['task_count'] == 3
+        assert response.json()['data']['completed_task_count'] == 0
+
+    async def test_not_found(self, client):
+        pk = 100500
+        url = app.url_path_for('read_goal_progress', pk=pk)
+
+        response = await client.get(url)
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        assert response.json() == serialize_error_response(
+            'not_found', f'goal with pk={pk} not found'
+        )
+
+    async def test_not_authorized(self, anonymous_client):
+        await self._setup()
+
+        response = await anonymous_client.get(self.url)
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+        assert response.json() == serialize_error_response(
+            'forbidden', 'Not authenticated'
+        )
@@ -0,0 +1,43 @@
+import pytest
+from fastapi import status
+
+from app.settings import settings
+from main import app
+from tests.api.helpers import serialize_error_response
+from tests.factories import TagFactory
+
+pytestmark = [pytest.mark.asyncio]
+
+
+class TestReadCacheStats:
+    async def _setup(self):
+        self.url = app.url_path_for('read_cache_stats')
+
+    async def test_successfully_read(self, client, monkeypatch):
+        await self._setup()
+        monkeypatch.setattr(settings, 'entity_cache_models', {'tag'})
+        tag = await TagFactory.create()
+        stats = (await client.get(self.url)).json()['data']
+
+        for _ in range(2):
+            await client.get(app.url_path_for('read_tag', pk=tag.id))
+        response = await client.get(self.url)
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()['data']
+        assert data['backend'] == 'memory'
+        assert data['size'] == 1
+        # each read looks up the version for its ETag and then the row
+        assert data['misses'] == stats['misses'] + 2
+        assert data['hits'] == stats['hits'] + 2
+        assert 0 < data['bytes'] <= data['max_bytes'] == settings.memory_cache_max_bytes
+
+    async def test_not_authorized(self, anonymous_client):
+        await self._setup()
+
+        response = await anonymous_client.get(self.url)
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+        assert response.json() == serialize_error_response(
+            'forbidden', 'Not authenticated'
+        )
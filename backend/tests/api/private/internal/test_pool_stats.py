@@ -0,0 +1,76 @@
+import asyncio
+
+import asyncpg
+import pytest
+from fastapi import status
+
+from app.pool import InstrumentedPool
+from app.settings import settings
+from main import app
+from tests.api.helpers import serialize_error_response
+
+pytestmark = [pytest.mark.asyncio]
+
+
+class TestReadPoolStats:
+    async def _setup(self):
+        self.url = app.url_path_for('read_pool_stats')
+
+    async def test_successfully_read(self, client):
+        await self._setup()
+
+        response = await client.get(self.url)
+
+        assert response.status_code == status.HTTP_200_OK
+        stats = response.json()['data']
+        assert stats['min_size'] == settings.db_pool_min_size
+        assert stats['max_size'] == settings.db_pool_max_size
+        assert stats['size'] >= settings.db_pool_min_size
+        assert stats['in_use'] + stats['idle'] == stats['size']
+        # tests hold one connection for the rolled back transaction
+        assert stats['in_use'] >= 1
+        assert stats['waiters'] == 0
+        assert stats['timeouts'] == 0
+        assert stats['acquire_time_max'] >= stats['acquire_time_avg'] >= 0
+
+    async def test_not_authorized(self, anonymous_client):
+        await self._setup()
+
+        response = await anonymous_client.get(self.url)
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+        assert response.json() == serialize_error_response(
+            'forbidden', 'Not authenticated'
+        )
+
+
+class TestInstrumentedPool:
+    async def _setup(self):
+        url = settings.database_url.replace('+asyncpg', '')
+        self.raw_pool = await asyncpg.create_pool(url, min_size=1, max_size=1)
+        self.pool = InstrumentedPool(self.raw_pool, acquire_timeout=0.05)
+
+    async def test_acquire_counted(self):
+        await self._setup()
+        try:
+            connection = await self.pool.acquire()
+            await self.pool.release(connection)
+        finally:
+            await self.raw_pool.close()
+
+        stats = self.pool.stats()
+        assert (stats['acquired'], stats['timeouts'], stats['waiters']) == (1, 0, 0)
+        assert stats['acquire_time_max'] == stats['acquire_time_avg'] > 0
+
+    async def test_timeout_counted_apart(self):
+        await self._setup()
+        try:
+            connection = await self.pool.acquire()
+            with pytest.raises(asyncio.TimeoutError):
+                await self.pool.acquire()
+            await self.pool.release(connection)
+        finally:
+            await self.raw_pool.close()
+
+        stats = self.pool.stats()
+        assert (stats['acquired'], stats['timeouts'], stats['waiters']) == (1, 1, 0)
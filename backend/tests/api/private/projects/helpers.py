@@ -13,6 +13,8 @@ def serialize_project(project: Project) -> dict:
         'goal_id': project.goal_id,
         'id': project.id,
         'is_archived': project.archived_at is not None,
+        'open_task_count': project.open_task_count,
+        'task_count': project.task_count,
         'tasks': project.tasks or [],
         'title': project.title,
         'space': project.space,
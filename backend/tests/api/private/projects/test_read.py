@@ -52,3 +52,58 @@ class TestReadProject:
 
         assert response.status_code == status.HTTP_200_OK
         assert response.json()['data']['tasks'] == funcy.lpluck_attr('id', tasks)
+
+    async def test_task_counters(self, client):
+        await self._setup()
+        other_project = await ProjectFactory.create()
+        tasks = await TaskFactory.create_batch(size=4, project_id=self.project.id)
+        await TaskFactory.create(project_id=self.project.id, completed=True)
+
+        await client.post(app.url_path_for('complete_task', pk=tasks[0].id))
+        await client.put(
+            app.url_path_for('update_task', pk=tasks[1].id),
+            json={'project_id': other_project.id},
+        )
+        await client.delete(app.url_path_for('delete_task', pk=tasks[2].id))
+        response = await client.get(self.url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()['data']['task_count'] == 3
+        assert response.json()['data']['open_task_count'] == 1
+
+        response = await client.get(
+            app.url_path_for('read_project', pk=other_project.id)
+        )
+
+        assert response.json()['data']['task_count'] == 1
+        assert response.json()['data']['open_task_count'] == 1
+
+    async def test_etag(self, client):
+        await self._setup()
+
+        response = await client.get(self.url)
+
+        assert response.headers['etag'] == f'"{self.project.version}"'
+
+    async def test_not_modified(self, client, queries_count):
+        await self._setup()
+        etag = (await client.get(self.url)).headers['etag']
+        queries_before = queries_count()
+
+        response = await client.get(self.url, headers={'If-None-Match': etag})
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response.content == b''
+        assert response.headers['etag'] == etag
+        assert queries_count() - queries_before == 1
+
+    async def test_modified_after_task_added(self, client):
+        await self._setup()
+        etag = (await client.get(self.url)).headers['etag']
+        task = await TaskFactory.create(project_id=self.project.id)
+
+        response = await client.get(self.url, headers={'If-None-Match': etag})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()['data']['tasks'] == [task.id]
+        assert response.headers['etag'] != etag
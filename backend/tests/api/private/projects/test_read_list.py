@@ -1,3 +1,5 @@
+from datetime import datetime
+
 import pytest
 from fastapi import status
 
@@ -5,7 +7,7 @@ from main import app
 from services.spaces import Space
 from tests.api.helpers import serialize_error_response
 from tests.api.private.projects.helpers import serialize_project_response
-from tests.factories import ProjectFactory
+from tests.factories import ProjectFactory, TaskDataFactory, TaskFactory
 
 pytestmark = [pytest.mark.asyncio]
 
@@ -131,3 +133,143 @@ class TestReadProjectList:
             'bad_request',
             'space value is not a valid enumeration member; permitted: 1, 2',
         )
+
+    @pytest.mark.parametrize('has_open_tasks', [False, True])
+    async def test_filter_has_open_tasks(self, client, has_open_tasks):
+        await self._setup()
+        projects = await ProjectFactory.create_batch(size=2)
+        await TaskFactory.create(project_id=projects[0].id)
+        await TaskFactory.create(project_id=projects[1].id, completed=True)
+
+        response = await client.get(self.url, params={'has_open_tasks': has_open_tasks})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [project['id'] for project in response.json()['data']] == [
+            projects[0].id if has_open_tasks else projects[1].id
+        ]
+
+    async def test_ordering(self, client):
+        await self._setup()
+        projects = await ProjectFactory.create_batch(size=3)
+        await TaskFactory.create_batch(size=2, project_id=projects[1].id)
+        await TaskFactory.create(project_id=projects[2].id)
+
+        response = await client.get(self.url, params={'ordering': '-open_task_count'})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [project['id'] for project in response.json()['data']] == [
+            projects[1].id,
+            projects[2].id,
+            projects[0].id,
+        ]
+
+    async def test_invalid_ordering(self, client):
+        await self._setup()
+
+        response = await client.get(self.url, params={'ordering': 'title'})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.json() == serialize_error_response(
+            'bad_request',
+            "ordering value is not a valid enumeration member; permitted: "
+            "'task_count', '-task_count', 'open_task_count', '-open_task_count'",
+        )
+
+    async def test_related_tasks(self, client):
+        await self._setup()
+        project = await ProjectFactory.create()
+        tasks = await TaskFactory.create_batch(size=2, project_id=project.id)
+
+        response = await client.get(self.url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()['data'][0]['tasks'] == [task.id for task in tasks]
+
+    async def test_stream_list(self, client):
+        await self._setup()
+        projects = await ProjectFactory.create_batch(size=2)
+        task = await TaskFactory.create(project_id=projects[0].id)
+
+        response = await client.get(self.url, params={'stream': True})
+
+        assert response.status_code == status.HTTP_200_OK
+        expected_response = serialize_project_response(projects)
+        expected_response['data'][0]['tasks'] = [task.id]
+        expected_response['data'][0]['open_task_count'] = 1
+        expected_response['data'][0]['task_count'] = 1
+        assert response.json() == expected_response
+
+    async def test_queries_count_does_not_depend_on_projects_count(
+        self, client, queries_count, watermarks
+    ):
+        await self._setup()
+        project = await ProjectFactory.create()
+        await TaskFactory.create(project_id=project.id)
+
+        before = queries_count()
+        await client.get(self.url)
+        expected_queries_count = queries_count() - before
+
+        for project in await ProjectFactory.create_batch(size=5):
+            await TaskFactory.create_batch(size=2, project_id=project.id)
+        watermarks.clear()  # the first request cached them
+
+        before = queries_count()
+        response = await client.get(self.url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.json()['data']) == 6
+        assert queries_count() - before == expected_queries_count
+
+    async def test_render_json_in_database(self, client, render_json_in_database):
+        await self._setup()
+        created_at = datetime(2022, 5, 10, 12, 30)
+        projects = [
+            await ProjectFactory.create(created_at=created_at),
+            await ProjectFactory.create(created_at=created_at, archived_at=created_at),
+        ]
+        tasks = await TaskFactory.create_batch(size=2, project_id=projects[0].id)
+        expected = serialize_project_response(projects)
+        expected['data'][0]['tasks'] = [task.id for task in tasks]
+        expected['data'][0]['open_task_count'] = 2
+        expected['data'][0]['task_count'] = 2
+
+        response = await client.get(self.url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == expected
+
+    async def test_not_modified(self, client, queries_count, watermarks):
+        await self._setup()
+        await ProjectFactory.create()
+        etag = (await client.get(self.url)).headers['etag']
+        watermarks.clear()
+        queries_before = queries_count()
+
+        response = await client.get(self.url, headers={'If-None-Match': etag})
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response.content == b''
+        assert response.headers['etag'] == etag
+        assert queries_count() - queries_before == 1
+
+    async def test_etag_depends_on_streaming_format(self, client):
+        await self._setup()
+
+        response = await client.get(self.url)
+        streaming_response = await client.get(self.url, params={'stream': True})
+
+        assert streaming_response.headers['etag'] != response.headers['etag']
+
+    async def test_modified_after_task_added(self, client):
+        await self._setup()
+        project = await ProjectFactory.create()
+        etag = (await client.get(self.url)).headers['etag']
+        task_data = TaskDataFactory.create(project_id=project.id)
+        task = await client.post(app.url_path_for('create_task'), json=task_data)
+
+        response = await client.get(self.url, headers={'If-None-Match': etag})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()['data'][0]['tasks'] == [task.json()['data']['id']]
+        assert response.headers['etag'] != etag
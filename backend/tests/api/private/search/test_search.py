@@ -0,0 +1,215 @@
+import asyncio
+import time
+
+import pytest
+from fastapi import status
+from sqlalchemy import func, select, text
+
+from api.private.search import search
+from app.database import database
+from main import app
+from tests.api.helpers import serialize_error_response
+from tests.conftest import engine
+from tests.factories import CommentFactory, GoalFactory, ProjectFactory, TaskFactory
+
+pytestmark = [pytest.mark.asyncio]
+
+
+SLOW_QUERY = select(func.pg_sleep(5))
+
+
+async def slow_query_running() -> bool:
+    # asyncpg sends the cancel request over a new connection in the background
+    query = text(
+        "SELECT count(*) FROM pg_stat_activity "
+        "WHERE state = 'active' AND query LIKE '%pg_sleep%' "
+        "AND pid != pg_backend_pid()"
+    )
+    for _ in range(20):
+        async with engine.connect() as connection:
+            if not await connection.scalar(query):
+                return False
+        await asyncio.sleep(0.05)
+    return True
+
+
+def found(response) -> list[tuple[str, int]]:
+    return [(result['type'], result['id']) for result in response.json()['data']]
+
+
+class TestSearch:
+    async def _setup(self):
+        self.url = app.url_path_for('search')
+
+    async def test_search_all_entities(self, client):
+        await self._setup()
+        task = await TaskFactory.create(title='renew passport')
+        project = await ProjectFactory.create(title='travel', description='passport')
+        goal = await GoalFactory.create(title='passport')
+        comment = await CommentFactory.create(text='passport office closes at five')
+        await TaskFactory.create(title='buy milk', description='and bread')
+
+        response = await client.get(self.url, params={'q': 'passport'})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()['count'] == 4
+        assert set(found(response)) == {
+            ('task', task.id),
+            ('project', project.id),
+            ('goal', goal.id),
+            ('comment', comment.id),
+        }
+
+    async def test_title_matches_rank_higher(self, client):
+        await self._setup()
+        described = await TaskFactory.create(title='errand', description='dentist')
+        titled = await TaskFactory.create(title='dentist', description='at noon')
+
+        response = await client.get(self.url, params={'q': 'dentist'})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert found(response) == [('task', titled.id), ('task', described.id)]
+
+    async def test_result(self, client):
+        await self._setup()
+        task = await TaskFactory.create(title='call mom', description='on sunday')
+
+        response = await client.get(self.url, params={'q': 'sunday'})
+
+        assert response.status_code == status.HTTP_200_OK
+        [result] = response.json()['data']
+        assert result['type'] == 'task'
+        assert result['id'] == task.id
+        assert result['title'] == 'call mom'
+        assert result['snippet'] == 'call mom on <b>sunday</b>'
+        assert result['rank'] > 0
+
+    async def test_web_search_syntax(self, client):
+        await self._setup()
+        task = await TaskFactory.create(title='water plants', description=None)
+        await TaskFactory.create(title='water bill', description=None)
+
+        response = await client.get(self.url, params={'q': 'water -bill'})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert found(response) == [('task', task.id)]
+
+    async def test_cursor_pagination(self, client):
+        await self._setup()
+        await TaskFactory.create_batch(size=3, title='report', description=None)
+        await ProjectFactory.create_batch(size=2, title='report', description='q3')
+        expected = found(await client.get(self.url, params={'q': 'report'}))
+
+        pages = []
+        params = {'q': 'report', 'limit': 2}
+        while True:
+            response = await client.get(self.url, params=params)
+            assert response.status_code == status.HTTP_200_OK
+            pages.append(found(response))
+            if 'next_cursor' not in response.json():
+                break
+            params['cursor'] = response.json()['next_cursor']
+
+        assert [len(page) for page in pages] == [2, 2, 1]
+        assert sum(pages, []) == expected
+
+    async def test_nothing_found(self, client):
+        await self._setup()
+        await TaskFactory.create(title='report')
+
+        response = await client.get(self.url, params={'q': 'holiday'})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {'status': 'ok', 'data': [], 'count': 0}
+
+    async def test_invalid_cursor(self, client):
+        await self._setup()
+
+        response = await client.get(self.url, params={'q': 'report', 'cursor': 'x'})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.json() == serialize_error_response(
+            'bad_request', 'invalid cursor'
+        )
+
+    async def test_empty_query(self, client):
+        await self._setup()
+
+        response = await client.get(self.url, params={'q': ''})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.json() == serialize_error_response(
+            'bad_request', 'q ensure this value has at least 1 characters'
+        )
+
+    async def test_statement_timeout(self, client, mocker, monkeypatch):
+        await self._setup()
+        monkeypatch.setattr(search, 'statement_timeout', 0.1)
+        mocker.patch('api.private.search.with_snippets', return_value=SLOW_QUERY)
+
+        started_at = time.monotonic()
+        response = await client.get(self.url, params={'q': 'passport'})
+
+        assert time.monotonic() - started_at < 1
+        assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+        assert response.json() == serialize_error_response(
+            'service_unavailable', 'statement timeout'
+        )
+        assert not await slow_query_running()
+
+    async def test_database_statement_timeout(self, client, mocker):
+        await self._setup()
+        await database.execute('SET LOCAL statement_timeout = 50')
+        mocker.patch('api.private.search.with_snippets', return_value=SLOW_QUERY)
+
+        response = await client.get(self.url, params={'q': 'passport'})
+
+        assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+        assert response.json() == serialize_error_response(
+            'service_unavailable', 'statement timeout'
+        )
+
+    async def test_cancel_on_client_disconnect(self, mocker):
+        await self._setup()
+        mocker.patch('api.private.search.with_snippets', return_value=SLOW_QUERY)
+        scope = {
+            'type': 'http',
+            'asgi': {'version': '3.0'},
+            'http_version': '1.1',
+            'method': 'GET',
+            'scheme': 'http',
+            'path': self.url,
+            'raw_path': self.url.encode(),
+            'root_path': '',
+            'query_string': b'q=passport',
+            'headers': [(b'authorization', b'Bearer secret_token')],
+            'server': ('test', 80),
+        }
+        messages = [{'type': 'http.request', 'body': b'', 'more_body': False}]
+        sent = []
+
+        async def receive():
+            if messages:
+                return messages.pop()
+            await asyncio.sleep(0.1)
+            return {'type': 'http.disconnect'}
+
+        async def send(message):
+            sent.append(message)
+
+        started_at = time.monotonic()
+        await app(scope, receive, send)
+
+        assert time.monotonic() - started_at < 1
+        assert sent == []
+        assert not await slow_query_running()
+
+    async def test_not_authorized(self, anonymous_client):
+        await self._setup()
+
+        response = await anonymous_client.get(self.url, params={'q': 'report'})
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+        assert response.json() == serialize_error_response(
+            'forbidden', 'Not authenticated'
+        )
@@ -1,10 +1,15 @@
+import asyncio
+
 import pytest
 from fastapi import status
 from sqlalchemy import select
 
+from api.private import tags as tags_api
 from app.database import database
+from app.settings import settings
 from main import app
 from models import Tag
+from services.tags import create_one_tag
 from tests.api.helpers import serialize_error_response
 from tests.api.private.tags.helpers import serialize_tag_response
 from tests.factories import TagDataFactory
@@ -29,6 +34,22 @@ class TestCreateTag:
         assert tag is not None
         assert json_response == serialize_tag_response(tag)
 
+    async def test_not_cancelled_by_route_timeout(self, client, monkeypatch):
+        await self._setup()
+        monkeypatch.setattr(settings, 'db_route_statement_timeout', 0.01)
+
+        async def slow_create(**kwargs):
+            await asyncio.sleep(0.05)
+            return await create_one_tag(**kwargs)
+
+        monkeypatch.setattr(tags_api, 'create_one_tag', slow_create)
+
+        response = await client.post(self.url, json=TagDataFactory.create())
+
+        assert response.status_code == status.HTTP_201_CREATED
+        query = select(Tag).where(Tag.id == response.json()['data']['id'])
+        assert await database.fetch_one(query) is not None
+
     async def test_not_authorized(self, anonymous_client):
         await self._setup()
 
@@ -1,6 +1,12 @@
+import asyncio
+import json
+
 import pytest
 from fastapi import status
 
+from api.private import tags as tags_api
+from app.database import database
+from app.settings import settings
 from main import app
 from tests.api.helpers import serialize_error_response
 from tests.api.private.tags.helpers import serialize_tag_response
@@ -22,6 +28,60 @@ class TestReadTagList:
         assert response.status_code == status.HTTP_200_OK
         assert response.json() == serialize_tag_response(tags)
 
+    async def test_stream_list(self, client):
+        await self._setup()
+        tags = await TagFactory.create_batch(size=2)
+
+        response = await client.get(self.url, params={'stream': True})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == serialize_tag_response(tags)
+
+    async def test_stream_empty_list(self, client):
+        await self._setup()
+
+        response = await client.get(self.url, params={'stream': True})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == serialize_tag_response([])
+
+    async def test_stream_ndjson_list(self, client):
+        await self._setup()
+        tags = await TagFactory.create_batch(size=2)
+
+        response = await client.get(
+            self.url, headers={'Accept': 'application/x-ndjson'}
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers['content-type'] == 'application/x-ndjson'
+        assert [
+            json.loads(line) for line in response.text.splitlines()
+        ] == serialize_tag_response(tags)['data']
+
+    async def test_stream_outlasts_route_timeout(self, client, monkeypatch):
+        await self._setup()
+        tags = await TagFactory.create_batch(size=2)
+        monkeypatch.setattr(settings, 'db_route_statement_timeout', 0.05)
+
+        class SlowDatabase:
+            @staticmethod
+            async def iterate(query):
+                async for tag in database.iterate(query):
+                    await asyncio.sleep(0.1)
+                    yield tag
+
+        monkeypatch.setattr(tags_api, 'database', SlowDatabase())
+
+        response = await client.get(
+            self.url, headers={'Accept': 'application/x-ndjson'}
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [
+            json.loads(line) for line in response.text.splitlines()
+        ] == serialize_tag_response(tags)['data']
+
     async def test_empty_list(self, client):
         await self._setup()
         response = await client.get(self.url)
@@ -1,5 +1,8 @@
 import funcy
+from sqlalchemy import String, column, select
+from sqlalchemy.dialects.postgresql import REGCLASS
 
+from app.database import database
 from models import Task
 from tests.api.helpers import serialize_response
 
@@ -21,3 +24,9 @@ def serialize_task(task: Task) -> dict:
 
 
 serialize_task_response = funcy.partial(serialize_response, serializer=serialize_task)
+
+
+async def get_task_partition(pk: int) -> str:
+    query = select(column('tableoid').cast(REGCLASS).cast(String)).where(Task.id == pk)
+    partition: str = await database.fetch_val(query)
+    return partition
@@ -8,7 +8,7 @@ from app.database import database
 from main import app
 from models import Task
 from tests.api.helpers import serialize_error_response
-from tests.api.private.tasks.helpers import serialize_task_response
+from tests.api.private.tasks.helpers import get_task_partition, serialize_task_response
 from tests.factories import TaskFactory
 
 pytestmark = [pytest.mark.asyncio]
@@ -32,6 +32,13 @@ class TestCompleteTask:
         assert completed_at == datetime.now().replace(second=0, microsecond=0)
         assert json_response == serialize_task_response(task)
 
+    async def test_moved_to_completed_partition(self, client):
+        await self._setup()
+
+        await client.post(self.url)
+
+        assert await get_task_partition(self.task.id) == 'task_completed'
+
     async def test_not_found(self, client):
         pk = 100500
         url = app.url_path_for('complete_task', pk=pk)
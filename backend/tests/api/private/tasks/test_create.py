@@ -29,6 +29,17 @@ class TestCreateTask:
         assert task is not None
         assert json_response == serialize_task_response(task)
 
+    async def test_write_to_primary(self, client, replica):
+        await self._setup()
+        task_data = TaskDataFactory.create()
+
+        response = await client.post(self.url, json=task_data)
+
+        assert response.status_code == status.HTTP_201_CREATED
+        query = select(Task).where(Task.id == response.json()['data']['id'])
+        assert await database.fetch_one(query) is not None
+        assert await replica.fetch_one(query) is None
+
     async def test_not_authorized(self, anonymous_client):
         await self._setup()
 
@@ -303,6 +314,17 @@ class TestCreateTask:
         assert response.status_code == status.HTTP_201_CREATED
         assert response.json()['data']['project_id'] == project.id
 
+    async def test_link_project_in_one_query(self, client, queries_count):
+        await self._setup()
+        project = await ProjectFactory.create()
+        project_data = TaskDataFactory.create(project_id=project.id)
+
+        before = queries_count()
+        response = await client.post(self.url, json=project_data)
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert queries_count() - before == 1
+
     async def test_project_not_found(self, client):
         await self._setup()
         pk = 100500
@@ -1,10 +1,11 @@
 import pytest
 from fastapi import status
 
+from api.private.tasks import read_task
 from main import app
 from tests.api.helpers import serialize_error_response
 from tests.api.private.tasks.helpers import serialize_task_response
-from tests.factories import TaskFactory
+from tests.factories import ArchivedTaskFactory, TaskFactory
 
 pytestmark = [pytest.mark.asyncio]
 
@@ -22,6 +23,35 @@ class TestReadTask:
         assert response.status_code == status.HTTP_200_OK
         assert response.json() == serialize_task_response(self.task)
 
+    async def test_read_from_primary(self, client, replica, monkeypatch):
+        await self._setup()
+        monkeypatch.setattr(read_task, 'primary_database', True, raising=False)
+
+        response = await client.get(self.url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == serialize_task_response(self.task)
+
+    async def test_include_archived(self, client):
+        archived_task = await ArchivedTaskFactory.create()
+        url = app.url_path_for('read_task', pk=archived_task.id)
+
+        response = await client.get(url, params={'include_archived': True})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == serialize_task_response(archived_task)
+
+    async def test_archived_not_found(self, client):
+        archived_task = await ArchivedTaskFactory.create()
+        url = app.url_path_for('read_task', pk=archived_task.id)
+
+        response = await client.get(url)
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        assert response.json() == serialize_error_response(
+            'not_found', f'task with pk={archived_task.id} not found'
+        )
+
     async def test_not_found(self, client):
         pk = 100500
         url = app.url_path_for('read_task', pk=pk)
@@ -42,3 +72,46 @@ class TestReadTask:
         assert response.json() == serialize_error_response(
             'forbidden', 'Not authenticated'
         )
+
+    async def test_etag(self, client):
+        await self._setup()
+
+        response = await client.get(self.url)
+
+        assert response.headers['etag'] == f'"{self.task.version}"'
+
+    async def test_not_modified(self, client, queries_count):
+        await self._setup()
+        etag = (await client.get(self.url)).headers['etag']
+        queries_before = queries_count()
+
+        response = await client.get(self.url, headers={'If-None-Match': etag})
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response.content == b''
+        assert response.headers['etag'] == etag
+        assert queries_count() - queries_before == 1
+
+    async def test_modified_after_complete(self, client):
+        await self._setup()
+        etag = (await client.get(self.url)).headers['etag']
+        await client.post(app.url_path_for('complete_task', pk=self.task.id))
+
+        response = await client.get(self.url, headers={'If-None-Match': etag})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()['data']['completed_at'] is not None
+        assert response.headers['etag'] != etag
+
+    async def test_archived_without_etag(self, client):
+        archived_task = await ArchivedTaskFactory.create()
+        url = app.url_path_for('read_task', pk=archived_task.id)
+
+        response = await client.get(
+            url,
+            params={'include_archived': True},
+            headers={'If-None-Match': f'"{archived_task.version}"'},
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert 'etag' not in response.headers
@@ -0,0 +1,146 @@
+import pytest
+from fastapi import status
+
+from main import app
+from services.spaces import Space
+from tests.api.helpers import serialize_error_response
+from tests.factories import ArchivedTaskFactory, ProjectFactory, TaskFactory
+
+pytestmark = [pytest.mark.asyncio]
+
+
+class TestReadTaskFacets:
+    async def _setup(self):
+        self.url = app.url_path_for('read_task_facets')
+
+    async def test_successfully_read(self, client):
+        await self._setup()
+        projects = await ProjectFactory.create_batch(size=2)
+        await TaskFactory.create(project_id=projects[0].id, decisive=True)
+        await TaskFactory.create(project_id=projects[0].id, completed=True)
+        await TaskFactory.create(project_id=projects[1].id, space=Space.PERSONAL.value)
+        await TaskFactory.create_batch(size=2)
+
+        response = await client.get(self.url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {
+            'status': 'ok',
+            'data': {
+                'completed': 1,
+                'decisive': 1,
+                'inbox': 2,
+                'projects': {str(projects[0].id): 2, str(projects[1].id): 1},
+                'spaces': {str(Space.PERSONAL.value): 1, str(Space.WORK.value): 4},
+                'total': 5,
+            },
+        }
+
+    async def test_empty(self, client):
+        await self._setup()
+
+        response = await client.get(self.url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()['data'] == {
+            'completed': 0,
+            'decisive': 0,
+            'inbox': 0,
+            'projects': {},
+            'spaces': {},
+            'total': 0,
+        }
+
+    async def test_filters(self, client):
+        await self._setup()
+        project = await ProjectFactory.create()
+        await TaskFactory.create(project_id=project.id, completed=True)
+        await TaskFactory.create(project_id=project.id)
+        await TaskFactory.create()
+
+        response = await client.get(self.url, params={'completed': False})
+
+        assert response.status_code == status.HTTP_200_OK
+        facets = response.json()['data']
+        assert facets['total'] == 2
+        assert facets['inbox'] == 1
+        assert facets['projects'] == {str(project.id): 1}
+        assert facets['completed'] == 0
+
+    async def test_include_archived(self, client):
+        await self._setup()
+        project = await ProjectFactory.create()
+        await ArchivedTaskFactory.create(project_id=project.id)
+        await TaskFactory.create(project_id=project.id)
+
+        response = await client.get(self.url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()['data']['total'] == 1
+
+        response = await client.get(self.url, params={'include_archived': True})
+
+        assert response.status_code == status.HTTP_200_OK
+        facets = response.json()['data']
+        assert facets['total'] == 2
+        assert facets['completed'] == 1
+        assert facets['projects'] == {str(project.id): 2}
+
+    async def test_single_query(self, client, queries_count, watermarks):
+        await self._setup()
+        await TaskFactory.create_batch(size=3)
+        await watermarks('task')
+
+        before = queries_count()
+        response = await client.get(self.url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert queries_count() - before == 1
+
+    async def test_cached(self, client, queries_count):
+        await self._setup()
+        await TaskFactory.create()
+        await client.get(self.url)
+
+        before = queries_count()
+        response = await client.get(self.url)
+
+        assert queries_count() == before
+        assert response.json()['data']['total'] == 1
+
+        response = await client.get(self.url, params={'decisive': False})
+
+        assert queries_count() - before == 1
+        assert response.json()['data']['total'] == 1
+
+    async def test_write_invalidates(self, client):
+        await self._setup()
+        await client.get(self.url)
+
+        await client.post(
+            app.url_path_for('create_task'),
+            json={'title': 'created', 'space': Space.WORK.value, 'decisive': False},
+        )
+        response = await client.get(self.url)
+
+        assert response.json()['data']['total'] == 1
+
+    async def test_invalid_space(self, client):
+        await self._setup()
+
+        response = await client.get(self.url, params={'space': 'a'})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.json() == serialize_error_response(
+            'bad_request', 'space value is not a valid integer'
+        )
+
+    async def test_not_authorized(self, anonymous_client):
+        await self._setup()
+
+        response = await anonymous_client.get(self.url)
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+        assert response.json() == serialize_error_response(
+            'forbidden', 'Not authenticated'
+        )
@@ -1,13 +1,19 @@
-from datetime import datetime
+from datetime import datetime, time
 
 import pytest
 from fastapi import status
 
+from app.settings import settings
 from main import app
 from services.spaces import Space
 from tests.api.helpers import serialize_error_response
 from tests.api.private.tasks.helpers import serialize_task_response
-from tests.factories import ProjectFactory, TaskFactory
+from tests.factories import (
+    ArchivedTaskFactory,
+    ProjectFactory,
+    TaskDataFactory,
+    TaskFactory,
+)
 
 pytestmark = [pytest.mark.asyncio]
 
@@ -85,6 +91,16 @@ class TestReadTaskList:
         assert response.status_code == status.HTTP_200_OK
         assert response.json() == serialize_task_response([task])
 
+    async def test_search_wildcards_are_literal(self, client):
+        await self._setup()
+        task = await TaskFactory.create(title='50% done_')
+        await TaskFactory.create(title='500 done')
+
+        response = await client.get(self.url, params={'search': '0% done_'})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == serialize_task_response([task])
+
     async def test_invalid_due_from(self, client):
         await self._setup()
 
@@ -144,6 +160,91 @@ class TestReadTaskList:
         assert response.status_code == status.HTTP_200_OK
         assert response.json() == serialize_task_response([task])
 
+    async def test_cursor_pagination(self, client):
+        await self._setup()
+        completed_task = await TaskFactory.create(completed=True)
+        tasks = await TaskFactory.create_batch(size=2)
+
+        response = await client.get(self.url, params={'limit': 2})
+
+        assert response.status_code == status.HTTP_200_OK
+        first_page = response.json()
+        assert first_page['data'] == serialize_task_response(tasks[::-1])['data']
+        assert first_page['next_cursor']
+
+        response = await client.get(
+            self.url, params={'limit': 2, 'cursor': first_page['next_cursor']}
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == serialize_task_response([completed_task])
+
+    async def test_cursor_pagination_inside_completed_tasks(self, client):
+        await self._setup()
+        tasks = await TaskFactory.create_batch(size=3, completed=True)
+
+        response = await client.get(self.url, params={'limit': 1})
+        cursor = response.json()['next_cursor']
+        response = await client.get(self.url, params={'limit': 1, 'cursor': cursor})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()['data'] == serialize_task_response([tasks[1]])['data']
+
+    async def test_archived_tasks_excluded(self, client):
+        await self._setup()
+        await ArchivedTaskFactory.create()
+        task = await TaskFactory.create(completed=True)
+
+        response = await client.get(self.url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == serialize_task_response([task])
+
+    async def test_include_archived(self, client):
+        await self._setup()
+        archived_task = await ArchivedTaskFactory.create()
+        completed_task = await TaskFactory.create(completed=True)
+        task = await TaskFactory.create()
+        params = {'include_archived': True, 'limit': 2}
+
+        response = await client.get(self.url, params=params)
+
+        assert response.status_code == status.HTTP_200_OK
+        first_page = response.json()
+        assert first_page['data'] == (
+            serialize_task_response([task, completed_task])['data']
+        )
+
+        params['cursor'] = first_page['next_cursor']
+        response = await client.get(self.url, params=params)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == serialize_task_response([archived_task])
+
+    async def test_include_archived_filtered(self, client):
+        await self._setup()
+        project = await ProjectFactory.create()
+        archived_task = await ArchivedTaskFactory.create(project_id=project.id)
+        await ArchivedTaskFactory.create()
+        await TaskFactory.create(completed=True)
+
+        response = await client.get(
+            self.url, params={'include_archived': True, 'project_id': project.id}
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == serialize_task_response([archived_task])
+
+    async def test_invalid_cursor(self, client):
+        await self._setup()
+
+        response = await client.get(self.url, params={'cursor': 'invalid'})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.json() == serialize_error_response(
+            'bad_request', 'invalid cursor'
+        )
+
     async def test_invalid_project_id(self, client):
         await self._setup()
 
@@ -226,3 +327,106 @@ class TestReadTaskList:
             'bad_request',
             'space value is not a valid enumeration member; permitted: 1, 2',
         )
+
+    async def test_render_json_in_database(self, client, render_json_in_database):
+        await self._setup()
+        created_at = datetime(2022, 5, 10, 12, 30)
+        completed_task = await TaskFactory.create(
+            created_at=created_at, completed_at=created_at, due_time=time(9, 15)
+        )
+        tasks = await TaskFactory.create_batch(
+            size=2, created_at=created_at, due_time=time(9, 15)
+        )
+
+        response = await client.get(self.url, params={'limit': 2})
+
+        assert response.status_code == status.HTTP_200_OK
+        first_page = response.json()
+        assert first_page['data'] == serialize_task_response(tasks[::-1])['data']
+        assert first_page['count'] == 2
+
+        response = await client.get(
+            self.url, params={'limit': 2, 'cursor': first_page['next_cursor']}
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == serialize_task_response([completed_task])
+
+    async def test_read_from_replica(self, client, replica):
+        await self._setup()
+        # written in the primary's transaction, not visible on the replica
+        await TaskFactory.create()
+
+        response = await client.get(self.url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == serialize_task_response([])
+
+    async def test_replica_lags_behind(self, client, replica, mocker, monkeypatch):
+        await self._setup()
+        tasks = await TaskFactory.create_batch(size=2)
+        monkeypatch.setattr(settings, 'replica_max_lag', 1)
+        lag = mocker.patch('app.database.ReplicaLag.check', return_value=2.5)
+
+        response = await client.get(self.url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == serialize_task_response(tasks[::-1])
+        lag.assert_awaited_once()
+
+    async def test_etag(self, client):
+        await self._setup()
+        await TaskFactory.create()
+
+        response = await client.get(self.url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers['etag']
+
+    async def test_not_modified(self, client, queries_count, watermarks):
+        await self._setup()
+        await TaskFactory.create()
+        etag = (await client.get(self.url)).headers['etag']
+        watermarks.clear()
+        queries_before = queries_count()
+
+        response = await client.get(self.url, headers={'If-None-Match': etag})
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response.content == b''
+        assert response.headers['etag'] == etag
+        assert queries_count() - queries_before == 1
+
+    async def test_not_modified_by_cached_watermarks(self, client, queries_count):
+        await self._setup()
+        etag = (await client.get(self.url)).headers['etag']
+        queries_before = queries_count()
+
+        response = await client.get(self.url, headers={'If-None-Match': etag})
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert queries_count() == queries_before
+
+    async def test_etag_depends_on_query_params(self, client):
+        await self._setup()
+
+        response = await client.get(self.url, params=[('completed', 1), ('space', 1)])
+        etag = response.headers['etag']
+
+        response = await client.get(self.url, params=[('space', 1), ('completed', 1)])
+        assert response.headers['etag'] == etag
+        response = await client.get(self.url, params={'completed': 1})
+        assert response.headers['etag'] != etag
+
+    async def test_modified_after_create(self, client):
+        await self._setup()
+        etag = (await client.get(self.url)).headers['etag']
+        create_response = await client.post(
+            app.url_path_for('create_task'), json=TaskDataFactory.create()
+        )
+
+        response = await client.get(self.url, headers={'If-None-Match': etag})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()['data'] == [create_response.json()['data']]
+        assert response.headers['etag'] != etag
@@ -3,6 +3,7 @@ from datetime import datetime, timedelta
 import pytest
 from fastapi import status
 
+from app.database import database
 from main import app
 from tests.api.helpers import serialize_error_response
 from tests.api.private.tasks.helpers import serialize_task_response
@@ -35,6 +36,73 @@ class TestReadTodayList:
         assert response.status_code == status.HTTP_200_OK
         assert response.json() == serialize_task_response([])
 
+    async def test_completed_today(self, client):
+        await self._setup()
+        today = datetime.today()
+        task = await TaskFactory.create(
+            created_at=today - timedelta(days=3), completed_at=today
+        )
+        await TaskFactory.create(
+            created_at=today - timedelta(days=3), completed_at=today - timedelta(days=1)
+        )
+
+        response = await client.get(self.url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == serialize_task_response([task])
+
+    async def test_day_boundaries(self, client):
+        await self._setup()
+        day = datetime(2022, 5, 10)
+        tasks = [
+            await TaskFactory.create(created_at=day),
+            await TaskFactory.create(created_at=day + timedelta(hours=23, minutes=59)),
+        ]
+        await TaskFactory.create(created_at=day - timedelta(microseconds=1))
+        await TaskFactory.create(created_at=day + timedelta(days=1))
+
+        response = await client.get(self.url, params={'date': '2022-05-10'})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == serialize_task_response(tasks)
+
+    async def test_timezone(self, client):
+        await self._setup()
+        await database.execute("SET LOCAL TimeZone = 'UTC'")
+        # 2022-05-10 in Asia/Tokyo (UTC+9) is 2022-05-09 15:00 - 2022-05-10 15:00 UTC
+        task = await TaskFactory.create(created_at=datetime(2022, 5, 9, 16))
+        await TaskFactory.create(created_at=datetime(2022, 5, 10, 16))
+
+        response = await client.get(
+            self.url, params={'date': '2022-05-10', 'timezone': 'Asia/Tokyo'}
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == serialize_task_response([task])
+
+    async def test_invalid_timezone(self, client):
+        await self._setup()
+
+        response = await client.get(self.url, params={'timezone': 'Mars/Olympus'})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.json() == serialize_error_response(
+            'bad_request', 'timezone unknown name'
+        )
+
+    async def test_timezone_unknown_to_database(self, client):
+        await self._setup()
+        # a zoneinfo name pg_timezone_names doesn't list
+        await database.execute("SET LOCAL TimeZone = 'UTC'")
+        task = await TaskFactory.create(created_at=datetime(2022, 5, 10, 12))
+
+        response = await client.get(
+            self.url, params={'date': '2022-05-10', 'timezone': 'posixrules'}
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == serialize_task_response([task])
+
     async def test_not_authorized(self, anonymous_client):
         await self._setup()
 
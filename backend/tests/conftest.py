@@ -1,12 +1,19 @@
 import asyncio
 
+import fakeredis
 import pytest
+from databases.core import Connection
 from httpx import AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 
-from app.database import BaseDBModel, database
+from api.private import internal, tasks
+from app import cache as caches, database
+from app.database import BaseDBModel, connect, create_database, disconnect
+from app.settings import DatabaseBackend, settings
 from main import app
+from services import caches as invalidation, database as services_database, native
+from services.watermarks import watermarks as watermarks_cache
 
 engine = create_async_engine(app.settings.database_url)
 async_session = sessionmaker(class_=AsyncSession)
@@ -49,6 +56,63 @@ async def tables():
 @pytest.mark.asyncio
 @pytest.fixture(autouse=True)
 async def connection():
-    await database.connect()
+    await connect()
     yield
-    await database.disconnect()
+    await disconnect()
+
+
+@pytest.fixture
+def queries_count(mocker):
+    spies = [
+        mocker.spy(Connection, method)
+        for method in ('execute', 'fetch_all', 'fetch_one', 'fetch_val')
+    ]
+    spies.append(mocker.spy(native, 'raw_connection'))
+    return lambda: sum(spy.call_count for spy in spies)
+
+
+@pytest.fixture
+def render_json_in_database(monkeypatch):
+    monkeypatch.setattr(settings, 'render_json_in_database', True)
+
+
+@pytest.fixture
+def native_backend(monkeypatch):
+    monkeypatch.setattr(settings, 'db_backend', DatabaseBackend.ASYNCPG)
+
+
+@pytest.fixture
+async def replica(monkeypatch):
+    """
+    Second pool on the test database standing in for a replica, its rolled
+    back transaction doesn't see the rows written in the primary's one.
+    """
+    replica = create_database(settings.database_url)
+    await replica.connect()
+    monkeypatch.setattr(database, 'replica', replica)
+    monkeypatch.setattr(database, 'replica_lag', database.ReplicaLag())
+    yield replica
+    await replica.disconnect()
+
+
+@pytest.fixture(autouse=True)
+async def cache():
+    await caches.cache.clear()
+    services_database.min_versions.clear()
+    return caches.cache
+
+
+@pytest.fixture
+async def redis_cache(monkeypatch):
+    """The Redis backend on an in-memory fake server in place of ``cache``."""
+    cache = caches.RedisCacheBackend('todo:test', fakeredis.FakeAsyncRedis())
+    for module in (caches, internal, invalidation, services_database, tasks):
+        monkeypatch.setattr(module, 'cache', cache)
+    yield cache
+    await cache.close()
+
+
+@pytest.fixture(autouse=True)
+def watermarks():
+    watermarks_cache.clear()
+    return watermarks_cache
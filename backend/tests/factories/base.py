@@ -3,7 +3,7 @@ import asyncio
 import factory
 from sqlalchemy import insert
 
-from app.database import database
+from app.database import database, row_columns
 
 
 class AsyncFactory(factory.alchemy.SQLAlchemyModelFactory):
@@ -12,7 +12,11 @@ class AsyncFactory(factory.alchemy.SQLAlchemyModelFactory):
     @classmethod
     def _create(cls, model_class, *args, **kwargs):
         async def maker_coroutine():
-            query = insert(model_class).values(**kwargs).returning(model_class)
+            query = (
+                insert(model_class)
+                .values(**kwargs)
+                .returning(*row_columns(model_class))
+            )
             record = await database.fetch_one(query)
             return record
 
@@ -2,11 +2,11 @@ from datetime import datetime, timedelta
 
 import factory
 
-from models import Task
+from models import ArchivedTask, Task
 from services.spaces import Space
 from tests.factories.base import AsyncFactory
 
-__all__ = ('TaskFactory', 'TaskDataFactory')
+__all__ = ('ArchivedTaskFactory', 'TaskFactory', 'TaskDataFactory')
 
 
 class TaskDataFactory(factory.DictFactory):
@@ -38,3 +38,15 @@ class TaskFactory(AsyncFactory, TaskDataFactory):
 
     class Params:
         completed = factory.Trait(completed_at=datetime.now() - timedelta(minutes=1))
+
+
+class ArchivedTaskFactory(AsyncFactory, TaskDataFactory):
+    # archived tasks keep their ids, keep them apart from the tasks' ones
+    id = factory.Sequence(lambda x: x + 1_000_001)
+    created_at = datetime.now() - timedelta(days=120)
+    completed_at = datetime.now() - timedelta(days=100)
+    due_date = factory.Faker('date_object')
+    due_time = factory.Faker('time_object')
+
+    class Meta:
+        model = ArchivedTask
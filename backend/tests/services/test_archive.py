@@ -0,0 +1,55 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import select
+
+from app.database import database
+from models import ArchivedTask, Project, Task
+from services.tasks import archive_tasks
+from tests.factories import ProjectFactory, TaskFactory
+
+pytestmark = [pytest.mark.asyncio]
+
+
+class TestArchiveTasks:
+    async def _setup(self):
+        self.project = await ProjectFactory.create()
+        completed_at = datetime.now() - timedelta(days=31)
+        self.old = await TaskFactory.create_batch(
+            size=3, project_id=self.project.id, completed_at=completed_at
+        )
+        self.recent = await TaskFactory.create(
+            project_id=self.project.id, completed=True
+        )
+        self.open = await TaskFactory.create(project_id=self.project.id)
+
+    async def test_old_completed_tasks_archived(self):
+        await self._setup()
+
+        archived = await archive_tasks(days=30, batch_size=2)
+
+        assert archived == 3
+        tasks = await database.fetch_all(select(Task.id).order_by(Task.id))
+        assert [task['id'] for task in tasks] == [self.recent.id, self.open.id]
+        query = select(ArchivedTask).order_by(ArchivedTask.id)
+        archived_tasks = await database.fetch_all(query)
+        assert [dict(task) for task in archived_tasks] == [
+            dict(task) for task in self.old
+        ]
+
+    async def test_counters_kept(self):
+        await self._setup()
+
+        await archive_tasks(days=30, batch_size=2)
+
+        query = select(Project.task_count, Project.open_task_count).filter(
+            Project.id == self.project.id
+        )
+        project = await database.fetch_one(query)
+        assert project['task_count'] == 5
+        assert project['open_task_count'] == 1
+
+    async def test_nothing_to_archive(self):
+        await self._setup()
+
+        assert await archive_tasks(days=60, batch_size=2) == 0
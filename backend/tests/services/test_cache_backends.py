@@ -0,0 +1,140 @@
+import asyncio
+from datetime import date, datetime, time
+
+import fakeredis
+import pytest
+from redis.exceptions import ConnectionError
+
+from app.cache import MemoryCacheBackend, RedisCacheBackend, decode, encode
+
+pytestmark = [pytest.mark.asyncio]
+
+
+@pytest.fixture(params=['memory', 'redis'])
+async def backend(request):
+    if request.param == 'memory':
+        backend = MemoryCacheBackend('todo:test', max_bytes=1024 * 1024)
+    else:
+        backend = RedisCacheBackend('todo:test', fakeredis.FakeAsyncRedis())
+    yield backend
+    await backend.close()
+
+
+class TestCacheBackend:
+    async def test_set_and_get(self, backend):
+        row = {'id': 1, 'title': 'cached', 'created_at': datetime(2022, 1, 2, 3, 4)}
+
+        await backend.set('tag:1', row, ttl=10)
+
+        assert await backend.get('tag:1') == row
+        assert await backend.get('tag:2') is None
+        stats = await backend.stats()
+        assert (stats['hits'], stats['misses']) == (1, 1)
+
+    async def test_get_many(self, backend):
+        await backend.set_many({'tag:1': {'id': 1}, 'tag:3': {'id': 3}}, ttl=10)
+
+        values = await backend.get_many(['tag:1', 'tag:2', 'tag:3'])
+
+        assert values == [{'id': 1}, None, {'id': 3}]
+
+    async def test_expired(self, backend):
+        await backend.set('tag:1', {'id': 1}, ttl=0.01)
+        await asyncio.sleep(0.05)
+
+        assert await backend.get('tag:1') is None
+
+    async def test_zero_ttl_not_set(self, backend):
+        await backend.set('tag:1', {'id': 1}, ttl=0)
+
+        assert await backend.get('tag:1') is None
+
+    async def test_invalidate(self, backend):
+        await backend.set_many({'tag:1': {'id': 1}, 'tag:2': {'id': 2}}, ttl=10)
+
+        backend.invalidate(['tag:1'])
+
+        assert await backend.get_many(['tag:1', 'tag:2']) == [None, {'id': 2}]
+
+    async def test_clear(self, backend):
+        await backend.set('tag:1', {'id': 1}, ttl=10)
+
+        await backend.clear()
+
+        assert await backend.get('tag:1') is None
+        assert (await backend.stats())['size'] == 0
+
+    async def test_namespaced(self, backend):
+        other = MemoryCacheBackend('todo:stage', max_bytes=1024)
+        if isinstance(backend, RedisCacheBackend):
+            other = RedisCacheBackend('todo:stage', backend.client)
+        await backend.set('tag:1', {'id': 1}, ttl=10)
+        await other.set('tag:1', {'id': 2}, ttl=10)
+
+        await other.clear()
+
+        assert await backend.get('tag:1') == {'id': 1}
+
+
+class TestRedisCacheBackend:
+    async def _setup(self):
+        self.server = fakeredis.FakeServer()
+        self.backend = RedisCacheBackend(
+            'todo:test', fakeredis.FakeAsyncRedis(server=self.server)
+        )
+
+    async def test_keys_prefixed(self):
+        await self._setup()
+
+        await self.backend.set('tag:1', {'id': 1}, ttl=10)
+
+        assert await self.backend.client.keys() == [b'todo:test:tag:1']
+
+    async def test_invalidated_deleted_in_background(self):
+        await self._setup()
+        await self.backend.set_many({'tag:1': {'id': 1}, 'tag:2': {'id': 2}}, ttl=10)
+
+        self.backend.invalidate(['tag:1', 'tag:2'])
+        await self.backend.deleting
+
+        assert await self.backend.client.keys() == []
+        assert self.backend.invalidated == set()
+
+    async def test_forget_keeps_values(self):
+        await self._setup()
+        await self.backend.set('tag:1', {'id': 1}, ttl=10)
+
+        self.backend.forget(['tag:1'])
+
+        assert self.backend.deleting is None
+        assert await self.backend.get('tag:1') == {'id': 1}
+
+    async def test_failed_invalidation_dropped(self):
+        await self._setup()
+        self.server.connected = False
+
+        self.backend.invalidate(['tag:1', 'tag:2'])
+        await self.backend.deleting
+
+        assert self.backend.invalidated == set()
+
+    async def test_server_down_treated_as_miss(self):
+        await self._setup()
+        await self.backend.set('tag:1', {'id': 1}, ttl=10)
+        self.server.connected = False
+
+        await self.backend.set('tag:2', {'id': 2}, ttl=10)
+
+        assert await self.backend.get('tag:1') is None
+        with pytest.raises(ConnectionError):
+            await self.backend.client.ping()
+
+    async def test_temporal_values_encoded(self):
+        value = {
+            'at': datetime(2022, 1, 2, 3, 4, 5),
+            'on': date(2022, 1, 2),
+            'times': [time(3, 4)],
+            'title': 'tagged',
+        }
+
+        assert decode(encode(value)) == value
@@ -0,0 +1,229 @@
+import asyncio
+
+import asyncpg
+import pytest
+from sqlalchemy import func
+
+from app.notifications import ChangeListener
+from app.settings import settings
+from models import Tag
+from services.caches import flush_caches, invalidate_change
+from services.database import cache_key, get_cached, set_cached
+from services.tags import get_one_tag, update_one_tag
+from services.tasks import get_one_task, update_one_task
+from tests.factories import TagFactory, TaskFactory
+
+pytestmark = [pytest.mark.asyncio]
+
+URL = settings.database_url.replace('+asyncpg', '')
+
+
+async def wait_for(condition, timeout=5):
+    async def poll():
+        while not condition():
+            await asyncio.sleep(0.01)
+
+    await asyncio.wait_for(poll(), timeout)
+
+
+class TestChangeListener:
+    """Changes committed on a connection of their own, as by another worker."""
+
+    async def _setup(self):
+        self.changes = []
+        self.gaps = 0
+        self.listener = ChangeListener(
+            URL,
+            on_change=lambda *change: self.changes.append(change),
+            on_gap=self.gap,
+            reconnect_interval=0.01,
+            keepalive_interval=1,
+        )
+        self.listener.start()
+        await wait_for(lambda: self.gaps == 1)
+        self.connection = await asyncpg.connect(URL)
+
+    async def _teardown(self):
+        await self.listener.stop()
+        await self.connection.close()
+
+    async def gap(self):
+        self.gaps += 1
+
+    async def test_changes_delivered(self):
+        await self._setup()
+        try:
+            tag = await self.connection.fetchrow(
+                "INSERT INTO tag (title) VALUES ('listened') RETURNING id, version"
+            )
+            version = await self.connection.fetchval(
+                "UPDATE tag SET title = 'updated' WHERE id = $1 RETURNING version",
+                tag['id'],
+            )
+            await self.connection.execute('DELETE FROM tag WHERE id = $1', tag['id'])
+
+            await wait_for(lambda: len(self.changes) == 3)
+        finally:
+            await self._teardown()
+
+        assert self.changes == [
+            ('tag', 'INSERT', tag['id'], tag['version']),
+            ('tag', 'UPDATE', tag['id'], version),
+            ('tag', 'DELETE', tag['id'], version),
+        ]
+
+    async def test_partitions_named_after_table(self):
+        await self._setup()
+        try:
+            task = await self.connection.fetchrow(
+                'INSERT INTO task (title, space, decisive) '
+                "VALUES ('listened', 1, false) RETURNING id, version"
+            )
+            await self.connection.execute('DELETE FROM task WHERE id = $1', task['id'])
+
+            await wait_for(lambda: len(self.changes) == 2)
+        finally:
+            await self._teardown()
+
+        assert self.changes[0] == ('task', 'INSERT', task['id'], task['version'])
+
+    async def test_partition_move_delivered_as_delete_and_insert(self):
+        await self._setup()
+        try:
+            task = await self.connection.fetchrow(
+                'INSERT INTO task (title, space, decisive) '
+                "VALUES ('listened', 1, false) RETURNING id, version"
+            )
+            version = await self.connection.fetchval(
+                'UPDATE task SET completed_at = now() WHERE id = $1 RETURNING version',
+                task['id'],
+            )
+            await self.connection.execute('DELETE FROM task WHERE id = $1', task['id'])
+
+            await wait_for(lambda: len(self.changes) == 4)
+        finally:
+            await self._teardown()
+
+        assert self.changes[1:3] == [
+            ('task', 'DELETE', task['id'], task['version']),
+            ('task', 'INSERT', task['id'], version),
+        ]
+
+    async def test_reconnected_after_disconnect(self):
+        await self._setup()
+        try:
+            pid = self.listener.connection.get_server_pid()
+            await self.connection.execute('SELECT pg_terminate_backend($1)', pid)
+            await wait_for(lambda: self.gaps == 2)
+
+            await self.connection.execute(
+                "SELECT pg_notify('row_changes', 'tag:UPDATE:1:2')"
+            )
+            await wait_for(lambda: self.changes)
+        finally:
+            await self._teardown()
+
+        assert self.changes == [('tag', 'UPDATE', 1, 2)]
+
+
+class TestInvalidation:
+    async def _setup(self, monkeypatch):
+        monkeypatch.setattr(settings, 'entity_cache_models', {'tag'})
+        self.tag = await TagFactory.create()
+        self.cached = await get_one_tag(pk=self.tag.id)
+
+    async def test_change_invalidates(self, monkeypatch, cache, watermarks):
+        await self._setup(monkeypatch)
+        generation = watermarks.generation
+
+        invalidate_change('tag', 'UPDATE', self.tag.id, self.cached['version'] + 1)
+
+        assert cache.peek(cache_key('tag', self.tag.id)) is None
+        assert watermarks.generation > generation
+
+    async def test_own_write_kept(self, monkeypatch, cache):
+        await self._setup(monkeypatch)
+        tag = await update_one_tag(pk=self.tag.id, data={'title': 'updated'})
+
+        # the notification of the write comes after it with its version
+        invalidate_change('tag', 'UPDATE', self.tag.id, tag['version'])
+
+        assert cache.peek(cache_key('tag', self.tag.id)) == dict(tag)
+
+    async def test_older_change_ignored(self, monkeypatch, cache):
+        await self._setup(monkeypatch)
+
+        invalidate_change('tag', 'UPDATE', self.tag.id, self.cached['version'] - 1)
+
+        assert cache.peek(cache_key('tag', self.tag.id)) == dict(self.cached)
+
+    async def test_delete_invalidates(self, monkeypatch, cache):
+        await self._setup(monkeypatch)
+
+        invalidate_change('tag', 'DELETE', self.tag.id, self.cached['version'])
+
+        assert cache.peek(cache_key('tag', self.tag.id)) is None
+        await set_cached(Tag, [self.cached])
+        assert cache.peek(cache_key('tag', self.tag.id)) is None
+
+    async def test_partition_move_cached_again(self, monkeypatch, queries_count):
+        await self._setup(monkeypatch)
+        monkeypatch.setattr(settings, 'entity_cache_models', {'task'})
+        task = await TaskFactory.create()
+        await get_one_task(pk=task.id)
+
+        completed = await update_one_task(pk=task.id, data={'completed_at': func.now()})
+        # completing moves the row to the partition of completed tasks
+        invalidate_change('task', 'DELETE', task.id, task.version)
+        invalidate_change('task', 'INSERT', task.id, completed['version'])
+        queries_before = queries_count()
+
+        assert await get_one_task(pk=task.id) == dict(completed)
+        assert queries_count() == queries_before
+
+    async def test_change_kept_from_shared_cache_reads(self, monkeypatch, redis_cache):
+        await self._setup(monkeypatch)
+
+        invalidate_change('tag', 'UPDATE', self.tag.id, self.cached['version'] + 1)
+
+        # the writer replaces the shared copy, no worker deletes it
+        assert redis_cache.deleting is None
+        assert await redis_cache.get(cache_key('tag', self.tag.id)) is not None
+        assert await get_cached(Tag, [self.tag.id]) == {}
+
+    async def test_row_fetched_during_change_not_cached(self, monkeypatch, cache):
+        await self._setup(monkeypatch)
+        other = await TagFactory.create()
+
+        invalidate_change('tag', 'UPDATE', other.id, other.version + 1)
+        await set_cached(Tag, [other])
+
+        assert cache.peek(cache_key('tag', other.id)) is None
+
+    async def test_change_of_other_row_keeps_reads_cached(self, monkeypatch, cache):
+        await self._setup(monkeypatch)
+        other = await TagFactory.create()
+        cache.invalidate([cache_key('tag', self.tag.id)])
+
+        invalidate_change('tag', 'UPDATE', other.id, other.version + 1)
+        await get_one_tag(pk=self.tag.id)
+
+        assert cache.peek(cache_key('tag', self.tag.id)) is not None
+
+    async def test_flush(self, monkeypatch, cache, watermarks):
+        await self._setup(monkeypatch)
+        generation = watermarks.generation
+
+        await flush_caches()
+
+        assert (await cache.stats())['size'] == 0
+        assert watermarks.generation > generation
+
+    async def test_flush_keeps_shared_cache(self, monkeypatch, redis_cache):
+        await self._setup(monkeypatch)
+        redis_cache.invalidated.add('todo:test:tag:100500')
+
+        await flush_caches()
+
+        assert redis_cache.invalidated == set()
+        assert await redis_cache.get(cache_key('tag', self.tag.id)) is not None
@@ -0,0 +1,182 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from app import database
+from app.cache import value_size
+from app.settings import settings
+from models import Tag
+from services.database import (
+    cache_key,
+    get_many,
+    invalidate_changed,
+    min_versions,
+    set_cached,
+)
+from services.exceptions import DoesNotExist
+from services.tags import (
+    create_one_tag,
+    delete_one_tag,
+    get_one_tag,
+    get_tag_version,
+    update_one_tag,
+)
+from services.tasks import archive_tasks, create_one_task, get_one_task
+from tests.factories import TagFactory, TaskFactory
+
+pytestmark = [pytest.mark.asyncio]
+
+
+class TestEntityCache:
+    async def _setup(self, monkeypatch):
+        monkeypatch.setattr(settings, 'entity_cache_models', {'tag', 'task'})
+        self.tag = await TagFactory.create()
+
+    async def test_get_one_cached(self, monkeypatch, queries_count, cache):
+        await self._setup(monkeypatch)
+        tag = await get_one_tag(pk=self.tag.id)
+        queries_before = queries_count()
+
+        assert await get_one_tag(pk=self.tag.id) == dict(tag)
+        assert queries_count() == queries_before
+        assert (await cache.stats())['hits'] >= 1
+
+    async def test_get_one_cached_in_redis(
+        self, monkeypatch, queries_count, redis_cache
+    ):
+        await self._setup(monkeypatch)
+        tag = await get_one_tag(pk=self.tag.id)
+        queries_before = queries_count()
+
+        assert await get_one_tag(pk=self.tag.id) == dict(tag)
+        assert queries_count() == queries_before
+        assert (await redis_cache.stats())['hits'] == 1
+
+    async def test_get_many_fetches_missing_only(self, monkeypatch, queries_count):
+        await self._setup(monkeypatch)
+        other = await TagFactory.create()
+        cached = await get_one_tag(pk=self.tag.id)
+        queries_before = queries_count()
+
+        tags = await get_many([self.tag.id, other.id], model=Tag)
+
+        assert queries_count() - queries_before == 1
+        assert tags[self.tag.id] == dict(cached)
+        assert tags[other.id]['title'] == other.title
+
+        tags = await get_many([self.tag.id, other.id], model=Tag)
+
+        assert queries_count() - queries_before == 1
+        assert set(tags) == {self.tag.id, other.id}
+
+    async def test_model_not_cached(self, monkeypatch, queries_count):
+        await self._setup(monkeypatch)
+        monkeypatch.setattr(settings, 'entity_cache_models', set())
+        await get_one_tag(pk=self.tag.id)
+        queries_before = queries_count()
+
+        await get_one_tag(pk=self.tag.id)
+
+        assert queries_count() - queries_before == 1
+
+    async def test_create_one_caches_returned_row(self, monkeypatch, queries_count):
+        await self._setup(monkeypatch)
+        tag = await create_one_tag(data={'title': 'created', 'color': '#FFFFFF'})
+        queries_before = queries_count()
+
+        assert await get_one_tag(pk=tag['id']) == dict(tag)
+        assert queries_count() == queries_before
+
+    async def test_search_vector_not_cached(self, monkeypatch, cache):
+        await self._setup(monkeypatch)
+        task = await create_one_task(
+            data={'title': 'created', 'space': 1, 'decisive': False}
+        )
+
+        assert 'search_vector' not in task
+        assert 'search_vector' not in cache.peek(cache_key('task', task['id']))
+
+    async def test_update_one_caches_returned_row(self, monkeypatch):
+        await self._setup(monkeypatch)
+        await get_one_tag(pk=self.tag.id)
+
+        tag = await update_one_tag(pk=self.tag.id, data={'title': 'updated'})
+
+        assert (await get_one_tag(pk=self.tag.id))['title'] == 'updated'
+        assert await get_tag_version(pk=self.tag.id) == tag['version']
+
+    async def test_delete_one_invalidates(self, monkeypatch):
+        await self._setup(monkeypatch)
+        await get_one_tag(pk=self.tag.id)
+
+        await delete_one_tag(pk=self.tag.id)
+
+        with pytest.raises(DoesNotExist):
+            await get_one_tag(pk=self.tag.id)
+
+    async def test_archive_invalidates(self, monkeypatch):
+        await self._setup(monkeypatch)
+        completed_at = datetime.now() - timedelta(days=31)
+        task = await TaskFactory.create(completed_at=completed_at)
+        await get_one_task(pk=task.id)
+
+        await archive_tasks(days=30, batch_size=10)
+
+        with pytest.raises(DoesNotExist):
+            await get_one_task(pk=task.id)
+
+    async def test_replica_reads_not_cached(self, monkeypatch, cache):
+        await self._setup(monkeypatch)
+        database.use_replica.set(True)
+        try:
+            await get_one_tag(pk=self.tag.id)
+        finally:
+            database.use_replica.set(False)
+
+        assert (await cache.stats())['size'] == 0
+
+    async def test_least_recently_used_evicted(self, monkeypatch, cache):
+        await self._setup(monkeypatch)
+        tags = [await get_one_tag(pk=self.tag.id)]
+        for tag in await TagFactory.create_batch(size=2):
+            tags.append(await get_one_tag(pk=tag.id))
+        monkeypatch.setattr(cache.values, 'max_bytes', cache.values.bytes)
+        evictions = (await cache.stats())['evictions']
+
+        await get_one_tag(pk=tags[0]['id'])  # the second one is the oldest now
+        await create_one_tag(data={'title': 'created', 'color': '#FFFFFF'})
+
+        stats = await cache.stats()
+        assert stats['evictions'] > evictions
+        assert stats['bytes'] <= stats['max_bytes']
+        assert cache.peek(cache_key('tag', tags[1]['id'])) is None
+        assert cache.peek(cache_key('tag', tags[0]['id'])) == dict(tags[0])
+
+    async def test_memory_accounted(self, monkeypatch, cache):
+        await self._setup(monkeypatch)
+
+        tag = await get_one_tag(pk=self.tag.id)
+
+        assert (await cache.stats())['bytes'] == value_size(dict(tag))
+
+    async def test_min_versions_not_evicted(self, monkeypatch, cache):
+        await self._setup(monkeypatch)
+        tag = await get_one_tag(pk=self.tag.id)
+        invalidate_changed('tag', 'UPDATE', self.tag.id, tag['version'] + 1)
+
+        for pk in range(100_000):
+            invalidate_changed('tag', 'UPDATE', pk + 1_000_000, 1)
+        await set_cached(Tag, [tag])
+
+        assert cache.peek(cache_key('tag', self.tag.id)) is None
+
+    async def test_expired_min_versions_dropped(self, monkeypatch):
+        await self._setup(monkeypatch)
+        monkeypatch.setattr(min_versions, 'ttl', 0.01)
+        invalidate_changed('tag', 'UPDATE', self.tag.id, 1)
+        await asyncio.sleep(0.05)
+
+        invalidate_changed('tag', 'UPDATE', self.tag.id + 1, 1)
+
+        assert min_versions.stats()['size'] == 1
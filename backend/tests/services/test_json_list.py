@@ -0,0 +1,39 @@
+import pytest
+from sqlalchemy import select
+
+from app.database import database
+from models import Tag
+from services.database import json_list
+from tests.factories import TagFactory
+from utils import loads
+
+pytestmark = [pytest.mark.asyncio]
+
+
+class TestJsonList:
+    async def _setup(self):
+        for title in ('b', 'd', 'a', 'c'):
+            await TagFactory.create(title=title)
+        self.order_by = [Tag.title.desc()]
+        self.query = select(Tag.title).order_by(*self.order_by)
+
+    async def test_keeps_order(self):
+        await self._setup()
+
+        rendered = await database.fetch_one(
+            json_list(self.query, ['title'], self.order_by)
+        )
+
+        assert [tag['title'] for tag in loads(rendered['data'])] == ['d', 'c', 'b', 'a']
+        assert rendered['last'] is None
+
+    async def test_last_of_page(self):
+        await self._setup()
+
+        rendered = await database.fetch_one(
+            json_list(self.query.offset(1), ['title'], self.order_by, limit=2)
+        )
+
+        assert [tag['title'] for tag in loads(rendered['data'])] == ['c', 'b']
+        assert rendered['count'] == 2
+        assert loads(rendered['last']) == [{'title': 'b'}]
@@ -0,0 +1,47 @@
+import asyncio
+
+import pytest
+
+from services.exceptions import DoesNotExist
+from services.loaders import DataLoader
+
+pytestmark = [pytest.mark.asyncio]
+
+
+class TestDataLoader:
+    async def _setup(self):
+        self.batches = []
+
+        async def batch_load(keys):
+            self.batches.append(keys)
+            return {key: key * 10 for key in keys if key > 0}
+
+        self.loader = DataLoader(batch_load)
+
+    async def test_batches_concurrent_loads(self):
+        await self._setup()
+
+        values = await asyncio.gather(self.loader.load(1), self.loader.load(2))
+
+        assert values == [10, 20]
+        assert self.batches == [[1, 2]]
+
+    async def test_memoizes_loaded_keys(self):
+        await self._setup()
+
+        await self.loader.load_many([1, 2, 1])
+        await self.loader.load(2)
+
+        assert self.batches == [[1, 2]]
+
+    async def test_load_one_missing_key(self):
+        await self._setup()
+
+        with pytest.raises(DoesNotExist):
+            await self.loader.load_one(-1)
+
+    async def test_load_one_none_key(self):
+        await self._setup()
+
+        assert await self.loader.load_one(None) is None
+        assert self.batches == []
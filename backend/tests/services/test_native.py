@@ -0,0 +1,90 @@
+import pytest
+from sqlalchemy import func
+
+from models import Task
+from services.database import get_many
+from services.exceptions import DoesNotExist, RelatedDoesNotExist
+from services.native import insert_statement, update_statement
+from services.tasks import (
+    create_one_task,
+    delete_one_task,
+    get_one_task,
+    update_one_task,
+)
+from tests.factories import TaskDataFactory, TaskFactory
+
+pytestmark = [pytest.mark.asyncio]
+
+
+class TestNativeBackend:
+    async def test_create_one(self, native_backend):
+        data = TaskDataFactory.create(due_date=None, due_time=None)
+
+        task = await create_one_task(data=data)
+
+        assert task['id']
+        assert task['title'] == data['title']
+        assert task['created_at']
+
+    async def test_get_one(self, native_backend):
+        task = await TaskFactory.create()
+
+        assert dict(await get_one_task(pk=task.id)) == dict(task._mapping)
+
+    async def test_get_one_not_found(self, native_backend):
+        with pytest.raises(DoesNotExist):
+            await get_one_task(pk=100500)
+
+    async def test_get_many(self, native_backend):
+        tasks = await TaskFactory.create_batch(size=2)
+
+        found = await get_many([tasks[0].id, 100500, tasks[1].id], model=Task)
+
+        assert sorted(found) == [tasks[0].id, tasks[1].id]
+
+    async def test_update_one(self, native_backend):
+        task = await TaskFactory.create()
+
+        updated = await update_one_task(
+            pk=task.id, data={'completed_at': func.now(), 'title': 'updated'}
+        )
+
+        assert updated['title'] == 'updated'
+        assert updated['completed_at'] is not None
+
+    async def test_update_one_not_found(self, native_backend):
+        with pytest.raises(DoesNotExist):
+            await update_one_task(pk=100500, data={'title': 'updated'})
+
+    async def test_related_does_not_exist(self, native_backend):
+        task = await TaskFactory.create()
+
+        with pytest.raises(RelatedDoesNotExist) as error:
+            await update_one_task(pk=task.id, data={'project_id': 100500})
+
+        assert (error.value.relation, error.value.pk) == ('project', 100500)
+
+    async def test_delete_one(self, native_backend):
+        task = await TaskFactory.create()
+
+        await delete_one_task(pk=task.id)
+
+        with pytest.raises(DoesNotExist):
+            await delete_one_task(pk=task.id)
+
+
+class TestStatements:
+    async def test_insert_statement(self):
+        statement = insert_statement(Task, (('title', None), ('space', None)))
+
+        assert statement.startswith('INSERT INTO task (title, space) VALUES ($1, $2)')
+
+    async def test_update_statement_with_expression(self):
+        shape = (('title', None), ('completed_at', 'now()'), ('space', None))
+
+        statement = update_statement(Task, shape)
+
+        assert statement.startswith(
+            'UPDATE task SET title = $1, completed_at = now(), space = $2 '
+            'WHERE id = $3 RETURNING '
+        )
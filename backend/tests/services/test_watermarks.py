@@ -0,0 +1,120 @@
+import asyncio
+
+import asyncpg
+import pytest
+from sqlalchemy import delete, func, select, update
+
+from app.database import database
+from app.settings import settings
+from models import Tag, Task, Watermark
+from services.watermarks import Watermarks, prune_watermarks
+from tests.factories import TagFactory, TaskFactory
+
+pytestmark = [pytest.mark.asyncio]
+
+URL = settings.database_url.replace('+asyncpg', '')
+
+
+class TestWatermarks:
+    async def _setup(self, monkeypatch):
+        monkeypatch.setattr(settings, 'watermark_cache_ttl', 0)
+        self.watermarks = Watermarks()
+        self.task = await TaskFactory.create()
+
+    async def test_bumped_by_insert(self, monkeypatch):
+        await self._setup(monkeypatch)
+        (watermark,) = await self.watermarks('task')
+
+        await TaskFactory.create()
+
+        assert await self.watermarks('task') > (watermark,)
+
+    async def test_bumped_by_update(self, monkeypatch):
+        await self._setup(monkeypatch)
+        (watermark,) = await self.watermarks('task')
+
+        await database.execute(update(Task).values(title='updated-title'))
+
+        assert await self.watermarks('task') > (watermark,)
+
+    async def test_bumped_by_delete(self, monkeypatch):
+        await self._setup(monkeypatch)
+        (watermark,) = await self.watermarks('task')
+
+        await database.execute(delete(Task))
+
+        assert await self.watermarks('task') > (watermark,)
+
+    async def test_not_bumped_without_changed_rows(self, monkeypatch):
+        await self._setup(monkeypatch)
+        watermarks = await self.watermarks('task')
+
+        await database.execute(delete(Task).filter(Task.id == self.task.id + 1))
+
+        assert await self.watermarks('task') == watermarks
+
+    async def test_tables_without_watermarks(self, monkeypatch):
+        await self._setup(monkeypatch)
+        await TagFactory.create()
+
+        assert await self.watermarks('tag') == (0,)
+        await database.execute(delete(Tag))
+        assert await self.watermarks('tag') == (0,)
+
+    async def test_cached(self, monkeypatch):
+        await self._setup(monkeypatch)
+        monkeypatch.setattr(settings, 'watermark_cache_ttl', 60)
+        watermarks = await self.watermarks('task')
+
+        await TaskFactory.create()
+
+        assert await self.watermarks('task') == watermarks
+        self.watermarks.clear()
+        assert await self.watermarks('task') != watermarks
+
+    async def test_bumped_by_commits_in_any_order(self, monkeypatch):
+        await self._setup(monkeypatch)
+        (watermark,) = await self.watermarks('task')
+
+        # an earlier version committed after a later one still counts
+        await database.execute(
+            Watermark.__table__.insert().values(table_name='task', version=0)
+        )
+
+        assert await self.watermarks('task') > (watermark,)
+
+    async def test_pruned(self, monkeypatch):
+        await self._setup(monkeypatch)
+        await TaskFactory.create_batch(size=2)
+        watermarks = await self.watermarks('task', 'project')
+
+        assert await prune_watermarks() >= 1
+
+        count = select(func.count()).filter(Watermark.table_name == 'task')
+        assert await database.fetch_val(count) == 1
+        assert await self.watermarks('task', 'project') == watermarks
+        await TaskFactory.create()
+        assert await self.watermarks('task') > watermarks[:1]
+
+
+class TestConcurrentWrites:
+    """Writes in transactions of their own, as by other workers."""
+
+    async def test_not_blocked_by_uncommitted_changes(self):
+        first, second = await asyncio.gather(asyncpg.connect(URL), asyncpg.connect(URL))
+        transaction = first.transaction()
+        insert = (
+            'INSERT INTO task (title, space, decisive) '
+            "VALUES ('concurrent', 1, false) RETURNING id"
+        )
+        try:
+            await transaction.start()
+            await first.fetchval(insert)
+            # the second writer would wait for the first one to commit if
+            # both updated one watermark row of the table
+            await second.execute("SET lock_timeout = '1s'")
+            pk = await second.fetchval(insert)
+            await second.execute('DELETE FROM task WHERE id = $1', pk)
+        finally:
+            await transaction.rollback()
+            await asyncio.gather(first.close(), second.close())
@@ -0,0 +1,86 @@
+import sys
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from typing import Any
+
+__all__ = ('LRUCache',)
+
+
+class LRUCache:
+    """
+    In-process cache of values taking at most ``max_bytes`` as measured by
+    ``sizeof``, each expiring ``ttl`` seconds after it was set. The least
+    recently used values are evicted first, once the expired ones they start
+    with are dropped.
+    """
+
+    def __init__(
+        self, ttl: float, max_bytes: int, sizeof: Callable[[Any], int] = sys.getsizeof
+    ) -> None:
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._values: OrderedDict[Hashable, tuple[float, int, Any]] = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        expires_at, _, value = self._values.get(key, (0.0, 0, default))
+        if expires_at <= time.monotonic():
+            self.pop(key)
+            self.misses += 1
+            return default
+
+        self._values.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def peek(self, key: Hashable) -> Any:
+        """The value if it is cached, without counting a hit or a miss."""
+        expires_at, _, value = self._values.get(key, (0.0, 0, None))
+        return value if expires_at > time.monotonic() else None
+
+    def set(self, key: Hashable, value: Any, ttl: float | None = None) -> None:
+        """Sets the value for ``ttl`` seconds, the one of the cache by default."""
+        self.pop(key)
+        ttl = self.ttl if ttl is None else ttl
+        size = self.sizeof(value)
+        if ttl <= 0 or size > self.max_bytes:
+            return
+
+        self._drop_expired()
+        while self.bytes + size > self.max_bytes:
+            _, (_, evicted_size, _) = self._values.popitem(last=False)
+            self.bytes -= evicted_size
+            self.evictions += 1
+        self._values[key] = (time.monotonic() + ttl, size, value)
+        self.bytes += size
+
+    def pop(self, key: Hashable) -> None:
+        _, size, _ = self._values.pop(key, (0.0, 0, None))
+        self.bytes -= size
+
+    def _drop_expired(self) -> None:
+        now = time.monotonic()
+        while self._values:
+            key, (expires_at, _, _) = next(iter(self._values.items()))
+            if expires_at > now:
+                return
+            self.pop(key)
+
+    def clear(self) -> None:
+        self._values.clear()
+        self.bytes = 0
+
+    def stats(self) -> dict:
+        return {
+            'size': len(self._values),
+            'bytes': self.bytes,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+        }
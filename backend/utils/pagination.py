@@ -0,0 +1,16 @@
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+
+from utils import dumps, loads
+
+__all__ = ('decode_cursor', 'encode_cursor')
+
+
+def encode_cursor(values: list) -> str:
+    return urlsafe_b64encode(dumps(values).encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(cursor: str) -> list:
+    values = loads(urlsafe_b64decode(cursor.encode('ascii')))
+    if not isinstance(values, list):
+        raise ValueError('invalid cursor')
+    return values